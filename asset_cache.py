@@ -0,0 +1,102 @@
+import hashlib
+import os
+import struct
+import pygame
+from utils import get_frame_metrics, metrics_from_bbox, load_gif
+
+# --- CACHE EN DISCO DE FRAMES DECODIFICADOS ---
+# Decodificar GIFs con Pillow + smoothscale domina el arranque en Android.
+# Guardamos los frames ya escalados en RGBA crudo junto con sus métricas y los
+# cargamos con una sola lectura, creando los Surfaces directamente sobre el buffer.
+CACHE_DIR = ".cache/frames"
+CACHE_VERSION = 2
+MAGIC = b"BGIF"
+# magic, versión, mtime_ns, tamaño, sha1 del fuente, ancho, alto, nº frames
+HEADER = struct.Struct("<4sIqq20sIII")
+
+def file_digest(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.digest()
+
+def cache_path(path, scale):
+    key = f"{os.path.normpath(path)}|{scale}|{CACHE_VERSION}".encode("utf-8")
+    return os.path.join(CACHE_DIR, hashlib.sha1(key).hexdigest() + ".bin")
+
+def _read(cache_file, path, stat):
+    """Frames y métricas del cache, o None si falta o no corresponde al fuente actual."""
+    try:
+        with open(cache_file, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, version, mtime_ns, size, digest, w, h, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != CACHE_VERSION:
+        return None
+    if (mtime_ns, size) != (stat.st_mtime_ns, stat.st_size):
+        # Cambió el mtime (p. ej. tras un checkout): solo invalidamos si cambió el contenido
+        if size != stat.st_size or digest != file_digest(path):
+            return None
+        _touch(cache_file, stat)
+
+    metrics_off = HEADER.size
+    pixels_off = metrics_off + 16 * count
+    frame_bytes = w * h * 4
+    if len(data) != pixels_off + frame_bytes * count:
+        return None
+    boxes = struct.unpack_from(f"<{4 * count}I", data, metrics_off)
+    metrics = [metrics_from_bbox(boxes[4 * i:4 * i + 4], (w, h)) for i in range(count)]
+    view = memoryview(data)
+    frames = []
+    for i in range(count):
+        start = pixels_off + i * frame_bytes
+        # frombuffer no copia: el Surface comparte el buffer leído del disco
+        frames.append(pygame.image.frombuffer(view[start:start + frame_bytes], (w, h), "RGBA"))
+    return frames, metrics
+
+def _touch(cache_file, stat):
+    """Actualiza el mtime guardado para no volver a hashear el fuente en el próximo arranque."""
+    try:
+        with open(cache_file, "r+b") as f:
+            f.seek(8)
+            f.write(struct.pack("<q", stat.st_mtime_ns))
+    except OSError:
+        pass
+
+def _write(cache_file, path, stat, frames, metrics, scale):
+    w, h = frames[0].get_size()
+    # No cacheamos el placeholder de error de load_gif (Pillow ausente o GIF ilegible)
+    if scale and (w, h) != tuple(scale):
+        return
+    if any(f.get_size() != (w, h) for f in frames):
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = cache_file + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, CACHE_VERSION, stat.st_mtime_ns, stat.st_size,
+                                file_digest(path), w, h, len(frames)))
+            for m in metrics:
+                f.write(struct.pack("<4I", *m.bbox))
+            for frame in frames:
+                f.write(pygame.image.tostring(frame, "RGBA"))
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        print(f"No se pudo escribir el cache de {path}: {e}")
+
+def load_gif_cached(path, scale=None):
+    """Como utils.load_gif, pero devuelve (frames, métricas) usando el cache en disco."""
+    stat = os.stat(path)
+    cache_file = cache_path(path, scale)
+    cached = _read(cache_file, path, stat)
+    if cached:
+        return cached
+
+    frames = load_gif(path, scale)
+    metrics = [get_frame_metrics(f) for f in frames]
+    _write(cache_file, path, stat, frames, metrics, scale)
+    return frames, metrics
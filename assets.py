@@ -0,0 +1,161 @@
+import itertools
+import queue
+import threading
+import time
+import pygame
+from constants import *
+from asset_cache import load_gif_cached
+
+# --- CARGA DE ASSETS EN SEGUNDO PLANO ---
+# Un hilo hace la E/S y la decodificación (PNG, GIF, WAV) en orden de prioridad:
+# primero lo del menú, luego el juego y al final las cinemáticas. Lo que necesita
+# el display (convert/convert_alpha, construir personajes...) se finaliza en el
+# hilo principal con pump(), repartido en un presupuesto de ms por frame.
+
+PRIORITY_MENU = 0
+PRIORITY_GAMEPLAY = 1
+PRIORITY_CINEMATIC = 2
+
+# Decodificaciones hechas por adelantado: las consumen load_image / load_frames
+_prefetched = {}
+_prefetch_lock = threading.Lock()
+
+def prefetch_image(path, size=None):
+    """Decodifica (y escala a `size`) una imagen sin convertir para que load_image la encuentre lista."""
+    surf = pygame.image.load(path)
+    if size and surf.get_bitsize() == 32:
+        # Convertir una imagen ya reducida es mucho más barato en el hilo principal
+        surf = pygame.transform.smoothscale(surf, size)
+    with _prefetch_lock:
+        _prefetched[("image", path, size)] = surf
+
+def prefetch_frames(path, scale=None):
+    """Decodifica un GIF (vía el cache en disco) para que load_frames lo encuentre listo."""
+    frames = load_gif_cached(path, scale)
+    with _prefetch_lock:
+        _prefetched[("frames", path, scale)] = frames
+
+def load_image(path, alpha=True, size=None):
+    """pygame.image.load + convert_alpha/convert (+ smoothscale a `size`), reutilizando la decodificación previa."""
+    with _prefetch_lock:
+        surf = _prefetched.pop(("image", path, size), None)
+    if surf is None:
+        surf = pygame.image.load(path)
+    surf = surf.convert_alpha() if alpha else surf.convert()
+    if size and surf.get_size() != tuple(size):
+        surf = pygame.transform.smoothscale(surf, size)
+    return surf
+
+def load_frames(path, scale=None):
+    """Como asset_cache.load_gif_cached, reutilizando la decodificación previa."""
+    with _prefetch_lock:
+        frames = _prefetched.pop(("frames", path, scale), None)
+    return frames if frames is not None else load_gif_cached(path, scale)
+
+class AssetManager:
+    """Cola de carga con prioridades, hilo de fondo y progreso por grupo.
+
+    Cada petición tiene un `loader` (corre en el hilo: solo E/S y decodificación)
+    y un `finalize` opcional (corre en el hilo principal con el resultado del loader).
+    Con `threaded=False` (headless, tests) los loaders corren en el hilo principal.
+    """
+    def __init__(self, threaded=True):
+        self.threaded = threaded
+        self.pending = queue.PriorityQueue()
+        self.done = queue.Queue()
+        self.seq = itertools.count()
+        self.assets = {}
+        self.groups = {}      # grupo -> [total, finalizados]
+        self.listeners = {}   # grupo -> funciones a llamar (hilo principal) al completarse
+        self.errors = []
+        self.thread = None
+
+    def request(self, name, loader, finalize=None, group="gameplay", priority=PRIORITY_GAMEPLAY):
+        counts = self.groups.setdefault(group, [0, 0])
+        counts[0] += 1
+        self.pending.put((priority, next(self.seq), name, group, loader, finalize))
+        if self.threaded and self.thread is None:
+            self.thread = threading.Thread(target=self._worker, name="asset-loader", daemon=True)
+            self.thread.start()
+
+    def request_image(self, name, path, alpha=True, group="gameplay", priority=PRIORITY_GAMEPLAY, finalize=None):
+        """Imagen decodificada en el hilo y convertida (convert/convert_alpha) en el principal."""
+        def done(surf):
+            surf = surf.convert_alpha() if alpha else surf.convert()
+            return finalize(surf) if finalize else surf
+        self.request(name, lambda: pygame.image.load(path), done, group, priority)
+
+    def on_ready(self, group, callback):
+        """Llama a `callback` en el hilo principal cuando el grupo termine (o ya, si terminó)."""
+        if self.is_ready(group):
+            callback()
+        else:
+            self.listeners.setdefault(group, []).append(callback)
+
+    def _worker(self):
+        while True:
+            item = self.pending.get()
+            self._load(item)
+
+    def _load(self, item):
+        priority, seq, name, group, loader, finalize = item
+        try:
+            raw = loader() if loader else None
+            self.done.put((priority, seq, name, group, raw, finalize, None))
+        except Exception as e:
+            self.done.put((priority, seq, name, group, None, None, e))
+
+    def pump(self, budget_ms=ASSET_PUMP_BUDGET_MS):
+        """Finaliza assets ya decodificados hasta agotar el presupuesto; devuelve cuántos."""
+        start = time.perf_counter()
+        count = 0
+        while True:
+            if not self.threaded and self.done.empty():
+                try:
+                    self._load(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                item = self.done.get_nowait()
+            except queue.Empty:
+                break
+            self._finalize(item)
+            count += 1
+            if budget_ms is not None and (time.perf_counter() - start) * 1000 >= budget_ms:
+                break
+        return count
+
+    def _finalize(self, item):
+        priority, seq, name, group, raw, finalize, error = item
+        if error is None:
+            try:
+                self.assets[name] = finalize(raw) if finalize else raw
+            except Exception as e:
+                error = e
+        if error is not None:
+            print(f"Error cargando asset {name}: {error}")
+            self.errors.append((name, error))
+        counts = self.groups[group]
+        counts[1] += 1
+        if counts[1] == counts[0]:
+            for callback in self.listeners.pop(group, []):
+                callback()
+
+    def wait(self, *groups):
+        """Bloquea hasta que los grupos (o todo, si no se indica ninguno) estén finalizados."""
+        while not (all(self.is_ready(group) for group in groups) if groups else self.is_ready()):
+            if self.pump(budget_ms=None) == 0 and self.threaded:
+                time.sleep(0.001)
+
+    def get(self, name, default=None):
+        return self.assets.get(name, default)
+
+    def is_ready(self, group=None):
+        groups = [self.groups.get(group, [0, 0])] if group else self.groups.values()
+        return all(done == total for total, done in groups)
+
+    def progress(self, group=None):
+        """Fracción finalizada (0.0 - 1.0) de un grupo o de todo lo pedido."""
+        groups = [self.groups.get(group, [0, 0])] if group else list(self.groups.values())
+        total = sum(t for t, _ in groups)
+        return sum(d for _, d in groups) / total if total else 1.0
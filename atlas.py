@@ -0,0 +1,62 @@
+import json
+import os
+import pygame
+from utils import metrics_from_bbox
+from assets import load_image
+
+# --- ATLAS DE TEXTURAS ---
+# Generado offline por build_atlas.py. Si no existe, el juego usa la carga clásica (GIFs/PNGs).
+ATLAS_DIR = "textures/atlas"
+ATLAS_MANIFEST = os.path.join(ATLAS_DIR, "atlas.json")
+ENABLED = True # build_atlas.py lo desactiva para empaquetar desde las fuentes originales
+
+_atlas = None
+
+class TextureAtlas:
+    """Hojas empaquetadas + manifiesto JSON con rects, recortes y métricas por frame."""
+    def __init__(self, manifest_path):
+        with open(manifest_path, "r") as f:
+            data = json.load(f)
+        self.base_dir = os.path.dirname(manifest_path)
+        self.sheet_files = data["sheets"]
+        self.entries = data["entries"]
+        self.sheets = [None] * len(self.sheet_files)
+
+    def sheet_paths(self):
+        return [os.path.join(self.base_dir, name) for name in self.sheet_files]
+
+    def _sheet(self, index):
+        if self.sheets[index] is None:
+            self.sheets[index] = load_image(self.sheet_paths()[index])
+        return self.sheets[index]
+
+    def has(self, key):
+        return key in self.entries
+
+    def keys(self, prefix):
+        return [k for k in self.entries if k.startswith(prefix + "/")]
+
+    def frames(self, key):
+        """Lista de (subsurface, (ox, oy, ancho_original, alto_original)) sin copiar píxeles."""
+        result = []
+        for fr in self.entries[key]["frames"]:
+            sub = self._sheet(fr["sheet"]).subsurface(pygame.Rect(fr["rect"]))
+            result.append((sub, (fr["offset"][0], fr["offset"][1], fr["size"][0], fr["size"][1])))
+        return result
+
+    def surface(self, key):
+        """Primer frame de una entrada (props y UI se empaquetan sin recortar)."""
+        return self.frames(key)[0][0]
+
+    def metrics(self, key):
+        """FrameMetrics de cada frame, medidas sobre el frame original sin recortar."""
+        return [metrics_from_bbox(fr["bbox"], fr["size"]) for fr in self.entries[key]["frames"]]
+
+def get_atlas():
+    """Atlas cargado (una sola vez) o None si no se ha generado."""
+    global _atlas
+    if not ENABLED:
+        return None
+    if _atlas is None:
+        _atlas = TextureAtlas(ATLAS_MANIFEST) if os.path.exists(ATLAS_MANIFEST) else False
+    return _atlas or None
@@ -0,0 +1,157 @@
+import argparse
+import json
+import sys
+import time
+import pygame
+from constants import *
+from utils import percentile
+
+class ScriptedKeys:
+    """Imita el resultado de pygame.key.get_pressed() con un conjunto de teclas."""
+    def __init__(self, pressed=()):
+        self.pressed = set(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+class ScriptedInput:
+    """Patrón de input repetible: avanza a la derecha zigzagueando, ataca y salta."""
+    def __init__(self, game):
+        self.game = game
+        self.tick = 0
+
+    def keys(self):
+        t = self.tick
+        pressed = [pygame.K_RIGHT] if (t // 180) % 3 != 2 else [pygame.K_LEFT]
+        pressed.append(pygame.K_UP if (t // 60) % 2 == 0 else pygame.K_DOWN)
+        return ScriptedKeys(pressed)
+
+    def step(self):
+        """Acciones discretas (equivalentes a KEYDOWN) para este tick."""
+        player = self.game.player
+        can_act = player.state not in ["STUN", "KNOCKBACK", "DOWN"]
+        if can_act and self.tick % 15 == 0:
+            self.game.execute_player_attack()
+        if can_act and self.tick % 120 == 60 and player.jumps_done < 2:
+            player.velocity_z = JUMP_POWER
+            player.state = "JUMP"
+            player.jumps_done += 1
+            player.jump_anim_timer = 0
+        self.tick += 1
+
+def run_bench(frames=600, enemies=4, seed=1, draw=True, backend="objects", dirty=False, quality=None):
+    """Simula `frames` ticks sin ventana y devuelve los tiempos de update/draw en ms."""
+    from engine import GameEngine
+    game = GameEngine(headless=True, enemy_backend=backend, dirty_rects=dirty, seed=seed)
+    if quality is not None:
+        from quality import parse_level
+        game.quality.override = parse_level(quality)
+        game.quality.notify()
+    game.game_state = "PLAYING"
+    script = ScriptedInput(game)
+    game.key_source = script.keys
+    game.trigger_wave()
+
+    update_ms, draw_ms = [], []
+    hud_calls, hud_allocs = 0, 0
+    for _ in range(frames):
+        # Mantener la carga constante: reponer enemigos y no dejar morir al jugador
+        game.wave_active = True
+        while len(game.enemies) < enemies:
+            game.spawn_enemy()
+        game.wave_enemies_to_spawn = 1
+        game.player.hp = game.player.max_hp
+
+        pygame.event.pump()
+        script.step()
+        game.profiler.begin_frame()
+        start = time.perf_counter()
+        with game.profiler.section("update"):
+            game.step()
+        update_ms.append((time.perf_counter() - start) * 1000)
+
+        if draw:
+            start = time.perf_counter()
+            game.draw()
+            draw_ms.append((time.perf_counter() - start) * 1000)
+            hud_calls += game.hud.draw_calls
+            hud_allocs += game.hud.allocations
+        game.sfx.end_frame()
+        game.profiler.end_frame()
+
+    from entities import SPRITE_SCALE_CACHE
+    stats = {"enemy_pool": game.enemy_pool.stats(), "sprite_cache": SPRITE_SCALE_CACHE.stats()}
+    if draw_ms:
+        stats["hud"] = {"draw_calls_per_frame": hud_calls / len(draw_ms),
+                        "allocations_per_frame": hud_allocs / len(draw_ms)}
+        stats["render_queue"] = game.render_queue.stats()
+    stats["world"] = game.world.stats()
+    stats["parallax"] = game.parallax.stats()
+    stats["quality"] = game.quality.stats()
+    stats["music"] = game.music.stats()
+    stats["sound_bus"] = game.sfx.stats()
+    if game.dirty:
+        stats["dirty_rects"] = game.dirty.stats()
+    return {"update": update_ms, "draw": draw_ms, "stats": stats, "sections": game.profiler.stats()}
+
+def summarize(samples):
+    return {
+        "mean": sum(samples) / len(samples) if samples else 0.0,
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples) if samples else 0.0
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark headless del GameEngine")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--enemies", type=int, nargs="+", default=[4],
+                        help="Uno o varios tamaños de oleada a medir")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-draw", action="store_true", help="Medir solo la simulación")
+    parser.add_argument("--backend", choices=["objects", "numpy"], default="objects",
+                        help="Backend de simulación de enemigos")
+    parser.add_argument("--dirty", action="store_true",
+                        help="Usar el volcado por rectángulos sucios")
+    parser.add_argument("--quality", choices=[level["name"] for level in QUALITY_LEVELS],
+                        help="Forzar un nivel de calidad")
+    parser.add_argument("--profile", action="store_true",
+                        help="Desglosar el tiempo por subsistema (perfilador del motor)")
+    parser.add_argument("--json", help="Guardar resultados en este archivo")
+    parser.add_argument("--max-p95-ms", type=float,
+                        help="Falla (exit 1) si el p95 de update+draw supera este valor")
+    args = parser.parse_args(argv)
+
+    results = {}
+    failed = False
+    for count in args.enemies:
+        times = run_bench(args.frames, count, args.seed, draw=not args.no_draw, backend=args.backend,
+                          dirty=args.dirty, quality=args.quality)
+        total = [u + d for u, d in zip(times["update"], times["draw"] or [0.0] * len(times["update"]))]
+        results[count] = {name: summarize(samples) for name, samples in
+                          (("update", times["update"]), ("draw", times["draw"]), ("total", total))}
+        print(f"--- {count} enemigos, {args.frames} frames, backend {args.backend} ---")
+        for name, stats in results[count].items():
+            print(f"{name:<7} mean {stats['mean']:7.3f}  p50 {stats['p50']:7.3f}  "
+                  f"p95 {stats['p95']:7.3f}  p99 {stats['p99']:7.3f}  max {stats['max']:7.3f} ms")
+        for name, stats in times["stats"].items():
+            print(f"{name}: " + ", ".join(f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}" for k, v in stats.items()))
+        if args.profile:
+            from profiler import SECTIONS
+            for name, level in SECTIONS:
+                s = times["sections"][name]
+                label = ("  " * level) + name
+                print(f"  {label:<12} mean {s['mean']:7.3f}  p95 {s['p95']:7.3f}  p99 {s['p99']:7.3f} ms")
+        if args.max_p95_ms is not None and results[count]["total"]["p95"] > args.max_p95_ms:
+            print(f"FALLO: p95 total {results[count]['total']['p95']:.3f} ms > {args.max_p95_ms} ms")
+            failed = True
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    pygame.quit()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
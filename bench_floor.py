@@ -0,0 +1,68 @@
+import os
+import time
+
+# Benchmark sin ventana: usamos los drivers "dummy" de SDL
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from constants import *
+from floor import PerspectiveFloor
+
+FRAMES = 300
+
+def draw_floor_legacy(surface, floor_tex, camera_x, step=2):
+    """Copia del bucle por línea original de GameEngine.draw_3d_floor (referencia)."""
+    floor_h = HEIGHT - FLOOR_START_Y
+    tex_w, tex_h = floor_tex.get_size()
+    center_offset = WIDTH // 2
+    for sy in range(0, floor_h, step):
+        v = sy / floor_h
+        h_scale = 0.4 + v * 2.2
+        line_w = int(WIDTH * h_scale)
+        if line_w <= 0: continue
+        ty = int((v**1.8 % 1.0) * tex_h)
+        ty = max(0, min(ty, tex_h - 1))
+        line_slice = floor_tex.subsurface((0, ty, tex_w, 1))
+        scaled_line = pygame.transform.scale(line_slice, (line_w, step))
+        rel_x = int(camera_x * h_scale) % line_w
+        start_x = (center_offset - rel_x)
+        while start_x > 0: start_x -= line_w
+        x = start_x
+        while x < WIDTH:
+            surface.blit(scaled_line, (x, FLOOR_START_Y + sy))
+            x += line_w
+
+def time_method(name, fn, screen):
+    # Un frame de calentamiento para que el horneado no cuente en el tiempo por frame
+    fn(screen, 0)
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        fn(screen, i * 3.7)
+    ms = (time.perf_counter() - start) * 1000 / FRAMES
+    print(f"{name:<10} {ms:7.3f} ms/frame")
+    return ms
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    path = "textures/background/ground.png"
+    if not os.path.exists(path):
+        path = "textures/Background/ground.png"
+    floor_tex = pygame.image.load(path).convert()
+    if floor_tex.get_height() > 1024:
+        floor_tex = pygame.transform.smoothscale(floor_tex, (int(1024 * (floor_tex.get_width() / floor_tex.get_height())), 1024))
+
+    floor = PerspectiveFloor(floor_tex)
+    start = time.perf_counter()
+    floor.bake(2)
+    print(f"Horneado (paso 2): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    legacy = time_method("legacy", lambda s, cx: draw_floor_legacy(s, floor_tex, cx), screen)
+    baked = time_method("baked", lambda s, cx: floor.draw(s, cx), screen)
+    vector = time_method("numpy", lambda s, cx: floor.draw_numpy(s, cx), screen)
+    print(f"Mejora baked: x{legacy / baked:.1f}  numpy: x{legacy / vector:.1f}")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import os
+import time
+
+# Benchmark sin ventana: usamos los drivers "dummy" de SDL
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from constants import *
+from utils import get_frame_metrics, load_gif
+
+SPRITES_DIR = "textures/sprites"
+
+def get_bottom_pixel_legacy(surface):
+    """Copia del escaneo píxel a píxel original de utils.get_bottom_pixel (referencia)."""
+    width, height = surface.get_size()
+    mask = pygame.mask.from_surface(surface)
+    for y in range(height - 1, -1, -1):
+        for x in range(width):
+            if mask.get_at((x, y)):
+                return y + 1
+    return height
+
+def load_frames():
+    """Todos los frames de textures/sprites al tamaño con el que el juego los mide."""
+    frames = []
+    for root, _, files in os.walk(SPRITES_DIR):
+        for filename in sorted(files):
+            path = os.path.join(root, filename)
+            if filename == "player_sprite_sheet.png":
+                continue # Se mide por frames ya recortados, no como hoja completa
+            if filename.endswith(".png"):
+                img = pygame.image.load(path).convert_alpha()
+                frames.append(pygame.transform.smoothscale(img, (CHAR_WIDTH, CHAR_HEIGHT)))
+            elif filename.endswith(".gif"):
+                frames.extend(load_gif(path, (CHAR_WIDTH, CHAR_HEIGHT)))
+    return frames
+
+def time_method(name, fn, frames):
+    start = time.perf_counter()
+    results = [fn(f) for f in frames]
+    ms = (time.perf_counter() - start) * 1000
+    print(f"{name:<10} {ms:9.2f} ms  ({ms / len(frames):.3f} ms/frame)")
+    return ms, results
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    frames = load_frames()
+    print(f"{len(frames)} frames en {SPRITES_DIR}")
+
+    legacy, bottoms = time_method("legacy", get_bottom_pixel_legacy, frames)
+    vector, metrics = time_method("metrics", get_frame_metrics, frames)
+    assert bottoms == [m.bottom for m in metrics]
+    print(f"Mejora: x{legacy / vector:.0f} (y además se obtiene top/left/right/bbox)")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
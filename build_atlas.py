@@ -0,0 +1,138 @@
+import json
+import os
+import pygame
+import atlas
+from constants import *
+from utils import get_frame_metrics
+
+# Configuración
+OUTPUT_DIR = atlas.ATLAS_DIR
+MAX_SHEET_SIZE = 2048
+PADDING = 1 # Separación entre frames para evitar sangrado al escalar
+PROPS_DIR = "textures/sprites/props"
+UI_FILES = {
+    "health_frame": "textures/ui/health_frame.png",
+    "health_fill_player": "textures/ui/health_fill_player.png",
+    "health_fill_enemy": "textures/ui/health_fill_enemy.png",
+    "placeholder_logo": "textures/ui/placeholder_logo.png"
+}
+
+def collect_entries():
+    """Reúne (clave, tipo, frames, recortar) de personajes, props y UI.
+
+    Los personajes se cargan con los loaders normales del juego (atlas desactivado),
+    así el atlas contiene exactamente los mismos frames que se usan hoy.
+    """
+    from entities import Character
+    entries = []
+    for is_player, color in ((True, BLUE), (False, RED)):
+        prefix = "player" if is_player else "enemy"
+        char = Character(-1000, -1000, color, is_player=is_player)
+        for name, frames in char.animations.items():
+            entries.append((f"{prefix}/{name}", "animation", frames, True))
+        for name, surf in char.sprites.items():
+            # El retrato se dibuja en el HUD con su tamaño completo: no se recorta
+            entries.append((f"{prefix}/{name}", "sprite", [surf], name != "portrait"))
+
+    if os.path.exists(PROPS_DIR):
+        for filename in sorted(os.listdir(PROPS_DIR)):
+            if filename.endswith(".png"):
+                surf = pygame.image.load(os.path.join(PROPS_DIR, filename)).convert_alpha()
+                entries.append((f"prop/{filename[:-4]}", "sprite", [surf], False))
+
+    for name, path in UI_FILES.items():
+        if os.path.exists(path):
+            entries.append((f"ui/{name}", "sprite", [pygame.image.load(path).convert_alpha()], False))
+    return entries
+
+def trim(surf):
+    """Rect mínimo (nunca vacío) que conserva todos los píxeles con algo de alpha."""
+    rect = get_frame_metrics(surf, min_alpha=1).bbox
+    if rect.width == 0 or rect.height == 0:
+        rect = pygame.Rect(0, 0, 1, 1)
+    return rect
+
+def pack(sizes, max_size):
+    """Empaquetado por estantes: ordena por alto y llena filas de izquierda a derecha."""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    placements = [None] * len(sizes)
+    sheet, x, y, shelf_h = 0, 0, 0, 0
+    for i in order:
+        w, h = sizes[i][0] + PADDING, sizes[i][1] + PADDING
+        if x + w > max_size:
+            x, y, shelf_h = 0, y + shelf_h, 0
+        if y + h > max_size:
+            sheet, x, y, shelf_h = sheet + 1, 0, 0, 0
+        placements[i] = (sheet, x, y)
+        x += w
+        shelf_h = max(shelf_h, h)
+    return placements
+
+def build_atlas():
+    pygame.init()
+    # Necesario para poder hacer .convert_alpha() y smoothscale correctamente
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    atlas.ENABLED = False
+
+    entries = collect_entries()
+
+    # Lista única de frames (el mismo Surface puede aparecer en varias entradas)
+    unique, index_of = [], {}
+    for _, _, frames, do_trim in entries:
+        for surf in frames:
+            if id(surf) not in index_of:
+                index_of[id(surf)] = len(unique)
+                rect = trim(surf) if do_trim else surf.get_rect()
+                unique.append((surf, rect))
+
+    sizes = [rect.size for _, rect in unique]
+    max_size = max([MAX_SHEET_SIZE] + [max(w, h) + PADDING for w, h in sizes])
+    placements = pack(sizes, max_size)
+
+    sheet_count = max(p[0] for p in placements) + 1
+    sheet_sizes = [[1, 1] for _ in range(sheet_count)]
+    for (sheet, x, y), (w, h) in zip(placements, sizes):
+        sheet_sizes[sheet][0] = max(sheet_sizes[sheet][0], x + w)
+        sheet_sizes[sheet][1] = max(sheet_sizes[sheet][1], y + h)
+    sheets = [pygame.Surface(size, pygame.SRCALPHA) for size in sheet_sizes]
+    for (surf, rect), (sheet, x, y) in zip(unique, placements):
+        sheets[sheet].blit(surf, (x, y), rect)
+
+    if not os.path.exists(OUTPUT_DIR):
+        os.makedirs(OUTPUT_DIR)
+    sheet_files = []
+    for i, sheet in enumerate(sheets):
+        filename = f"atlas_{i}.png"
+        pygame.image.save(sheet, os.path.join(OUTPUT_DIR, filename))
+        sheet_files.append(filename)
+
+    manifest = {"sheets": sheet_files, "entries": {}}
+    boxes = {}
+    for key, kind, frames, _ in entries:
+        frame_data = []
+        for surf in frames:
+            i = index_of[id(surf)]
+            rect = unique[i][1]
+            sheet, x, y = placements[i]
+            if i not in boxes:
+                boxes[i] = list(get_frame_metrics(surf).bbox)
+            frame_data.append({
+                "sheet": sheet,
+                "rect": [x, y, rect.width, rect.height],
+                "offset": [rect.x, rect.y],
+                "size": list(surf.get_size()),
+                "bbox": boxes[i]
+            })
+        manifest["entries"][key] = {"kind": kind, "frames": frame_data}
+
+    with open(atlas.ATLAS_MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=1)
+
+    source_px = sum(s.get_width() * s.get_height() for s, _ in unique)
+    atlas_px = sum(w * h for w, h in sheet_sizes)
+    print(f"Atlas generado: {len(entries)} entradas, {len(unique)} frames, {sheet_count} hoja(s)")
+    print(f"Píxeles: {source_px} sin recortar -> {atlas_px} en el atlas")
+    pygame.quit()
+
+if __name__ == "__main__":
+    build_atlas()
@@ -0,0 +1,248 @@
+import math
+import os
+import pygame
+from constants import *
+from rng import RNG
+from assets import PRIORITY_CINEMATIC
+
+# --- CINEMÁTICAS (Ken Burns) ---
+# En cada frame se recorta de la slide solo la parte que se ve y se escala eso a
+# pantalla, en vez de escalar la slide entera (hasta 1.2x la pantalla). Las slides
+# se decodifican de una en una en el hilo de carga: mientras se ve una se prepara
+# la siguiente y la anterior se suelta. Con CINEMATIC_BAKE_ENV (MB) se hornean
+# además en ese hilo todos los frames de la slide siguiente, si caben en el
+# presupuesto: en equipos lentos la cinemática solo hace un blit por frame.
+
+def slide_effects(name):
+    """Paneo/zoom/temblor de una slide según su nombre de archivo."""
+    # Definimos efectos predeterminados por slide
+    effects = {
+        "duration": 180, # 3 segundos aprox
+        "start_pos": (0.5, 0.5),
+        "end_pos": (0.5, 0.5),
+        "start_scale": 1.0,
+        "end_scale": 1.1,
+        "shake": False
+    }
+    # Personalización según el nombre del archivo
+    if "slide1" in name:
+        effects["end_pos"] = (0.48, 0.52)
+    elif "slide2" in name:
+        effects["start_scale"] = 1.2
+        effects["end_scale"] = 1.0
+    elif "slide3" in name:
+        effects["shake"] = True
+        effects["duration"] = 120 # Más rápido para acción
+    return effects
+
+def slide_view(slide, frame):
+    """Posición (centro, en fracción de pantalla) y zoom de la slide en un frame."""
+    progress = frame / slide["duration"]
+    # Paneo (Interpolación Lineal entre posiciones)
+    x_pos = slide["start_pos"][0] + (slide["end_pos"][0] - slide["start_pos"][0]) * progress
+    y_pos = slide["start_pos"][1] + (slide["end_pos"][1] - slide["start_pos"][1]) * progress
+    # Zoom (Interpolación entre escalas)
+    scale = slide["start_scale"] + (slide["end_scale"] - slide["start_scale"]) * progress
+    return (x_pos, y_pos), scale
+
+def render_view(image, pos, scale, margin=0):
+    """Recorta de `image` lo que cae en pantalla (+ `margin` px) y lo escala.
+
+    La slide ocupa WIDTH*scale x HEIGHT*scale centrada en `pos`. Devuelve
+    (superficie, posición en pantalla) o None si no se ve nada.
+    """
+    img_w, img_h = image.get_size()
+    left = WIDTH * pos[0] - WIDTH * scale / 2
+    top = HEIGHT * pos[1] - HEIGHT * scale / 2
+    kx = WIDTH * scale / img_w
+    ky = HEIGHT * scale / img_h
+    # Ventana visible en píxeles de la slide, ampliada a enteros
+    x0 = max(0, math.floor((-margin - left) / kx))
+    y0 = max(0, math.floor((-margin - top) / ky))
+    x1 = min(img_w, math.ceil((WIDTH + margin - left) / kx))
+    y1 = min(img_h, math.ceil((HEIGHT + margin - top) / ky))
+    if x1 <= x0 or y1 <= y0:
+        return None
+    crop = image.subsurface((x0, y0, x1 - x0, y1 - y0))
+    size = (round((x1 - x0) * kx), round((y1 - y0) * ky))
+    if size != crop.get_size():
+        scale_fn = pygame.transform.smoothscale if image.get_bitsize() in (24, 32) else pygame.transform.scale
+        crop = scale_fn(crop, size)
+    return crop, (round(left + x0 * kx), round(top + y0 * ky))
+
+def load_slide(path, max_scale=1.0):
+    """Decodifica una slide (hilo de carga) y averigua si es opaca.
+
+    Si es más grande de lo que llega a verse con su zoom máximo se reduce aquí,
+    una sola vez: así cada frame escala desde una imagen del tamaño de pantalla.
+    """
+    raw = pygame.image.load(path)
+    w, h = raw.get_size()
+    opaque = not raw.get_flags() & pygame.SRCALPHA or pygame.mask.from_surface(raw, 254).count() == w * h
+    needed = (math.ceil(WIDTH * max_scale), math.ceil(HEIGHT * max_scale))
+    if w > needed[0] and h > needed[1] and raw.get_bitsize() in (24, 32):
+        raw = pygame.transform.smoothscale(raw, needed)
+    return raw, opaque
+
+class CinematicManager:
+    def __init__(self, screen, assets=None, bake_mb=None):
+        self.screen = screen
+        self.assets = assets
+        self.slides = []
+        self.current_slide_idx = 0
+        self.frame = 0
+        self.active = False
+        self.finished = False
+        if bake_mb is None:
+            bake_mb = float(os.environ.get(CINEMATIC_BAKE_ENV) or 0)
+        self.bake_budget = int(bake_mb * 1024 * 1024)
+        self.load_slides()
+
+    def load_slides(self):
+        """Lista las slides; solo la primera se pide ya (prioridad más baja del hilo de carga)."""
+        slide_dir = "slides"
+        if os.path.exists(slide_dir):
+            files = sorted([f for f in os.listdir(slide_dir) if f.endswith(".png")])
+            for f in files:
+                self.add_slide(f, path=os.path.join(slide_dir, f))
+        self.prefetch(0)
+
+    def add_slide(self, f, img=None, path=None):
+        slide = {"name": f, "path": path, "image": img, "frames": None, "requested": img is not None}
+        slide.update(slide_effects(f))
+        self.slides.append(slide)
+        return slide
+
+    # --- Carga por slide ---
+
+    def margin(self, slide):
+        return CINEMATIC_SHAKE if slide["shake"] else 0
+
+    def frame_bytes(self, slide):
+        m = self.margin(slide)
+        return (WIDTH + 2 * m) * (HEIGHT + 2 * m) * 4
+
+    def baked_bytes(self):
+        return sum(len(s["frames"]) * self.frame_bytes(s) for s in self.slides if s["frames"])
+
+    def prefetch(self, index):
+        """Pide al hilo de carga la slide `index` (si existe y no está ya pedida)."""
+        if index >= len(self.slides) or self.slides[index]["requested"]:
+            return
+        slide = self.slides[index]
+        slide["requested"] = True
+        max_scale = max(slide["start_scale"], slide["end_scale"])
+        if self.assets:
+            self.assets.request(f"slide/{slide['name']}", lambda: load_slide(slide["path"], max_scale),
+                                lambda result: self.slide_loaded(slide, result),
+                                group=f"cinematic/{index}", priority=PRIORITY_CINEMATIC)
+            return
+        try:
+            self.slide_loaded(slide, load_slide(slide["path"], max_scale))
+        except (pygame.error, OSError) as e:
+            print(f"Error cargando slide: {slide['name']} ({e})")
+
+    def slide_loaded(self, slide, result):
+        raw, opaque = result
+        if not slide["requested"]:
+            return None # Se soltó antes de llegar (cinemática saltada)
+        # Opaca: convert() (sin alfa por píxel, blits más rápidos)
+        slide["image"] = raw.convert() if opaque else raw.convert_alpha()
+        on_screen = self.active and slide is self.slides[self.current_slide_idx]
+        if self.assets and self.bake_budget and not on_screen and self.baked_bytes() + slide["duration"] * self.frame_bytes(slide) <= self.bake_budget:
+            # Copia propia: el hilo de carga no escala la superficie que se dibuja a la vez
+            image = slide["image"].copy()
+            self.assets.request(f"bake/{slide['name']}", lambda: self.bake(slide, image),
+                                lambda frames: self.bake_done(slide, frames),
+                                group="cinematic_bake", priority=PRIORITY_CINEMATIC)
+        return slide["image"]
+
+    def bake(self, slide, image):
+        """Todos los frames de la slide (sin temblor) ya recortados y escalados."""
+        frames = []
+        for frame in range(slide["duration"]):
+            if not slide["requested"]:
+                return None # Se soltó (cinemática saltada): no seguir horneando
+            frames.append(render_view(image, *slide_view(slide, frame), margin=self.margin(slide)))
+        return frames
+
+    def bake_done(self, slide, frames):
+        if frames and slide["image"] is not None:
+            slide["frames"] = frames
+        return frames
+
+    def release(self, index):
+        if 0 <= index < len(self.slides) and self.slides[index]["path"]:
+            slide = self.slides[index]
+            slide["image"] = slide["frames"] = None
+            slide["requested"] = False
+
+    def ensure_loaded(self, index):
+        """Si la slide aún no está (carga más lenta que la slide anterior), se espera aquí."""
+        self.prefetch(index)
+        if self.assets and self.slides[index]["image"] is None:
+            self.assets.wait(f"cinematic/{index}")
+
+    def start(self):
+        if not self.slides:
+            # Fallback: Crear un slide vacío con texto si no hay imágenes
+            surf = pygame.Surface((WIDTH, HEIGHT))
+            surf.fill((20, 20, 30))
+            self.add_slide("fallback", surf).update({"duration": 60, "end_scale": 1.0})
+        self.active = True
+        self.current_slide_idx = 0
+        self.frame = 0
+        self.finished = False
+        self.prefetch(0)
+        self.prefetch(1)
+
+    def skip(self):
+        self.active = False
+        self.finished = True
+        for index in range(len(self.slides)):
+            self.release(index)
+
+    def update(self):
+        if not self.active: return
+
+        self.frame += 1
+        current_slide = self.slides[self.current_slide_idx]
+
+        if self.frame >= current_slide["duration"]:
+            self.release(self.current_slide_idx)
+            self.current_slide_idx += 1
+            self.frame = 0
+            if self.current_slide_idx >= len(self.slides):
+                self.skip()
+            else:
+                self.prefetch(self.current_slide_idx + 1)
+
+    def draw(self):
+        if not self.active: return
+
+        self.ensure_loaded(self.current_slide_idx)
+        slide = self.slides[self.current_slide_idx]
+
+        # Temblor
+        off_x, off_y = 0, 0
+        if slide["shake"]:
+            off_x = RNG.fx.randint(-CINEMATIC_SHAKE, CINEMATIC_SHAKE)
+            off_y = RNG.fx.randint(-CINEMATIC_SHAKE, CINEMATIC_SHAKE)
+
+        if slide["frames"]:
+            view = slide["frames"][self.frame]
+        elif slide["image"]:
+            view = render_view(slide["image"], *slide_view(slide, self.frame), margin=self.margin(slide))
+        else:
+            view = None # No se pudo cargar: queda el fondo negro
+        if view:
+            surf, (x, y) = view
+            self.screen.blit(surf, (x + off_x, y + off_y))
+
+        # Overlay negro suave en los bordes para estilo cinematográfico
+        pygame.draw.rect(self.screen, (0, 0, 0), (0, 0, WIDTH, 40))
+        pygame.draw.rect(self.screen, (0, 0, 0), (0, HEIGHT - 40, WIDTH, 40))
+
+    def stats(self):
+        return {"loaded": sum(1 for s in self.slides if s["image"] is not None),
+                "baked_mb": self.baked_bytes() / (1024 * 1024)}
@@ -3,18 +3,98 @@ import pygame
 # --- Dimensiones ---
 WIDTH, HEIGHT = 960, 540
 FLOOR_START_Y = 340
-FPS = 60
+FPS = 60                 # Frecuencia fija de la simulación
+SIM_DT = 1.0 / FPS
+MAX_SIM_STEPS = 5        # Máximo de pasos de simulación por frame (evita la "espiral de la muerte")
+RENDER_FPS_CAP = 120     # Tope de frames dibujados por segundo (0 = sin tope)
+IDLE_FPS_CAP = 30        # Tope en menú y pausa (casi nada se mueve: ahorra batería)
+DIRTY_RECTS = False      # Volcar solo las regiones cambiadas cuando la cámara está quieta
+DIRTY_FULL_RATIO = 0.6   # Si lo cambiado supera esta fracción de pantalla, flip completo
+ASSET_PUMP_BUDGET_MS = 4 # ms por frame para finalizar assets que llegan del hilo de carga
+
+# --- Perfilador (F3) ---
+PROFILER_HISTORY = 240   # Frames en la ventana de medias / percentiles
+PROFILER_REFRESH = 10    # Cada cuántos frames se recompone el overlay
+PROFILER_TRACE_ENV = "BEATEMUP_PROFILE" # Ruta .csv/.json donde volcar la traza de la sesión
+
+# --- Calidad adaptativa (F4 fuerza un nivel) ---
+QUALITY_LEVELS = [
+    # floor_step: líneas del suelo por tira | smooth_sprites: smoothscale o scale
+    # blur: factor del desenfoque del menú | effects: sombras de combo y GO! | fps_cap: tope de dibujado
+    {"name": "alta",  "floor_step": 2, "smooth_sprites": True,  "blur": 6,  "effects": True,  "fps_cap": RENDER_FPS_CAP},
+    {"name": "media", "floor_step": 3, "smooth_sprites": True,  "blur": 8,  "effects": True,  "fps_cap": FPS},
+    {"name": "baja",  "floor_step": 4, "smooth_sprites": False, "blur": 10, "effects": False, "fps_cap": FPS}
+]
+QUALITY_WINDOW = 120        # Frames por evaluación (~2 s a 60 FPS)
+QUALITY_DOWN_RATIO = 1.0    # Bajar si el p95 supera el presupuesto del frame (1 / FPS)
+QUALITY_UP_RATIO = 0.6      # Subir solo si el p95 queda por debajo del 60% del presupuesto
+QUALITY_UP_WINDOWS = 3      # Ventanas holgadas seguidas antes de subir un nivel
+QUALITY_HOLD_WINDOWS = 15   # Ventanas que debe aguantar un nivel recuperado para olvidar sus fallos
+QUALITY_ENV = "BEATEMUP_QUALITY" # Forzar un nivel: "alta", "media", "baja" o su índice
+
+# --- Música (streaming con pygame.mixer.music) ---
+MUSIC_TRACKS = {            # Pista por escena: nombre en sounds/ sin extensión (se prefiere .mp3)
+    "stage": "music",
+    "wave": "music_wave",   # Si no existe, sigue sonando la del escenario
+}
+MUSIC_CROSSFADE_MS = 1200   # Fundido total al cambiar de pista (mitad bajada, mitad subida)
+MUSIC_DUCK_FACTOR = 0.35    # Volumen relativo de la música con el juego en pausa
+MUSIC_DUCK_MS = 250         # Tiempo en entrar o salir del ducking
+
+# --- Partidas reproducibles (rng.py / replay.py) ---
+SEED_ENV = "BEATEMUP_SEED"      # Semilla fija para todos los generadores del juego
+RECORD_ENV = "BEATEMUP_RECORD"  # Ruta donde grabar el input de la partida (.bin)
+
+# --- Cinemáticas (cinematic.py) ---
+CINEMATIC_SHAKE = 4                            # Temblor máximo (px) de las slides de acción
+CINEMATIC_BAKE_ENV = "BEATEMUP_CINEMATIC_BAKE_MB" # MB para hornear los frames de la slide siguiente (0: no)
+
+# --- Bus de efectos de sonido ---
+SOUND_GROUPS = {"player": 6, "enemy": 6, "ui": 2}  # Canales reservados por grupo (su suma acota el mixer)
+SOUND_DEFS = {              # nombre: (grupo, prioridad (mayor gana), voces simultáneas máximas)
+    "hit1": ("player", 2, 1), "hit2": ("player", 2, 1), "hit3": ("player", 2, 1),
+    "hit_special": ("player", 3, 2), "p_damage": ("player", 3, 1),
+    "e_hit": ("enemy", 2, 3), "e_damage": ("enemy", 1, 3),
+    "powerup": ("ui", 2, 1), "go_bell": ("ui", 1, 1),
+}
 
 # --- Tamaño Visual de Personajes (Display Size) ---
 CHAR_WIDTH = 230
 CHAR_HEIGHT = 230
+CHAR_CULL_MARGIN = 2 * CHAR_WIDTH # Holgura al descartar personajes fuera de cámara (render_queue.py)
+FEET_SNAP = 8 # Un frame apoya sus propios pies si quedan a <= estos px de la línea de suelo de su animación
 PORTRAIT_SIZE = 60 # Reducido a tamaño original
+HUD_SCALE = 0.8 # Escala de los paneles de vida (reducidos un 20%)
+
+# --- Mundo por tramos (world.py) ---
+WORLD_CHUNK_WIDTH = 1024   # Ancho (px de mundo) de cada tramo de props
+WORLD_STREAM_MARGIN = 256  # Holgura al decidir qué tramos cargar (cámara interpolada, etc.)
+PROP_START_X = 400         # Posición del primer hueco de prop
+PROP_SPACING = 450         # Distancia entre huecos de prop
+PROP_JITTER = 100          # Desplazamiento aleatorio máximo de cada prop en su hueco
+
+# --- Fondo parallax (parallax.py) ---
+PARALLAX_SKYLINE_FACTOR = 0.12  # Velocidad de las siluetas lejanas respecto a la cámara
+PARALLAX_FACADE_FACTOR = 0.3    # Velocidad de la textura de fachadas
+PARALLAX_SKYLINE_TILE = 1600    # Ancho del tile horneado de siluetas (empalma consigo mismo)
+PARALLAX_SKY_THRESHOLD = 6      # Tolerancia por canal al quitar el cielo liso de una textura opaca
+
+# --- Cache de Sprites Escalados ---
+SPRITE_SCALE_STEP = 0.02                  # Tamaño de cubeta para cuantizar la escala de perspectiva
+# Bytes máximos de superficies pre-escaladas. Con 20 enemigos (bench.py) el conjunto de
+# trabajo ronda los 113 MB: con 32 MB casi cada fallo era un sprite expulsado poco antes
+SPRITE_CACHE_BUDGET = 96 * 1024 * 1024
 
 # --- Colores ---
 SKY_TOP = (15, 15, 30)
 SKY_BOTTOM = (45, 45, 65)
+SKYLINE_COLOR = (24, 24, 40)
+SKYLINE_WINDOW_COLOR = (50, 50, 45)
 FLOOR_TOP = (30, 30, 35)
 FLOOR_BOTTOM = (60, 60, 70)
+# Degradado del texto de combo (Amarillo a Rojo)
+COMBO_TOP = (255, 255, 0)
+COMBO_BOTTOM = (255, 40, 0)
 CITY_COLOR = (25, 25, 40)
 
 WHITE = (240, 240, 240)
@@ -44,9 +124,12 @@ HIT_RANGE_X = 225
 HIT_RANGE_Y = 80     
 HIT_RANGE_Y_MULT = 1.3
 DOWN_TIME = 90      
+COLLISION_DIST = 40  # Distancia mínima entre personajes (separación)
+SPATIAL_CELL_SIZE = 64 # Tamaño de celda del índice espacial de enemigos
 
 # --- Gestión de Escena ---
 WAVE_SPAWN_INTERVAL = 240
+ENEMY_POOL_SIZE = 8 # Enemigos pre-creados para reutilizar entre oleadas
 DISTANCE_TO_NEXT_WAVE = [500, 750, 1000]
 # --- Iluminación ---
 SUN_POS = pygame.Vector2(WIDTH // 2, -500) # El sol está arriba
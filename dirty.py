@@ -0,0 +1,109 @@
+import pygame
+from constants import *
+
+# --- RECTÁNGULOS SUCIOS ---
+# Con la cámara quieta el fondo y el suelo no cambian entre frames: basta con
+# reponerlos bajo lo que se pintó encima el frame anterior (sprites, HUD, GO!,
+# combo...) y volcar a pantalla solo esas regiones con display.update(rects).
+
+class RecordingSurface:
+    """Envuelve la pantalla y anota el rect que toca cada blit."""
+    def __init__(self, surface):
+        self.surface = surface
+        self.rects = []
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        rect = self.surface.blit(source, dest, area, special_flags)
+        if rect.width and rect.height:
+            self.rects.append(rect)
+        return rect
+
+    def __getattr__(self, name):
+        return getattr(self.surface, name)
+
+def merge_rects(rects):
+    """Une los rects que se solapan; el resultado no tiene solapes."""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        # La unión puede alcanzar a otros ya fusionados: absorber hasta que no toque ninguno
+        idx = rect.collidelist(merged)
+        while idx != -1:
+            rect.union_ip(merged.pop(idx))
+            idx = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+class DirtyRenderer:
+    def __init__(self, size):
+        self.screen_area = size[0] * size[1]
+        self.key = None            # Qué muestra la pantalla: ("scene", view_x, size), ("menu", ...), ("pause", ...)
+        self.backdrop = None       # Fondo + suelo sin sprites de la vista actual
+        self.backdrop_key = None
+        self.prev_rects = []       # Lo pintado sobre el fondo en el último frame
+        self.recording = None
+        self.patching = False
+        # Contadores (para bench.py)
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.skipped_frames = 0
+        self.updated_pixels = 0
+
+    def invalidate(self):
+        self.key = None
+
+    def can_patch(self, key):
+        return key == self.key and key == self.backdrop_key
+
+    def restore(self, screen):
+        """Repone el fondo bajo todo lo pintado en el frame anterior."""
+        for rect in self.prev_rects:
+            screen.blit(self.backdrop, rect, rect)
+        self.patching = True
+
+    def capture(self, screen, key):
+        """Guarda fondo + suelo recién pintados si la cámara no se movió desde el frame anterior."""
+        if key != self.key:
+            return
+        if self.backdrop is None or self.backdrop.get_size() != screen.get_size():
+            self.backdrop = pygame.Surface(screen.get_size()).convert()
+        self.backdrop.blit(screen, (0, 0))
+        self.backdrop_key = key
+
+    def record(self, screen):
+        self.recording = RecordingSurface(screen)
+        return self.recording
+
+    def skip(self):
+        self.skipped_frames += 1
+
+    def present(self, key, rects=None):
+        """Vuelca el frame: solo las regiones cambiadas si se puede, si no un flip completo."""
+        drawn = self.recording.rects if self.recording else []
+        if rects is None and self.patching:
+            # Lo que se borró (frame anterior) y lo que se pintó ahora
+            rects = self.prev_rects + drawn
+        if rects is not None:
+            rects = merge_rects(rects)
+            area = sum(r.width * r.height for r in rects)
+        if rects is not None and area <= self.screen_area * DIRTY_FULL_RATIO:
+            if rects:
+                pygame.display.update(rects)
+            self.partial_frames += 1
+            self.updated_pixels += area
+        else:
+            pygame.display.flip()
+            self.full_frames += 1
+            self.updated_pixels += self.screen_area
+        # Unidos una vez aquí: el frame siguiente repone cada píxel una sola vez
+        self.prev_rects = merge_rects(drawn)
+        self.key = key
+        self.recording = None
+        self.patching = False
+
+    def stats(self):
+        frames = self.full_frames + self.partial_frames + self.skipped_frames
+        return {
+            "full": self.full_frames, "partial": self.partial_frames, "skipped": self.skipped_frames,
+            "screen_fraction": self.updated_pixels / (max(1, frames) * self.screen_area)
+        }
@@ -0,0 +1,44 @@
+from constants import *
+from entities import Character
+
+class EnemyPool:
+    """Pool de enemigos pre-creados que se reinician en el sitio al aparecer.
+
+    Evita construir un Character nuevo (y pasar por load_placeholders) en cada
+    spawn; los enemigos muertos vuelven al pool en lugar de ir al recolector.
+    """
+    def __init__(self, size=ENEMY_POOL_SIZE, color=RED):
+        self.color = color
+        self.free = [Character(-1000, -1000, color) for _ in range(size)]
+        self.size = size            # Instancias totales creadas por el pool
+        self.acquired = 0           # Spawns servidos
+        self.reused = 0             # Spawns servidos con una instancia reciclada
+        self.wave_allocations = 0   # Instancias nuevas creadas en la oleada actual
+
+    def acquire(self, x, y):
+        self.acquired += 1
+        if self.free:
+            e = self.free.pop()
+            e.reset(x, y)
+            self.reused += 1
+        else:
+            # Pool agotado: crecemos (el próximo release lo devuelve al pool)
+            e = Character(x, y, self.color)
+            self.size += 1
+            self.wave_allocations += 1
+        return e
+
+    def release(self, e):
+        self.free.append(e)
+
+    def begin_wave(self):
+        self.wave_allocations = 0
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "free": len(self.free),
+            "in_use": self.size - len(self.free),
+            "reuse_rate": self.reused / self.acquired if self.acquired else 0.0,
+            "wave_allocations": self.wave_allocations
+        }
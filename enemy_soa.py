@@ -0,0 +1,402 @@
+import pygame
+import numpy
+from constants import *
+from entities import Character
+from rng import RNG
+
+# --- BACKEND "STRUCT OF ARRAYS" PARA ENEMIGOS ---
+# Todos los enemigos viven en arrays NumPy y se simulan en pasadas vectorizadas
+# que replican Character.update + handle_ai. Para el resto del motor (dibujado,
+# detección de golpes, HUD) cada enemigo se expone como un EnemyView liviano.
+
+STATE_NAMES = ["IDLE", "WALK", "ATTACK", "STUN", "KNOCKBACK", "DOWN", "JUMP", "DIVE"]
+STATE_CODES = {name: code for code, name in enumerate(STATE_NAMES)}
+IDLE, WALK, ATTACK, STUN, KNOCKBACK, DOWN, JUMP, DIVE = range(len(STATE_NAMES))
+
+# nombre: (dtype, columnas)
+FIELDS = {
+    "pos": (numpy.float64, 2), "prev_pos": (numpy.float64, 2), "vel": (numpy.float64, 2),
+    "knk": (numpy.float64, 2), "target_offset": (numpy.float64, 2),
+    "z": (numpy.float64, 1), "prev_z": (numpy.float64, 1), "vz": (numpy.float64, 1),
+    "hp": (numpy.float64, 1),
+    "state": (numpy.int8, 1), "state_timer": (numpy.int32, 1), "recovery_timer": (numpy.int32, 1),
+    "flash_timer": (numpy.int32, 1), "anim_frame": (numpy.int32, 1), "anim_timer": (numpy.int32, 1),
+    "jump_anim_timer": (numpy.int32, 1), "attack_cooldown": (numpy.int32, 1),
+    "attack_prep_timer": (numpy.int32, 1), "blink_timer": (numpy.int32, 1),
+    "z_priority": (numpy.int32, 1), "jumps_done": (numpy.int32, 1),
+    "facing_right": (numpy.bool_, 1), "is_dead": (numpy.bool_, 1),
+    "death_sequence_finished": (numpy.bool_, 1), "blink_state": (numpy.bool_, 1)
+}
+
+def _norm(v):
+    return numpy.hypot(v[:, 0], v[:, 1])
+
+class EnemyArrays:
+    """Gestor de enemigos en arrays NumPy (paso de simulación vectorizado)."""
+    def __init__(self, template=None, capacity=64, rng=None):
+        # El "template" aporta sprites/animaciones compartidos (ya cacheados globalmente)
+        self.template = template or Character(-1000, -1000, RED)
+        self.rng = rng if rng is not None else numpy.random.default_rng(RNG.derive("ai"))
+        self.count = 0
+        self.capacity = 0
+        self.views = []
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        for name, (dtype, cols) in FIELDS.items():
+            shape = (capacity, cols) if cols > 1 else (capacity,)
+            arr = numpy.zeros(shape, dtype=dtype)
+            if self.capacity:
+                arr[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def spawn(self, x, y):
+        """Crea un enemigo con los mismos valores iniciales que Character.__init__."""
+        if self.count >= self.capacity:
+            self._grow(self.capacity * 2)
+        i = self.count
+        for name, (dtype, cols) in FIELDS.items():
+            getattr(self, name)[i] = 0
+        self.pos[i] = (x, y)
+        self.prev_pos[i] = (x, y)
+        self.hp[i] = 100
+        self.facing_right[i] = True
+        self.blink_state[i] = True
+        self.count += 1
+        view = EnemyView(self, i)
+        self.views.append(view)
+        return view
+
+    def remove_finished(self):
+        """Compacta los arrays quitando a los enemigos que terminaron de morir."""
+        if not self.death_sequence_finished[:self.count].any():
+            return self.views
+        i = 0
+        while i < self.count:
+            if self.death_sequence_finished[i]:
+                last = self.count - 1
+                if i != last:
+                    for name in FIELDS:
+                        arr = getattr(self, name)
+                        arr[i] = arr[last]
+                    self.views[i] = self.views[last]
+                    self.views[i].index = i
+                self.views.pop()
+                self.count -= 1
+            else:
+                i += 1
+        return self.views
+
+    def clear(self):
+        self.count = 0
+        self.views = []
+
+    def snapshot(self):
+        n = self.count
+        self.prev_pos[:n] = self.pos[:n]
+        self.prev_z[:n] = self.z[:n]
+
+    def step(self, player_ref=None):
+        """Un tic de simulación para todos los enemigos (equivale a Character.update)."""
+        n = self.count
+        if n == 0: return
+        pos, vel, knk = self.pos[:n], self.vel[:n], self.knk[:n]
+        z, vz = self.z[:n], self.vz[:n]
+        st, timer = self.state[:n], self.state_timer[:n]
+        dead = self.is_dead[:n]
+
+        # 1. Prioridad de dibujado según estado
+        zp = self.z_priority[:n]
+        zp[:] = 0
+        zp[st == ATTACK] = 50
+        zp[numpy.isin(st, (STUN, KNOCKBACK, DOWN))] = -50
+
+        # Temporizador de estados
+        st0 = st.copy()
+        ticking = timer > 0
+        timer[ticking] -= 1
+        expired = ticking & (timer <= 0)
+        kb_air = expired & (st0 == KNOCKBACK) & (z > 0)
+        timer[kb_air] = 1
+        st[expired & (st0 == DOWN) & ~dead] = IDLE
+        back = expired & ~kb_air & (st0 != DOWN)
+        st[back] = numpy.where(z[back] <= 0, IDLE, JUMP)
+
+        # 1.1 Secuencia de muerte (blink)
+        dying = dead & (st == DOWN) & (timer <= 0)
+        blink = self.blink_timer[:n]
+        blink[dying] += 1
+        toggle = dying & (blink % 5 == 0)
+        self.blink_state[:n][toggle] = ~self.blink_state[:n][toggle]
+        self.death_sequence_finished[:n] |= dying & (blink > 60)
+
+        # 1.2 Recuperación, flash y animación
+        for name in ("recovery_timer", "flash_timer"):
+            arr = getattr(self, name)[:n]
+            arr[arr > 0] -= 1
+        anim_timer = self.anim_timer[:n]
+        anim_timer += 1
+        roll = anim_timer >= 5
+        anim_timer[roll] = 0
+        self.anim_frame[:n][roll] += 1
+
+        # 2. Gravedad y aterrizaje
+        air = (z > 0) | (vz != 0)
+        z[air] += vz[air]
+        vz[air] -= GRAVITY
+        land = air & (z <= 0)
+        z[land] = 0
+        vz[land] = 0
+        self.jumps_done[:n][land] = 0
+        landed_jump = land & (st == JUMP)
+        st[landed_jump] = IDLE
+        self.jump_anim_timer[:n][landed_jump] = 0
+        landed_kb = land & (st == KNOCKBACK)
+        st[landed_kb] = DOWN
+        timer[landed_kb] = DOWN_TIME
+        knk[landed_kb] = 0
+        st[land & (st == STUN)] = IDLE
+
+        # 3. Movimiento
+        kb = st == KNOCKBACK
+        pos[kb] += knk[kb]
+        knk[kb] *= 0.95
+        knk[st == DOWN] = 0
+        rest = ~kb & (st != DOWN)
+        grounded = rest & ~((st == ATTACK) & (z > 0))
+        vel[grounded] *= FRICTION
+        vel[rest & (_norm(vel) < 0.1)] = 0
+        pos[rest] += vel[rest]
+
+        # 3.1 Separación entre enemigos y con el jugador
+        self._separate(n, player_ref)
+
+        # 4. Límites de profundidad
+        numpy.clip(pos[:, 1], FLOOR_START_Y + 20, HEIGHT - 20, out=pos[:, 1])
+
+        # 5. Lógica de acción
+        act = ~numpy.isin(st, (KNOCKBACK, DOWN, STUN))
+        self.jump_anim_timer[:n][act & (st == JUMP)] += 1
+        if player_ref is not None:
+            self._ai(n, act, player_ref)
+        cooldown = self.attack_cooldown[:n]
+        cooldown[act & (cooldown > 0)] -= 1
+
+    def _separate(self, n, player_ref):
+        pos = self.pos[:n]
+        pushers = pos[self.state[:n] != DOWN]
+        if len(pushers):
+            # Barrido ordenado por X: solo se generan pares con |dx| < COLLISION_DIST
+            pushers = pushers[numpy.argsort(pushers[:, 0], kind="stable")]
+            xs = pushers[:, 0]
+            lo = numpy.searchsorted(xs, pos[:, 0] - COLLISION_DIST, "right")
+            hi = numpy.searchsorted(xs, pos[:, 0] + COLLISION_DIST, "left")
+            counts = hi - lo
+            rows = numpy.repeat(numpy.arange(n), counts)
+            starts = numpy.repeat(lo - (numpy.cumsum(counts) - counts), counts)
+            cols = starts + numpy.arange(len(rows))
+            diff = pos[rows] - pushers[cols]
+            dist = numpy.hypot(diff[:, 0], diff[:, 1])
+            near = (dist > 0.1) & (dist < COLLISION_DIST)
+            rows, diff, dist = rows[near], diff[near], dist[near]
+            strength = (COLLISION_DIST - dist) * 0.05 / dist
+            pos[:, 0] += numpy.bincount(rows, diff[:, 0] * strength, n)
+            pos[:, 1] += numpy.bincount(rows, diff[:, 1] * strength, n)
+
+        if player_ref is not None and player_ref.state != "DOWN":
+            diff = pos - (player_ref.world_pos.x, player_ref.world_pos.y)
+            dist = _norm(diff)
+            near = (dist > 0.1) & (dist < COLLISION_DIST)
+            if near.any():
+                pos[near] += diff[near] * ((COLLISION_DIST - dist[near]) * 0.05 / dist[near])[:, None]
+
+    def _ai(self, n, act, player_ref):
+        idx = numpy.nonzero(act)[0]
+        if len(idx) == 0: return
+        pos, vel, st = self.pos[:n], self.vel[:n], self.state[:n]
+        offset = self.target_offset[:n]
+        p_pos = numpy.array((player_ref.world_pos.x, player_ref.world_pos.y))
+
+        # Cambio aleatorio del offset objetivo (1% por frame)
+        retarget = idx[self.rng.random(len(idx)) < 0.01]
+        if len(retarget):
+            offset[retarget, 0] = self.rng.integers(-150, 151, len(retarget))
+            offset[retarget, 1] = self.rng.integers(-40, 41, len(retarget))
+
+        dist_vec = p_pos + offset[idx] - pos[idx]
+        dist = _norm(dist_vec)
+        far = dist > 20
+        far_idx = idx[far]
+        if len(far_idx):
+            move = dist_vec[far] / dist[far][:, None]
+            facing = self.facing_right[:n]
+            facing[far_idx[move[:, 0] > 0]] = True
+            facing[far_idx[move[:, 0] < 0]] = False
+            # Movimiento con un poco de "ruido" lateral
+            move = move + self.rng.uniform(-0.2, 0.2, (len(far_idx), 2))
+            move /= _norm(move)[:, None]
+            vel[far_idx] += move * (ACCEL * 0.4)
+            speed = _norm(vel[far_idx])
+            max_ai_speed = BASE_SPEED * 0.75
+            over = speed > max_ai_speed
+            vel[far_idx[over]] *= (max_ai_speed / speed[over])[:, None]
+        moving = numpy.zeros(n, dtype=bool)
+        moving[far_idx] = True
+        not_attacking = act & (st != ATTACK)
+        st[not_attacking & moving] = WALK
+        st[not_attacking & ~moving] = IDLE
+
+        # Lógica de ataque
+        to_player = p_pos - pos
+        cooldown, prep = self.attack_cooldown[:n], self.attack_prep_timer[:n]
+        in_range = act & (_norm(to_player) < 90) & (numpy.abs(to_player[:, 1]) < 30) & (cooldown <= 0)
+        prep[act & ~in_range] = 0
+        if player_ref.state != "DOWN" and in_range.any():
+            prep[in_range] += 1
+            for i in numpy.nonzero(in_range & (prep >= ENEMY_ATTACK_PREP))[0]:
+                self._punch(i, player_ref)
+                prep[i] = 0
+                cooldown[i] = ENEMY_COOLDOWN
+
+    def _punch(self, i, player_ref):
+        """Equivalente a Character.execute_enemy_punch para el enemigo i."""
+        if self.state[i] != ATTACK:
+            self.anim_frame[i] = 0
+            self.anim_timer[i] = 0
+        self.state[i] = ATTACK
+        self.state_timer[i] = ATTACK_DURATION
+        self.facing_right[i] = player_ref.world_pos.x > self.pos[i, 0]
+        vec = player_ref.world_pos - pygame.Vector2(*self.pos[i])
+        if vec.length() < 80 and abs(vec.y) < (HIT_RANGE_Y * HIT_RANGE_Y_MULT):
+            player_ref.apply_damage(5)
+
+    def apply_damage(self, i, dmg, knockback=False, knk_dir=None):
+        """Equivalente a Character.apply_damage para el enemigo i."""
+        if self.state[i] == DOWN or self.is_dead[i]: return
+        self.hp[i] -= dmg
+        self.flash_timer[i] = 2
+        if knk_dir:
+            knk_dir = pygame.Vector2(knk_dir.x, 0)
+
+        if self.hp[i] <= 0:
+            self.hp[i] = 0
+            self.is_dead[i] = True
+            self.state[i] = KNOCKBACK
+            self.state_timer[i] = 30
+            self.vz[i] = 10
+            if knk_dir:
+                self.knk[i] = knk_dir * 12
+            else:
+                self.knk[i] = (self.rng.choice([-1, 1]) * 6, 0)
+            return
+
+        if knockback:
+            self.state[i] = KNOCKBACK
+            self.state_timer[i] = 30
+            self.vz[i] = 12
+            if knk_dir:
+                self.knk[i] = knk_dir * 10
+        else:
+            self.state[i] = STUN
+            self.state_timer[i] = 25
+            if knk_dir:
+                self.pos[i, 0] += knk_dir.x * 15
+
+def _field(name, cast):
+    def fget(self): return cast(getattr(self.manager, name)[self.index])
+    def fset(self, value): getattr(self.manager, name)[self.index] = value
+    return property(fget, fset)
+
+def _vector(name):
+    def fget(self): return pygame.Vector2(*getattr(self.manager, name)[self.index])
+    def fset(self, value): getattr(self.manager, name)[self.index] = (value[0], value[1])
+    return property(fget, fset)
+
+class EnemyView:
+    """Vista de un enemigo dentro de EnemyArrays con la interfaz que usa el motor.
+
+    Los vectores (world_pos, vel...) se devuelven como copias: para modificarlos
+    hay que reasignarlos (`view.world_pos = ...`), no mutarlos en el sitio.
+    """
+    __slots__ = ("manager", "index")
+    is_player = False
+    combo_index = 0
+    color = RED
+
+    def __init__(self, manager, index):
+        self.manager = manager
+        self.index = index
+
+    world_pos = _vector("pos")
+    prev_world_pos = _vector("prev_pos")
+    vel = _vector("vel")
+    knk_vector = _vector("knk")
+    target_offset = _vector("target_offset")
+    z = _field("z", float)
+    prev_z = _field("prev_z", float)
+    velocity_z = _field("vz", float)
+    hp = _field("hp", float)
+    state_timer = _field("state_timer", int)
+    recovery_timer = _field("recovery_timer", int)
+    flash_timer = _field("flash_timer", int)
+    anim_frame = _field("anim_frame", int)
+    anim_timer = _field("anim_timer", int)
+    jump_anim_timer = _field("jump_anim_timer", int)
+    attack_cooldown = _field("attack_cooldown", int)
+    z_priority = _field("z_priority", int)
+    facing_right = _field("facing_right", bool)
+    is_dead = _field("is_dead", bool)
+    death_sequence_finished = _field("death_sequence_finished", bool)
+    blink_state = _field("blink_state", bool)
+
+    @property
+    def state(self):
+        return STATE_NAMES[self.manager.state[self.index]]
+
+    @state.setter
+    def state(self, value):
+        self.manager.state[self.index] = STATE_CODES[value]
+
+    @property
+    def max_hp(self): return 100
+
+    @property
+    def sprites(self): return self.manager.template.sprites
+
+    @property
+    def animations(self): return self.manager.template.animations
+
+    @property
+    def sprite_bottoms(self): return self.manager.template.sprite_bottoms
+
+    @property
+    def frame_metrics(self): return self.manager.template.frame_metrics
+
+    @property
+    def frame_trims(self): return self.manager.template.frame_trims
+
+    @property
+    def mirrored(self): return self.manager.template.mirrored
+
+    def apply_damage(self, dmg, knockback=False, knk_dir=None):
+        self.manager.apply_damage(self.index, dmg, knockback, knk_dir)
+
+    def snapshot(self):
+        self.manager.prev_pos[self.index] = self.manager.pos[self.index]
+        self.manager.prev_z[self.index] = self.manager.z[self.index]
+
+    def get_render_pos(self, alpha=1.0):
+        return Character.get_render_pos(self, alpha)
+
+    def draw(self, screen, camera_x, scale=1.0, alpha=1.0):
+        return Character.draw(self, screen, camera_x, scale, alpha)
+
+    def current_frame(self):
+        return Character.current_frame(self)
+
+    def get_body_rect(self):
+        return Character.get_body_rect(self)
+
+    def feet_row(self, name, idx, sprite_key, full_h):
+        return Character.feet_row(self, name, idx, sprite_key, full_h)
@@ -1,169 +1,36 @@
 import pygame
 import sys
-import random
 import os
 import math
+import time
 from constants import *
-from utils import draw_gradient_rect, render_gradient_text, blur_surface
-from entities import Character
-
-class CinematicManager:
-    def __init__(self, screen):
-        self.screen = screen
-        self.slides = []
-        self.current_slide_idx = 0
-        self.frame = 0
-        self.active = False
-        self.finished = False
-        self.load_slides()
-
-    def load_slides(self):
-        slide_dir = "slides"
-        if os.path.exists(slide_dir):
-            files = sorted([f for f in os.listdir(slide_dir) if f.endswith(".png")])
-            for f in files:
-                try:
-                    img = pygame.image.load(os.path.join(slide_dir, f)).convert_alpha()
-                    # Definimos efectos predeterminados por slide
-                    slide_data = {
-                        "image": img,
-                        "duration": 180, # 3 segundos aprox
-                        "start_pos": (0.5, 0.5),
-                        "end_pos": (0.5, 0.5),
-                        "start_scale": 1.0,
-                        "end_scale": 1.1,
-                        "shake": False
-                    }
-                    # Personalización según el nombre del archivo
-                    if "slide1" in f:
-                        slide_data["end_pos"] = (0.48, 0.52)
-                    elif "slide2" in f:
-                        slide_data["start_scale"] = 1.2
-                        slide_data["end_scale"] = 1.0
-                    elif "slide3" in f:
-                        slide_data["shake"] = True
-                        slide_data["duration"] = 120 # Más rápido para acción
-                    
-                    self.slides.append(slide_data)
-                except:
-                    print(f"Error cargando slide: {f}")
-        
-        if not self.slides:
-            # Fallback: Crear un slide vacío con texto si no hay imágenes
-            surf = pygame.Surface((WIDTH, HEIGHT))
-            surf.fill((20, 20, 30))
-            self.slides.append({
-                "image": surf, "duration": 60, "start_pos": (0.5, 0.5),
-                "end_pos": (0.5, 0.5), "start_scale": 1.0, "end_scale": 1.0, "shake": False
-            })
-
-    def start(self):
-        self.active = True
-        self.current_slide_idx = 0
-        self.frame = 0
-        self.finished = False
-
-    def skip(self):
-        self.active = False
-        self.finished = True
-
-    def update(self):
-        if not self.active: return
-        
-        self.frame += 1
-        current_slide = self.slides[self.current_slide_idx]
-        
-        if self.frame >= current_slide["duration"]:
-            self.current_slide_idx += 1
-            self.frame = 0
-            if self.current_slide_idx >= len(self.slides):
-                self.active = False
-                self.finished = True
-
-    def draw(self):
-        if not self.active: return
-        
-        slide = self.slides[self.current_slide_idx]
-        progress = self.frame / slide["duration"]
-        
-        # Paneo (Interpolación Lineal entre posiciones)
-        x_pos = slide["start_pos"][0] + (slide["end_pos"][0] - slide["start_pos"][0]) * progress
-        y_pos = slide["start_pos"][1] + (slide["end_pos"][1] - slide["start_pos"][1]) * progress
-        
-        # Zoom (Interpolación entre escalas)
-        scale = slide["start_scale"] + (slide["end_scale"] - slide["start_scale"]) * progress
-        
-        # Temblor
-        off_x, off_y = 0, 0
-        if slide["shake"]:
-            off_x = random.randint(-4, 4)
-            off_y = random.randint(-4, 4)
-            
-        scaled_w = int(WIDTH * scale)
-        scaled_h = int(HEIGHT * scale)
-        
-        try:
-            # Dibujamos centrado según las coordenadas de paneo
-            img_to_draw = pygame.transform.smoothscale(slide["image"], (scaled_w, scaled_h))
-            rect = img_to_draw.get_rect(center=(int(WIDTH * x_pos) + off_x, int(HEIGHT * y_pos) + off_y))
-            self.screen.blit(img_to_draw, rect)
-        except:
-             self.screen.blit(slide["image"], (0, 0))
-
-        # Overlay negro suave en los bordes para estilo cinematográfico
-        pygame.draw.rect(self.screen, (0, 0, 0), (0, 0, WIDTH, 40))
-        pygame.draw.rect(self.screen, (0, 0, 0), (0, HEIGHT - 40, WIDTH, 40))
-
-class Prop:
-    def __init__(self, name, x, y):
-        self.name = name
-        self.world_pos = pygame.Vector2(x, y)
-        self.z = 0
-        self.z_priority = 0
-        self.image = None
-        self.load_image()
-        
-    def load_image(self):
-        path = f"textures/sprites/props/{self.name}.png"
-        if os.path.exists(path):
-            self.image = pygame.image.load(path).convert_alpha()
-        else:
-            self.image = pygame.Surface((40, 40))
-            self.image.fill((200, 0, 200))
-
-    def draw(self, screen, camera_x, scale):
-        if not self.image: return
-        
-        # 1. Calcular Profundidad según Y (0.0 en el horizonte, 1.0 al frente)
-        v = (self.world_pos.y - FLOOR_START_Y) / (HEIGHT - FLOOR_START_Y)
-        # Factor de escala horizontal idéntico al del suelo para sincronización total
-        h_scale = 0.4 + v * 2.2 
-        
-        # 2. Posición X con Perspectiva
-        # El centro de la pantalla es el punto de fuga (Vanishing Point)
-        center_offset = WIDTH // 2
-        rel_world_x = self.world_pos.x - (camera_x + WIDTH // 2)
-        screen_x = center_offset + (rel_world_x * h_scale)
-        
-        # 3. No dibujar si está fuera de pantalla
-        if screen_x < -300 or screen_x > WIDTH + 300: return
-        
-        # 4. Escalar imagen
-        # Usamos 'scale' que viene del loop central (sincronizado con personajes)
-        img_w = int(self.image.get_width() * scale)
-        img_h = int(self.image.get_height() * scale)
-        if img_w <= 0 or img_h <= 0: return
-        
-        try:
-            img = pygame.transform.smoothscale(self.image, (img_w, img_h))
-            rect = img.get_rect()
-            rect.midbottom = (int(screen_x), int(self.world_pos.y))
-            screen.blit(img, rect)
-        except:
-            pass
+from utils import draw_gradient_rect, render_gradient_text, blur_surface, cached_gradient_text, cached_text
+from entities import Character, SPRITE_SCALE_CACHE, prefetch_character
+from atlas import get_atlas
+from floor import PerspectiveFloor
+from spatial import SpatialHash
+from enemy_pool import EnemyPool
+from hud import Hud
+from profiler import FrameProfiler
+from dirty import DirtyRenderer
+from quality import QualityController
+from music import MusicPlayer
+from sound_bus import SoundBus
+from rng import RNG
+from replay import InputRecorder
+from render_queue import RenderQueue
+from world import World, Prop, PROP_TYPES
+from parallax import ParallaxBackground, ParallaxLayer, sky_layer, skyline_layer, sky_to_colorkey
+from cinematic import CinematicManager
+from assets import AssetManager, load_image, prefetch_image, PRIORITY_MENU
 
 class GameEngine:
-    def __init__(self):
+    def __init__(self, headless=False, enemy_backend="objects", dirty_rects=DIRTY_RECTS, seed=None):
+        # Modo headless: sin ventana ni audio real y sin limitar FPS (benchmarks / CI)
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
         pygame.init()
         pygame.mixer.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -189,28 +56,30 @@ class GameEngine:
             "pause": pygame.Rect(WIDTH - 60, 20, 40, 40)
         }
         self.active_touches = {} # ID: ButtonName
-        
-        self.player = Character(200, 480, BLUE, is_player=True)
+        # Fuente del estado de teclas que lee el jugador (reemplazable para input scriptado)
+        self.key_source = pygame.key.get_pressed
+        # Semilla de todos los generadores (rng.py): misma semilla + mismo input = misma partida
+        RNG.reseed(seed)
+        self.seed = RNG.seed
+        # Grabación del input por tic (BEATEMUP_RECORD); se reproduce con replay.py
+        self.recorder = None
+        if not headless and os.environ.get(RECORD_ENV):
+            self.recorder = InputRecorder(os.environ[RECORD_ENV], self.seed, enemy_backend == "numpy")
+            self.key_source = self.recorder.wrap(self.key_source)
+        
+        # Jugador, pool de enemigos, HUD y props se construyen al terminar su carga (request_assets)
+        self.player = None
+        self.enemy_pool = None
+        self.hud = None
         self.enemies = []
-        self.props = []
-        
-        # Generar algunos props decorativos (distribuidos en las aceras)
-        for i in range(25):
-            px = 400 + i * 450 + random.randint(-100, 100)
-            
-            # Distribución: Postes abajo, otros en los bordes
-            prob = random.random()
-            if prob < 0.35: # Postes: Siempre en el borde inferior (cerca de cámara)
-                ptype = "lamp_post"
-                py = random.randint(HEIGHT - 25, HEIGHT - 5)
-            else: # Solo canecas: Arriba o Abajo, lejos de la zona de combate
-                ptype = "trash_can"
-                if random.random() > 0.5:
-                    py = random.randint(FLOOR_START_Y + 5, FLOOR_START_Y + 40) # Aceras fondo
-                else:
-                    py = random.randint(HEIGHT - 60, HEIGHT - 20) # Aceras frente
-            
-            self.props.append(Prop(ptype, px, py))
+        # Backend opcional de enemigos en arrays NumPy ("numpy"); por defecto objetos Character
+        self.enemy_arrays = None
+        if enemy_backend == "numpy":
+            from enemy_soa import EnemyArrays
+            self.enemy_arrays = EnemyArrays()
+        # Índice espacial compartido por colisiones, golpes y HUD (se reconstruye una vez por tic)
+        self.enemy_grid = SpatialHash(SPATIAL_CELL_SIZE)
+        self.render_queue = RenderQueue()
         
         self.last_tap_time = 0
         self.last_key = None
@@ -220,15 +89,26 @@ class GameEngine:
         self.wave_spawn_timer = 0
         
         self.camera_x = 0
+        self.prev_camera_x = 0 # Cámara del paso de simulación anterior
+        self.view_x = 0        # Cámara interpolada que se usa al dibujar
+        self.sim_tick = 0      # Pasos de simulación avanzados
+        # Perfilador por subsistema (F3 lo muestra); la traza solo se guarda si se pide por entorno
+        self.profiler = FrameProfiler(trace_path=os.environ.get(PROFILER_TRACE_ENV))
+        # Volcado por rectángulos sucios (opcional): solo lo que cambia si la cámara no se mueve
+        self.dirty = DirtyRenderer(self.screen.get_size()) if dirty_rects else None
+        # Calidad adaptativa según el tiempo de frame (F4 / BEATEMUP_QUALITY la fuerzan)
+        self.quality = QualityController()
+        self.quality.listeners.append(self.apply_quality)
+        self.apply_quality(self.quality.current)
         self.target_wave_x = 800 
         self.world_end_x = 20000
+        # Props decorativos (distribuidos en las aceras), creados por tramos según avanza la cámara
+        self.world = World(self.world_end_x)
         
         # Sistema de Iluminación
         self.light_pos = pygame.Vector2(WIDTH // 2, 200)
         self.light_strength = 200 # Radio de luz
         
-        self.load_textures()
-        
         # --- VOLUMEN Y PAUSA ---
         self.paused = False
         self.menu_index = 0
@@ -240,12 +120,12 @@ class GameEngine:
         self.music_volume = 0.25 # Antes 0.3
         self.sfx_volume = 0.4   # Antes 0.5 (Reducido un poco más)
         
-        self.load_sounds()
-        self.apply_volumes()
-        
-        # Iniciar Música
-        if "music" in self.sounds:
-            self.sounds["music"].play(-1) # Loop infinito
+        self.sounds = {}
+        # Efectos por grupos de canales con límite de voces y prioridad
+        self.sfx = SoundBus(self.sounds)
+        # Música por streaming (no se decodifica entera en memoria)
+        self.music = MusicPlayer(self.music_volume)
+        self.music.play("stage")
         
         # Sistema de Combo
         font_path = "textures/fonts/BADABB_.TTF"
@@ -275,87 +155,173 @@ class GameEngine:
         self.ui_name_enemy = render_gradient_text(self.ui_name_font, "PUNK", (255, 255, 255), (180, 180, 180), outline_width=3)
         self.ui_go_text = render_gradient_text(self.combo_label_font, "GO!", (255, 255, 0), (255, 40, 0), outline_width=4)
         self.last_go_blink_tick = -1
+        self.closest_enemy_tick = None
+        self.closest_enemy_cache = None
         
-        # Colores para el degradado del combo (Amarillo a Rojo)
-        C_TOP = (255, 255, 0)
-        C_BOTTOM = (255, 40, 0)
-        
-        self.ui_combo_label = render_gradient_text(self.combo_label_font, "HITS", C_TOP, C_BOTTOM, outline_width=4)
+        self.ui_combo_label = render_gradient_text(self.combo_label_font, "HITS", COMBO_TOP, COMBO_BOTTOM, outline_width=4)
         
-        # Pre-renderizar números para mayor flexibilidad
+        # Los números habituales se pre-renderizan durante la carga; los mayores al vuelo (combo_num_surf)
         self.combo_num_surfs = {}
-        for i in range(2, 51):
-            self.combo_num_surfs[i] = render_gradient_text(self.combo_font, str(i), C_TOP, C_BOTTOM, outline_width=5)
-            
-        # --- PRE-CACHEO DE ENEMIGOS ---
-        # Crear un enemigo temporal para forzar la carga de todos sus assets (GIFs/Sprites) en el cache global
-        # Esto evita el mini-congelamiento la primera vez que aparece uno.
-        temp_enemy = Character(-1000, -1000, RED) 
-        del temp_enemy
         
         # --- ESTADO INICIAL DEL JUEGO ---
         self.game_state = "MENU" # MENU, PLAYING
         self.menu_logo = None
-        logo_path = "textures/ui/placeholder_logo.png"
-        if os.path.exists(logo_path):
-            self.menu_logo = pygame.image.load(logo_path).convert_alpha()
         
         self.menu_button_rect = pygame.Rect(WIDTH//2 - 110, HEIGHT//2 + 130, 220, 70) # Bajado un ~10% de la pantalla (50px aprox)
         self.menu_button_pressed = False
         self.menu_button_hover = False
         self.disclaimer_font = pygame.font.SysFont("Arial", 14)
         self.disclaimer_text = "Esto es una demo en estado de propuesta inicial, no representa la calidad del producto final"
-        
-        self.cinematic = CinematicManager(self.screen)
-        
-        self.city_buildings = []
-        for i in range(100):
-            w = random.randint(100, 300)
-            h = random.randint(150, 400)
-            x = i * 200 + random.randint(-50, 50)
-            self.city_buildings.append(pygame.Rect(x, FLOOR_START_Y - h, w, h))
+        # Superficies de menú cacheadas (fondo desenfocado y overlay de pausa)
+        self.menu_backdrop = None
+        self.menu_backdrop_key = None
+        self.pause_overlay = None
+        
+        # --- CARGA DE ASSETS ---
+        # Un hilo decodifica en orden de prioridad (menú, juego, cinemáticas) y el bucle
+        # finaliza lo que esté listo con un presupuesto por frame: el menú sale enseguida.
+        self.assets = AssetManager(threaded=not headless)
+        self.load_textures()
+        self.request_assets()
+        self.cinematic = CinematicManager(self.screen, self.assets)
+        if headless:
+            # Benchmarks y tests esperan el juego completo tras el constructor
+            self.assets.wait()
 
     def load_textures(self):
+        """Pide fondo, suelo y logo del menú (prioridad máxima)."""
         self.bg_tex = None
+        # Cielo y siluetas lejanas no dependen de archivos: están desde el primer frame
+        self.parallax = ParallaxBackground([sky_layer(), skyline_layer()])
         self.floor_tex = None
+        self.floor = None
+        self.ui_frame = None
+        self.ui_fill_p = None
+        self.ui_fill_e = None
         
         bg_path = "textures/background/city_background_texture.png"
         floor_path = "textures/background/ground.png"
         if not os.path.exists(floor_path):
             floor_path = "textures/background/street_pavement_texture_with_sidewalk.png"
+        if not os.path.exists(floor_path):
+            # Generar placeholder de suelo detallado si no existe
+            self.generate_background_placeholders()
+            floor_path = "textures/background/ground.png"
+        
+        atlas = get_atlas()
+        if atlas:
+            # Las hojas del atlas las usan el logo, la UI, los props y los personajes
+            self.assets.request("atlas", lambda: [prefetch_image(p) for p in atlas.sheet_paths()],
+                                group="menu", priority=PRIORITY_MENU)
         
         if os.path.exists(bg_path):
-            raw_bg = pygame.image.load(bg_path).convert()
-            # ESCALADO DE ALTA CALIDAD: Ajustar altura pero preservar ancho para nitidez
-            target_h = FLOOR_START_Y
-            aspect_ratio = raw_bg.get_width() / raw_bg.get_height()
-            target_w = int(target_h * aspect_ratio)
-            self.bg_tex = pygame.transform.smoothscale(raw_bg, (target_w, target_h))
+            def load_bg():
+                raw_bg = pygame.image.load(bg_path)
+                # ESCALADO DE ALTA CALIDAD: Ajustar altura pero preservar ancho para nitidez
+                target_h = FLOOR_START_Y
+                aspect_ratio = raw_bg.get_width() / raw_bg.get_height()
+                target_w = int(target_h * aspect_ratio)
+                return pygame.transform.smoothscale(raw_bg, (target_w, target_h))
+            self.assets.request("background", load_bg, self.set_background, group="menu", priority=PRIORITY_MENU)
             
-        if os.path.exists(floor_path):
-            raw_floor = pygame.image.load(floor_path).convert()
+        def load_floor():
+            raw_floor = pygame.image.load(floor_path)
             # Mantenemos el suelo con alta resolución para evitar pixelación en las tiras
             # Si es extremadamente grande, lo limitamos, pero 1024 o 2048 está bien.
             if raw_floor.get_height() > 1024:
                 raw_floor = pygame.transform.smoothscale(raw_floor, (int(1024 * (raw_floor.get_width() / raw_floor.get_height())), 1024))
-            self.floor_tex = raw_floor
+            return raw_floor
+        self.assets.request("floor", load_floor, self.set_floor, group="menu", priority=PRIORITY_MENU)
+        
+        logo_path = "textures/ui/placeholder_logo.png"
+        def load_logo():
+            if not (atlas and atlas.has("ui/placeholder_logo")) and os.path.exists(logo_path):
+                prefetch_image(logo_path)
+        def set_logo(_):
+            if atlas and atlas.has("ui/placeholder_logo"):
+                self.menu_logo = atlas.surface("ui/placeholder_logo")
+            elif os.path.exists(logo_path):
+                self.menu_logo = load_image(logo_path)
+            return self.menu_logo
+        self.assets.request("menu_logo", load_logo, set_logo, group="menu", priority=PRIORITY_MENU)
+
+    def set_background(self, raw_bg):
+        # Con canal alfa (cielo transparente) deja ver las capas de detrás. Si es opaca se
+        # quita su banda de cielo: si no, taparía el cielo y las siluetas y ni se compondrían
+        if raw_bg.get_flags() & pygame.SRCALPHA:
+            self.bg_tex = raw_bg.convert_alpha()
         else:
-            # Generar placeholder de suelo detallado si no existe
-            self.generate_background_placeholders()
-
-        # Cargar Texturas de UI
-        self.ui_frame = None
-        self.ui_fill_p = None
-        self.ui_fill_e = None
+            self.bg_tex = sky_to_colorkey(raw_bg.convert())
+        self.parallax.add(ParallaxLayer("facades", self.bg_tex, PARALLAX_FACADE_FACTOR))
+        return self.bg_tex
+
+    def set_floor(self, raw_floor):
+        self.floor_tex = raw_floor.convert()
+        # Tiras del suelo pre-escaladas por línea (ver floor.py)
+        self.floor = PerspectiveFloor(self.floor_tex)
+        return self.floor
+
+    def request_assets(self):
+        """Pide lo del juego: personajes, UI, sonidos, props y números de combo."""
+        self.assets.request("player", lambda: prefetch_character(True), self.create_player)
+        # Pre-crear enemigos fuerza la carga de todos sus assets (GIFs/Sprites) en el cache global
+        # y evita construir instancias nuevas (y el mini-congelamiento) en cada spawn.
+        self.assets.request("enemy_pool", lambda: prefetch_character(False), self.create_enemy_pool)
         
+        # Cargar Texturas de UI
         ui_path = "textures/ui/"
-        if os.path.exists(ui_path + "health_frame.png"):
-            self.ui_frame = pygame.image.load(ui_path + "health_frame.png").convert_alpha()
-            self.ui_fill_p = pygame.image.load(ui_path + "health_fill_player.png").convert_alpha()
-            self.ui_fill_e = pygame.image.load(ui_path + "health_fill_enemy.png").convert_alpha()
+        ui_files = ["health_frame.png", "health_fill_player.png", "health_fill_enemy.png"]
+        atlas = get_atlas()
+        def load_ui():
+            if not (atlas and atlas.has("ui/health_frame")) and os.path.exists(ui_path + ui_files[0]):
+                for name in ui_files:
+                    prefetch_image(ui_path + name)
+        def set_ui(_):
+            if atlas and atlas.has("ui/health_frame"):
+                self.ui_frame = atlas.surface("ui/health_frame")
+                self.ui_fill_p = atlas.surface("ui/health_fill_player")
+                self.ui_fill_e = atlas.surface("ui/health_fill_enemy")
+            elif os.path.exists(ui_path + ui_files[0]):
+                self.ui_frame, self.ui_fill_p, self.ui_fill_e = [load_image(ui_path + name) for name in ui_files]
+            self.hud = Hud(self.ui_frame, self.ui_fill_p, self.ui_fill_e, self.ui_name_player, self.ui_name_enemy)
+            return self.hud
+        self.assets.request("hud", load_ui, set_ui)
+        
+        self.load_sounds()
+        
+        prop_paths = [f"textures/sprites/props/{ptype}.png" for ptype in PROP_TYPES]
+        def load_props():
+            if not atlas:
+                for path in prop_paths:
+                    if os.path.exists(path): prefetch_image(path)
+        self.assets.request("props", load_props, self.create_props)
+        
+        # Números de combo en tandas para no ocupar un frame entero
+        for start in range(2, 51, 10):
+            self.assets.request(f"combo_nums_{start}", None,
+                                lambda _, start=start: [self.combo_num_surf(i) for i in range(start, min(start + 10, 51))])
+
+    def create_player(self, _):
+        self.player = Character(200, 480, BLUE, is_player=True)
+        return self.player
+
+    def create_enemy_pool(self, _):
+        self.enemy_pool = EnemyPool(ENEMY_POOL_SIZE)
+        return self.enemy_pool
+
+    def create_props(self, _):
+        # Una imagen por tipo de prop, compartida por todas sus instancias
+        for ptype in PROP_TYPES:
+            self.world.images[ptype] = Prop(ptype, 0, 0).image
+        self.stream_world()
+        return self.world
+
+    def stream_world(self):
+        """Crea/recicla los tramos de props al alcance de la cámara."""
+        if self.world.update(self.camera_x):
+            self.render_queue.set_static(self.world.props)
 
     def load_sounds(self):
-        self.sounds = {}
         sound_path = "sounds/"
         if not os.path.exists(sound_path):
             os.makedirs(sound_path)
@@ -368,32 +334,27 @@ class GameEngine:
             "e_damage": "enemy_damage.wav",
             "e_hit": "enemy_hit.wav",
             "powerup": "power_up.wav",
-            "music": "music.wav",
             "go_bell": "go_bell.wav",
             "hit_special": "player_hit_special.wav"
         }
         
         for key, filename in files.items():
             path = os.path.join(sound_path, filename)
-            
-            # Soporte para MP3 en la música
-            if key == "music":
-                mp3_path = os.path.join(sound_path, "music.mp3")
-                if os.path.exists(mp3_path):
-                    path = mp3_path
-            
             if os.path.exists(path):
-                self.sounds[key] = pygame.mixer.Sound(path)
-                if key == "music": self.sounds[key].set_volume(self.music_volume)
-                else: self.sounds[key].set_volume(self.sfx_volume)
+                # Se decodifica en el hilo; el volumen se aplica al llegar
+                self.assets.request(f"sound/{key}", lambda path=path: pygame.mixer.Sound(path),
+                                    lambda sound, key=key: self.add_sound(key, sound))
+
+    def add_sound(self, key, sound):
+        self.sounds[key] = sound
+        sound.set_volume(self.sfx_volume)
+        return sound
 
     def apply_volumes(self):
-        """Aplica los volúmenes actuales a todos los sonidos cargados."""
-        for key, sound in self.sounds.items():
-            if key == "music":
-                sound.set_volume(self.music_volume)
-            else:
-                sound.set_volume(self.sfx_volume)
+        """Aplica los volúmenes actuales a la música y a todos los sonidos cargados."""
+        self.music.set_volume(self.music_volume)
+        for sound in self.sounds.values():
+            sound.set_volume(self.sfx_volume)
 
     def generate_background_placeholders(self):
         bg_folder = "textures/background"
@@ -418,38 +379,57 @@ class GameEngine:
         # Guardo también como ground.png por si el usuario lo prefiere
         pygame.image.save(fl_surf, os.path.join(bg_folder, "ground.png"))
         
-        # Fondo con edificios/ventanas
+        # Fondo con edificios/ventanas (cielo y huecos transparentes: se ven las siluetas lejanas)
         bg_w, bg_h = 512, 512
-        bg_surf = pygame.Surface((bg_w, bg_h))
-        bg_surf.fill((15, 15, 25))
+        bg_surf = pygame.Surface((bg_w, bg_h), pygame.SRCALPHA)
         for x in range(30, bg_w, 100):
             pygame.draw.rect(bg_surf, (25, 25, 35), (x, 100, 70, 412))
             for wy in range(120, 400, 40):
                 pygame.draw.rect(bg_surf, (60, 60, 40), (x+10, wy, 20, 20))
                 pygame.draw.rect(bg_surf, (60, 60, 40), (x+40, wy, 20, 20))
         pygame.image.save(bg_surf, os.path.join(bg_folder, "city_background_texture.png"))
-        
-        # Recargar
-        self.load_textures()
+
+    def start_cinematic(self):
+        # Si se pulsa antes de que acabe la carga, se termina aquí (normalmente ya está todo).
+        # Solo lo necesario: el horneado de las slides sigue en el hilo de carga
+        self.assets.wait("menu", "gameplay", "cinematic/0")
+        self.game_state = "CINEMATIC"
+        self.cinematic.start()
 
     def trigger_wave(self):
         self.wave_active = True
-        self.wave_enemies_to_spawn = random.randint(2, 4)
+        self.wave_enemies_to_spawn = RNG.waves.randint(2, 4)
         self.wave_spawn_timer = 0
+        self.enemy_pool.begin_wave()
+        self.music.play("wave")
 
     def spawn_enemy(self):
         offsets = [pygame.Vector2(75, -15), pygame.Vector2(-75, 15), pygame.Vector2(0, 45)]
-        spawn_x = self.camera_x + (WIDTH + 100 if random.random() > 0.5 else -100)
-        e = Character(spawn_x, random.randint(FLOOR_START_Y + 40, HEIGHT - 40), RED)
-        e.target_offset = random.choice(offsets)
+        spawn_x = self.camera_x + (WIDTH + 100 if RNG.spawn.random() > 0.5 else -100)
+        spawn_y = RNG.spawn.randint(FLOOR_START_Y + 40, HEIGHT - 40)
+        if self.enemy_arrays:
+            e = self.enemy_arrays.spawn(spawn_x, spawn_y)
+        else:
+            e = self.enemy_pool.acquire(spawn_x, spawn_y)
+        e.target_offset = RNG.spawn.choice(offsets)
         self.enemies.append(e)
+        self.enemy_grid.insert(e)
+        self.closest_enemy_tick = None # La lista cambió: recalcular el enemigo del HUD
         self.wave_enemies_to_spawn -= 1
 
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                self.profiler.dump()
+                if self.recorder: self.recorder.close()
                 pygame.quit()
                 sys.exit()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle()
+                continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.quality.cycle_override()
+                continue
             
             # Eventos de Menú (MOUSE)
             if self.game_state == "MENU":
@@ -458,13 +438,11 @@ class GameEngine:
                         self.menu_button_pressed = True
                 if event.type == pygame.MOUSEBUTTONUP:
                     if self.menu_button_pressed and self.menu_button_rect.collidepoint(event.pos):
-                        self.game_state = "CINEMATIC"
-                        self.cinematic.start()
+                        self.start_cinematic()
                     self.menu_button_pressed = False
                 if event.type == pygame.KEYDOWN:
                     if event.key in [pygame.K_RETURN, pygame.K_SPACE, pygame.K_z]:
-                        self.game_state = "CINEMATIC"
-                        self.cinematic.start()
+                        self.start_cinematic()
                 continue
 
             if self.game_state == "CINEMATIC":
@@ -477,7 +455,7 @@ class GameEngine:
             if event.type == pygame.KEYDOWN:
                 # Pausa con Enter
                 if event.key == pygame.K_RETURN:
-                    self.paused = not self.paused
+                    self.player_action("pause", int(not self.paused))
                     return
 
                 if self.paused:
@@ -501,42 +479,31 @@ class GameEngine:
                             self.apply_volumes()
                     elif event.key in [pygame.K_z, pygame.K_p, pygame.K_SPACE]:
                         if self.menu_index == 0: # Continuar
-                            self.paused = False
+                            self.player_action("pause", 0)
                         elif self.menu_index == 1: # Reiniciar
-                            self.restart_game()
+                            self.player_action("restart")
                     return
 
                 if event.key in [pygame.K_RIGHT, pygame.K_d, pygame.K_LEFT, pygame.K_a]:
                     now = pygame.time.get_ticks()
                     if self.last_key == event.key and now - self.last_tap_time < 450:
-                        self.player.is_running = True
+                        self.player_action("run", 1)
                     self.last_tap_time = now
                     self.last_key = event.key
                 
-                if event.key in [pygame.K_z, pygame.K_p] and self.player.state not in ["STUN", "KNOCKBACK", "DOWN"]:
-                    self.execute_player_attack()
+                if event.key in [pygame.K_z, pygame.K_p]:
+                    self.player_action("attack")
                 
-                if event.key in [pygame.K_x, pygame.K_o] and self.player.state not in ["STUN", "KNOCKBACK", "DOWN"]:
-                    self.execute_player_special()
+                if event.key in [pygame.K_x, pygame.K_o]:
+                    self.player_action("special")
                 
-                if event.key == pygame.K_SPACE and self.player.state not in ["STUN", "KNOCKBACK", "DOWN"]:
-                    if self.player.jumps_done < 2:
-                        self.player.velocity_z = JUMP_POWER
-                        self.player.state = "JUMP"
-                        self.player.jumps_done += 1
-                        self.player.jump_anim_timer = 0
-                
-                if event.key == pygame.K_k and self.player.state not in ["STUN", "KNOCKBACK", "DOWN"]:
-                     # Agregamos salto con K también por comodidad si se usa WASD/P
-                     if self.player.jumps_done < 2:
-                        self.player.velocity_z = JUMP_POWER
-                        self.player.state = "JUMP"
-                        self.player.jumps_done += 1
-                        self.player.jump_anim_timer = 0
+                # Salto con espacio, y con K también por comodidad si se usa WASD/P
+                if event.key in [pygame.K_SPACE, pygame.K_k]:
+                    self.player_action("jump")
 
             if event.type == pygame.KEYUP:
                 if event.key in [pygame.K_RIGHT, pygame.K_d, pygame.K_LEFT, pygame.K_a]:
-                    self.player.is_running = False
+                    self.player_action("run", 0)
 
             # --- EVENTOS TACTILES (ANDROID/IOS) ---
             if event.type in [pygame.FINGERDOWN, pygame.FINGERMOTION, pygame.FINGERUP]:
@@ -557,43 +524,58 @@ class GameEngine:
             # --- EVENTOS DE MANDO (BLUETOOTH) ---
             if event.type == pygame.JOYBUTTONDOWN:
                 self.mobile_mode = True
-                if event.button == 0: self.execute_player_attack() # A / X
-                if event.button == 1: self.execute_player_special() # B / O
-                if event.button == 2: # X / []
-                     if self.player.jumps_done < 2:
-                        self.player.velocity_z = JUMP_POWER
-                        self.player.state = "JUMP"
-                        self.player.jumps_done += 1
-                if event.button == 7: self.paused = not self.paused # Start
+                if event.button == 0: self.player_action("attack") # A / X
+                if event.button == 1: self.player_action("special") # B / O
+                if event.button == 2: self.player_action("jump") # X / []
+                if event.button == 7: self.player_action("pause", int(not self.paused)) # Start
             
             if event.type == pygame.JOYAXISMOTION:
                 self.mobile_mode = True
-                if event.axis == 0: # X-axis
-                    if event.value > 0.5: self.player.move_dir.x = 1
-                    elif event.value < -0.5: self.player.move_dir.x = -1
-                    else: self.player.move_dir.x = 0
-                if event.axis == 1: # Y-axis
-                    if event.value > 0.5: self.player.move_dir.y = 1
-                    elif event.value < -0.5: self.player.move_dir.y = -1
-                    else: self.player.move_dir.y = 0
+                direction = 1 if event.value > 0.5 else -1 if event.value < -0.5 else 0
+                if event.axis == 0: self.player_action("move_x", direction) # X-axis
+                if event.axis == 1: self.player_action("move_y", direction) # Y-axis
 
     def _handle_mobile_input(self, name, pressed):
         """Maneja las pulsaciones de botones virtuales."""
-        if name == "attack" and pressed: self.execute_player_attack()
-        elif name == "special" and pressed: self.execute_player_special()
-        elif name == "jump" and pressed:
-             if self.player.jumps_done < 2:
-                self.player.velocity_z = JUMP_POWER
-                self.player.state = "JUMP"
-                self.player.jumps_done += 1
-        elif name == "pause" and pressed: self.paused = not self.paused
-        elif name == "up": self.player.move_dir.y = -1 if pressed else 0
-        elif name == "down": self.player.move_dir.y = 1 if pressed else 0
-        elif name == "left": self.player.move_dir.x = -1 if pressed else 0
-        elif name == "right": self.player.move_dir.x = 1 if pressed else 0
+        if name in ["attack", "special", "jump"] and pressed: self.player_action(name)
+        elif name == "pause" and pressed: self.player_action("pause", int(not self.paused))
+        elif name == "up": self.player_action("move_y", -1 if pressed else 0)
+        elif name == "down": self.player_action("move_y", 1 if pressed else 0)
+        elif name == "left": self.player_action("move_x", -1 if pressed else 0)
+        elif name == "right": self.player_action("move_x", 1 if pressed else 0)
+
+    def player_action(self, action, value=0):
+        """Acción discreta del jugador (teclado, táctil o mando); se graba para poder reproducirla."""
+        if self.recorder:
+            self.recorder.action(action, value)
+        player = self.player
+        can_act = player.state not in ["STUN", "KNOCKBACK", "DOWN"]
+        if action == "attack" and can_act:
+            self.execute_player_attack()
+        elif action == "special" and can_act:
+            self.execute_player_special()
+        elif action == "jump" and can_act and player.jumps_done < 2:
+            player.velocity_z = JUMP_POWER
+            player.state = "JUMP"
+            player.jumps_done += 1
+            player.jump_anim_timer = 0
+        elif action == "run":
+            player.is_running = bool(value)
+        elif action == "pause":
+            self.paused = bool(value)
+        elif action == "restart":
+            self.restart_game()
+        elif action == "move_x":
+            player.move_dir.x = value
+        elif action == "move_y":
+            player.move_dir.y = value
+
+    def sim_time(self):
+        """Milisegundos de simulación (no de reloj): las ventanas de combo se repiten igual al reproducir."""
+        return self.sim_tick * 1000 // FPS
 
     def execute_player_attack(self):
-        now = pygame.time.get_ticks()
+        now = self.sim_time()
         
         # 1. ANTISPAM / BUFFER: No interrumpir si el GIF actual no ha terminado
         # O si estamos en tiempo de recuperación (recovery)
@@ -649,9 +631,7 @@ class GameEngine:
         # 1. SONIDO DE SWING: Sincronizado con el inicio del movimiento (Frame 1)
         if self.player.anim_frame >= 1 and not self.player.swing_done:
             self.player.swing_done = True
-            s_key = f"hit{self.player.combo_index + 1}"
-            if s_key in self.sounds:
-                self.sounds[s_key].play()
+            self.sfx.play(f"hit{self.player.combo_index + 1}")
 
         if self.player.hit_connected:
             return
@@ -667,13 +647,20 @@ class GameEngine:
         if self.player.anim_frame >= active_frame:
             # 4. DETECCIÓN DE HITBOX (Múltiples enemigos)
             hit_targets = []
-            for e in self.enemies:
+            p_pos = self.player.world_pos
+            reach_y = HIT_RANGE_Y * HIT_RANGE_Y_MULT
+            candidates = self.enemy_grid.query_rect(p_pos.x - HIT_RANGE_X, p_pos.y - reach_y, p_pos.x + HIT_RANGE_X, p_pos.y + reach_y)
+            body = self.player.get_body_rect()
+            for e in candidates:
                 if e.state == "DOWN": continue
                 distvec = e.world_pos - self.player.world_pos
                 # Rango de detección
                 if distvec.length() < HIT_RANGE_X and abs(distvec.y) < (HIT_RANGE_Y * HIT_RANGE_Y_MULT):
                     if (self.player.facing_right and distvec.x > -15) or (not self.player.facing_right and distvec.x < 15):
-                        hit_targets.append(e)
+                        # El golpe tiene que pasar a la altura del cuerpo (bbox opaco del frame, con z)
+                        target = e.get_body_rect()
+                        if target.top < body.bottom and target.bottom > body.top:
+                            hit_targets.append(e)
 
             # 5. APLICAR DAÑO Y EFECTOS A TODOS LOS ALCANZADOS
             if hit_targets:
@@ -687,11 +674,11 @@ class GameEngine:
                 
                 # Sonidos de impacto: Si alguien muere, usamos el especial directamente para que sea instantáneo
                 if any_will_die and "hit_special" in self.sounds:
-                    self.sounds["hit_special"].play()
-                elif "e_hit" in self.sounds:
-                    self.sounds["e_hit"].play()
+                    self.sfx.play("hit_special")
+                else:
+                    self.sfx.play("e_hit")
                 
-                now_hit = pygame.time.get_ticks()
+                now_hit = self.sim_time()
                 knk_dir = pygame.Vector2(1 if self.player.facing_right else -1, 0)
                 
                 avg_x = 0
@@ -734,7 +721,7 @@ class GameEngine:
             self.player.hit_connected = False
             self.player.swing_done = False
             self.player.state_timer = 25
-            for e in self.enemies:
+            for e in self.enemy_grid.query_radius(self.player.world_pos, 130):
                 if e.state == "DOWN": continue
                 dist = (e.world_pos - self.player.world_pos).length()
                 if dist < 130:
@@ -745,17 +732,35 @@ class GameEngine:
 
     def restart_game(self):
         """Reinicia el estado del juego."""
-        self.player = Character(200, 480, BLUE, is_player=True)
+        self.player.reset(200, 480)
+        for e in self.enemies:
+            if not self.enemy_arrays: self.enemy_pool.release(e)
         self.enemies = []
+        if self.enemy_arrays: self.enemy_arrays.clear()
+        self.enemy_grid.rebuild(self.enemies)
+        self.closest_enemy_tick = None # Sin esto el HUD seguiría mostrando un enemigo ya liberado
         self.camera_x = 0
+        self.prev_camera_x = 0
         self.target_wave_x = 800
         self.wave_active = False
         self.wave_enemies_to_spawn = 0
         self.paused = False
-        # Reiniciar música por si acaso
-        if "music" in self.sounds:
-            self.sounds["music"].stop()
-            self.sounds["music"].play(-1)
+        # Reiniciar música desde el principio
+        self.music.play("stage", fade=False, restart=True)
+
+    def step(self):
+        """Avanza un paso fijo de simulación guardando el estado previo para interpolar."""
+        self.sim_tick += 1
+        self.prev_camera_x = self.camera_x
+        self.player.snapshot()
+        if self.enemy_arrays:
+            self.enemy_arrays.snapshot()
+        else:
+            for e in self.enemies: e.snapshot()
+        self.update()
+        self.stream_world()
+        if self.recorder:
+            self.recorder.end_tick(self)
 
     def update(self):
         if self.game_state == "CINEMATIC":
@@ -786,11 +791,23 @@ class GameEngine:
                     self.wave_spawn_timer = 0
             if self.wave_enemies_to_spawn <= 0 and len(self.enemies) == 0:
                 self.wave_active = False
-                self.target_wave_x = self.player.world_pos.x + random.choice(DISTANCE_TO_NEXT_WAVE)
-
-        self.player.update(enemies=self.enemies, camera_x=self.camera_x)
-        self.check_player_hit_logic()
-        for e in self.enemies: e.update(player_ref=self.player, enemies=self.enemies, camera_x=self.camera_x)
+                self.music.play("stage")
+                self.target_wave_x = self.player.world_pos.x + RNG.waves.choice(DISTANCE_TO_NEXT_WAVE)
+
+        prof = self.profiler
+        with prof.section("player"):
+            self.player.update(enemies=self.enemies, camera_x=self.camera_x, keys=self.key_source(), grid=self.enemy_grid)
+        with prof.section("hit_logic"):
+            self.check_player_hit_logic()
+            # Los golpes empujan a los enemigos (hasta 15 px): reubicarlos en la cuadrícula
+            self.enemy_grid.refresh()
+        with prof.section("enemies"):
+            if self.enemy_arrays:
+                self.enemy_arrays.step(self.player)
+            else:
+                for e in self.enemies:
+                    e.update(player_ref=self.player, enemies=self.enemies, camera_x=self.camera_x, grid=self.enemy_grid)
+                    self.enemy_grid.move(e) # Knockback: hasta 12 px por tic, más colisiones
         
         # Mover la luz suavemente siguiendo al jugador o un patrón
         self.light_pos.x = (self.player.world_pos.x - self.camera_x)
@@ -800,69 +817,31 @@ class GameEngine:
             self.combo_vis_timer -= 1
             
         # Limpiar enemigos solo cuando terminen de parpadear y morir
-        self.enemies = [e for e in self.enemies if not e.death_sequence_finished]
+        with prof.section("cleanup"):
+            if self.enemy_arrays:
+                self.enemies = list(self.enemy_arrays.remove_finished())
+            else:
+                alive = []
+                for e in self.enemies:
+                    if e.death_sequence_finished: self.enemy_pool.release(e) # Vuelve al pool
+                    else: alive.append(e)
+                self.enemies = alive
+            self.enemy_grid.rebuild(self.enemies)
 
     def draw_3d_floor(self):
-        if not self.floor_tex:
+        if not self.floor:
             draw_gradient_rect(self.screen, (0, FLOOR_START_Y, WIDTH, HEIGHT - FLOOR_START_Y), FLOOR_TOP, FLOOR_BOTTOM)
             return
-
-        floor_h = HEIGHT - FLOOR_START_Y
-        tex_w, tex_h = self.floor_tex.get_size()
-        center_offset = WIDTH // 2
-        
-        # Dibujamos línea a línea desde el horizonte hasta el frente
-        for sy in range(0, floor_h, 2): # Paso de 2 para optimizar
-            v = sy / floor_h
-            h_scale = 0.4 + v * 2.2 # El mismo factor que los props
-            
-            line_w = int(WIDTH * h_scale)
-            if line_w <= 0: continue
-            
-            # Textura v-mapping (v^1.8 genera sensación de mayor velocidad al frente)
-            # Clampeamos ty para evitar errores de subsurface
-            ty = int((v**1.8 % 1.0) * tex_h)
-            ty = max(0, min(ty, tex_h - 1))
-            
-            try:
-                line_slice = self.floor_tex.subsurface((0, ty, tex_w, 1))
-                # Usamos scale en lugar de smoothscale para mayor estabilidad y rendimiento
-                scaled_line = pygame.transform.scale(line_slice, (line_w, 2))
-                
-                # Posicionamiento: El mundo se mueve respecto a camera_x
-                # Pero la perspectiva "comprime" ese movimiento al fondo
-                rel_x = int(self.camera_x * h_scale) % line_w
-                
-                start_x = (center_offset - rel_x)
-                if line_w > 0:
-                    while start_x > 0: start_x -= line_w
-                
-                x = start_x
-                while x < WIDTH:
-                    self.screen.blit(scaled_line, (x, FLOOR_START_Y + sy))
-                    if line_w > 0: x += line_w
-                    else: break
-            except:
-                continue
+        # Dibujamos línea a línea desde el horizonte hasta el frente (Paso de 2 para optimizar)
+        self.floor.draw(self.screen, self.view_x, step=self.quality.floor_step)
 
     def draw_3d_background(self):
-        if not self.bg_tex:
-            draw_gradient_rect(self.screen, (0, 0, WIDTH, FLOOR_START_Y), SKY_TOP, SKY_BOTTOM)
-            return
+        # Fondo PARALELO a la pantalla (Vertical/Upright): cielo, siluetas y fachadas (parallax.py)
+        self.parallax.draw(self.screen, self.view_x)
 
-        # Fondo PARALELO a la pantalla (Vertical/Upright)
-        tex_w = self.bg_tex.get_width()
-        # Parallax suave
-        rel_x = int(self.camera_x * 0.3) % tex_w
-        
-        self.screen.blit(self.bg_tex, (-rel_x, 0))
-        # Tiling: Si el fondo no cubre toda la pantalla por el rel_x, dibujamos otro al lado
-        if rel_x > 0:
-             self.screen.blit(self.bg_tex, (tex_w - rel_x, 0))
-        if tex_w - rel_x < WIDTH:
-             self.screen.blit(self.bg_tex, (tex_w - rel_x + tex_w, 0)) # Tercer tile por si acaso
-
-    def draw(self):
+    def draw(self, alpha=1.0):
+        # alpha: fracción del siguiente paso de simulación ya transcurrida (interpolación)
+        self.view_x = self.prev_camera_x + (self.camera_x - self.prev_camera_x) * alpha
         if self.game_state == "MENU":
             self.draw_main_menu()
             return
@@ -871,54 +850,90 @@ class GameEngine:
             self.screen.fill((0, 0, 0))
             self.cinematic.draw()
             # Botón de saltar pequeño en una esquina
-            skip_text = self.font.render("ENTER PARA SALTAR", True, (150, 150, 150))
+            skip_text = cached_text(self.font, "ENTER PARA SALTAR", (150, 150, 150))
             self.screen.blit(skip_text, (WIDTH - 180, HEIGHT - 30))
-            pygame.display.flip()
+            self.present()
             return
 
-        # 1. Dibujar Planos 3D
-        self.draw_3d_background()
-        self.draw_3d_floor()
+        prof = self.profiler
+        dirty = self.dirty
+        if dirty and self.paused:
+            # La pausa es estática: solo se redibuja si cambia la opción, el volumen o el perfilador
+            key = ("pause", self.menu_index, self.music_volume, self.sfx_volume, prof.revision())
+            if dirty.key == key:
+                dirty.skip()
+                return
+        else:
+            key = ("scene", self.view_x, self.screen.get_size(), self.quality.floor_step)
+        recording = dirty is not None and not self.paused
 
+        # 1. Dibujar Planos 3D
+        if recording and dirty.can_patch(key):
+            # Cámara quieta: basta con reponer el fondo bajo lo pintado el frame anterior
+            with prof.section("background"):
+                dirty.restore(self.screen)
+        else:
+            with prof.section("background"):
+                self.draw_3d_background()
+            with prof.section("floor"):
+                self.draw_3d_floor()
+            if recording:
+                dirty.capture(self.screen, key)
+
+        # 2. Sprites y UI (en modo sucio se anota el rect de cada blit)
+        canvas = self.screen
+        if recording:
+            self.screen = dirty.record(canvas)
+        try:
+            self.draw_scene(alpha)
+            self.present(key)
+        finally:
+            self.screen = canvas
+
+    def draw_scene(self, alpha):
+        """Todo lo que va sobre el fondo y el suelo: sprites, combo, HUD, GO!, pausa y controles."""
+        prof = self.profiler
         # 2. Dibujar Sprites (Personajes + Props) ordenados por Y (Profundidad)
-        all_sprites = []
-        all_sprites.append(self.player)
-        for e in self.enemies: all_sprites.append(e)
-        for p in self.props: all_sprites.append(p)
-        
         # Profundidad dinámica: El atacante se sobrepone al herido solo si están en la misma línea (Y)
         # Esto evita que se sobrepongan a objetos de la escena como postes.
-        all_sprites.sort(key=lambda s: (int(s.world_pos.y), getattr(s, 'z_priority', 0)))
-        
-        for s in all_sprites:
-            # Calcular escala según profundidad Y
-            y_diff = s.world_pos.y - FLOOR_START_Y
-            v_factor = y_diff / (HEIGHT - FLOOR_START_Y) if HEIGHT != FLOOR_START_Y else 0
-            sprite_scale = 0.8 + (v_factor * 0.4)
-            sprite_scale = max(0.01, sprite_scale) # Seguridad total
-            
-            s.draw(self.screen, self.camera_x, scale=sprite_scale)
+        # Los props ya están ordenados en la cola; solo se recolocan los personajes (render_queue.py)
+        with prof.section("sort"):
+            all_sprites = self.render_queue.build([self.player] + self.enemies, self.view_x)
+        
+        with prof.section("sprites"):
+            for s in all_sprites:
+                # Calcular escala según profundidad Y
+                render_pos, _ = s.get_render_pos(alpha)
+                y_diff = render_pos.y - FLOOR_START_Y
+                v_factor = y_diff / (HEIGHT - FLOOR_START_Y) if HEIGHT != FLOOR_START_Y else 0
+                sprite_scale = 0.8 + (v_factor * 0.4)
+                sprite_scale = max(0.01, sprite_scale) # Seguridad total
+                
+                s.draw(self.screen, self.view_x, scale=sprite_scale, alpha=alpha)
 
         # 2.1 Dibujar Texto de Combo
         if self.combo_vis_timer > 0:
-            self.draw_combo_ui()
+            with prof.section("combo"):
+                self.draw_combo_ui()
 
 
         # 3. UI
-        self.draw_ui()
+        with prof.section("hud"):
+            self.draw_ui()
         if not self.wave_active:
             current_blink = pygame.time.get_ticks() // 600
             if current_blink % 2 == 0:
                 # Play sound only when transitioning to visible
                 if self.last_go_blink_tick != current_blink:
-                    if "go_bell" in self.sounds: self.sounds["go_bell"].play()
+                    self.sfx.play("go_bell")
                     self.last_go_blink_tick = current_blink
                 
-                # Sombra del GO!
-                shd_go = self.ui_go_text.copy()
-                shd_go.fill((0, 0, 0, 128), special_flags=pygame.BLEND_RGBA_MULT)
-                shd_rect = shd_go.get_rect(center=(WIDTH - 150 + 4, 150 + 4))
-                self.screen.blit(shd_go, shd_rect)
+                # Sombra del GO! (se omite en calidad baja)
+                if self.quality.effects:
+                    shd_go = self.ui_go_text.copy()
+                    shd_go.fill((0, 0, 0, 128), special_flags=pygame.BLEND_RGBA_MULT)
+                    shd_rect = shd_go.get_rect(center=(WIDTH - 150 + 4, 150 + 4))
+                    self.screen.blit(shd_go, shd_rect)
 
                 # Dibujar "GO!" con sombra y escalado suave
                 go_rect = self.ui_go_text.get_rect(center=(WIDTH - 150, 150))
@@ -929,8 +944,24 @@ class GameEngine:
         
         if self.mobile_mode:
             self.draw_mobile_ui()
-            
-        pygame.display.flip()
+
+    def apply_quality(self, preset):
+        """Aplica un preset de QUALITY_LEVELS a los sistemas que no lo consultan cada frame."""
+        SPRITE_SCALE_CACHE.smooth = preset["smooth_sprites"]
+        self.profiler.status = f"calidad {self.quality.label()}"
+
+    def present(self, key=None):
+        """Dibuja el overlay del perfilador (si está activo) y vuelca el frame a pantalla.
+
+        Con el modo de rectángulos sucios `key` identifica lo que queda en pantalla;
+        sin clave (cinemática) el frame siguiente no puede reaprovechar nada.
+        """
+        self.profiler.draw(self.screen)
+        with self.profiler.section("flip"):
+            if self.dirty:
+                self.dirty.present(key)
+            else:
+                pygame.display.flip()
 
     def draw_mobile_ui(self):
         """Dibuja los botones virtuales translucidos."""
@@ -951,13 +982,14 @@ class GameEngine:
             self.screen.blit(s, rect)
 
     def draw_pause_menu(self):
-        # Overlay oscuro
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        self.screen.blit(overlay, (0, 0))
+        # Overlay oscuro (creado una vez por tamaño de pantalla)
+        if self.pause_overlay is None or self.pause_overlay.get_size() != self.screen.get_size():
+            self.pause_overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+            self.pause_overlay.fill((0, 0, 0, 200))
+        self.screen.blit(self.pause_overlay, (0, 0))
         
         # Titulo PAUSA con fuente Arcade y degradado
-        title_surf = render_gradient_text(self.combo_label_font, "PAUSA", (255, 255, 0), (255, 40, 0), outline_width=5)
+        title_surf = cached_gradient_text(self.combo_label_font, "PAUSA", (255, 255, 0), (255, 40, 0), outline_width=5)
         title_rect = title_surf.get_rect(center=(WIDTH//2, HEIGHT//2 - 140))
         self.screen.blit(title_surf, title_rect)
         
@@ -971,14 +1003,9 @@ class GameEngine:
             if i == 2: text += f": {int(self.music_volume * 100)}%"
             if i == 3: text += f": {int(self.sfx_volume * 100)}%"
             
-            # Renderizar opción con fuente Arcade y degradado
-            opt_surf = render_gradient_text(self.ui_name_font, text, color_t, color_b, outline_width=3)
-            
-            # Efecto de escala para la opción seleccionada
-            if is_selected:
-                s_w = int(opt_surf.get_width() * 1.2)
-                s_h = int(opt_surf.get_height() * 1.2)
-                opt_surf = pygame.transform.smoothscale(opt_surf, (s_w, s_h))
+            # Renderizar opción con fuente Arcade y degradado (escala 1.2 para la seleccionada)
+            opt_surf = cached_gradient_text(self.ui_name_font, text, color_t, color_b, outline_width=3,
+                                            scale=1.2 if is_selected else 1.0)
                 
             opt_rect = opt_surf.get_rect(center=(WIDTH//2, HEIGHT//2 - 20 + i * 50))
             self.screen.blit(opt_surf, opt_rect)
@@ -989,11 +1016,19 @@ class GameEngine:
                                                         (opt_rect.left - 20, opt_rect.centery + 5), 
                                                         (opt_rect.left - 10, opt_rect.centery)])
 
+    def combo_num_surf(self, count):
+        """Número de combo renderizado (memoizado; a partir de 51 se crea la primera vez que aparece)."""
+        surf = self.combo_num_surfs.get(count)
+        if surf is None:
+            surf = render_gradient_text(self.combo_font, str(count), COMBO_TOP, COMBO_BOTTOM, outline_width=5)
+            self.combo_num_surfs[count] = surf
+        return surf
+
     def draw_combo_ui(self):
-        if self.combo_vis_count not in self.combo_num_surfs: return
+        if self.combo_vis_count < 2: return
 
         # 1. Recuperar superficies pre-renderizadas
-        num_surf = self.combo_num_surfs[self.combo_vis_count]
+        num_surf = self.combo_num_surf(self.combo_vis_count)
         
         # 2. Aplicar Efecto de Escala (Pop)
         # El timer va de 60 a 0. Queremos un pop rápido al inicio.
@@ -1022,18 +1057,17 @@ class GameEngine:
                     draw_num.set_alpha(alpha)
                     draw_label.set_alpha(alpha)
                 
-                # Sombras proyectadas (offset dinámico)
-                shd_alpha = int(alpha * 0.5)
-                shd_num = draw_num.copy()
-                shd_num.fill((0, 0, 0, shd_alpha), special_flags=pygame.BLEND_RGBA_MULT)
-                shd_label = draw_label.copy()
-                shd_label.fill((0, 0, 0, shd_alpha), special_flags=pygame.BLEND_RGBA_MULT)
-                
-                screen_pos = pygame.Vector2(self.combo_vis_pos.x - self.camera_x, self.combo_vis_pos.y)
+                screen_pos = pygame.Vector2(self.combo_vis_pos.x - self.view_x, self.combo_vis_pos.y)
                 
-                # Dibujar Sombras primero
-                self.screen.blit(shd_label, (screen_pos.x - draw_label.get_width()//2 + 5, screen_pos.y + num_h * 0.4 - draw_label.get_height()//2 + 5))
-                self.screen.blit(shd_num, (screen_pos.x - draw_num.get_width()//2 + 5, screen_pos.y - draw_num.get_height()//2 + 5))
+                # Sombras proyectadas (offset dinámico), primero; se omiten en calidad baja
+                if self.quality.effects:
+                    shd_alpha = int(alpha * 0.5)
+                    shd_num = draw_num.copy()
+                    shd_num.fill((0, 0, 0, shd_alpha), special_flags=pygame.BLEND_RGBA_MULT)
+                    shd_label = draw_label.copy()
+                    shd_label.fill((0, 0, 0, shd_alpha), special_flags=pygame.BLEND_RGBA_MULT)
+                    self.screen.blit(shd_label, (screen_pos.x - draw_label.get_width()//2 + 5, screen_pos.y + num_h * 0.4 - draw_label.get_height()//2 + 5))
+                    self.screen.blit(shd_num, (screen_pos.x - draw_num.get_width()//2 + 5, screen_pos.y - draw_num.get_height()//2 + 5))
                 
                 # Dibujar Originales
                 label_rect = draw_label.get_rect(center=(screen_pos.x, screen_pos.y + num_h * 0.4))
@@ -1045,101 +1079,72 @@ class GameEngine:
             pass
 
 
-    def draw_ui(self):
-        # 1. HUD DEL JUGADOR
-        p_portrait = self.player.sprites.get("portrait")
-        hud_pos = (20, 20)
-        hud_scale = 0.8 # Reducir 20%
-        
-        # Primero Dibujar el Marco
-        if self.ui_frame:
-            frame_img = pygame.transform.smoothscale(self.ui_frame, (int(450 * hud_scale), int(120 * hud_scale)))
-            self.screen.blit(frame_img, hud_pos)
-            
-            # Dibujar la vida (Relleno) - Ajustado para que quepa bien en el hueco
-            if self.ui_fill_p:
-                hp_w = int(2.8 * self.player.hp * hud_scale)
-                if hp_w > 0:
-                    hp_fill = pygame.transform.scale(self.ui_fill_p, (hp_w, int(25 * hud_scale)))
-                    # El hueco de vida en el frame está un poco más arriba
-                    self.screen.blit(hp_fill, (hud_pos[0] + int(110 * hud_scale), hud_pos[1] + int(37 * hud_scale)))
-        else:
-            # Fallback
-            pygame.draw.rect(self.screen, BLACK, (hud_pos[0] + 85, hud_pos[1] + 30, 204, 25))
-            hp_w = int(2 * self.player.hp)
-            pygame.draw.rect(self.screen, BLUE, (hud_pos[0] + 87, hud_pos[1] + 32, hp_w, 21))
-        
-        # Dibujar el retrato ENCIMA del frame (en el hexágono)
-        if p_portrait:
-            port_size = int(82 * hud_scale) # Aumentado 20% adicional
-            port_img = pygame.transform.smoothscale(p_portrait, (port_size, port_size))
-            port_rect = port_img.get_rect(center=(hud_pos[0] + int(60 * hud_scale), hud_pos[1] + int(60 * hud_scale)))
-            self.screen.blit(port_img, port_rect)
-                
-        # Nombre del Jugador MAS ARRIBA
-        self.screen.blit(self.ui_name_player, (hud_pos[0] + int(115 * hud_scale), hud_pos[1] + int(2 * hud_scale)))
+    def closest_enemy(self):
+        """Enemigo que muestra el HUD: el más cercano con vida (memoizado por tic de simulación)."""
+        if self.closest_enemy_tick != self.sim_tick:
+            self.closest_enemy_tick = self.sim_tick
+            self.closest_enemy_cache = None
+            if self.enemies:
+                is_alive = lambda e: not e.is_dead or e.state != "DOWN"
+                closest = self.enemy_grid.nearest(self.player.world_pos, 450, is_alive)
+                if closest is None and not any(is_alive(e) for e in self.enemies):
+                    closest = self.enemy_grid.nearest(self.player.world_pos, 450)
+                self.closest_enemy_cache = closest
+        return self.closest_enemy_cache
 
-        if self.enemies:
-            # HUD DEL ENEMIGO (Espejado al lado derecho)
-            alive_enemies = [e for e in self.enemies if not e.is_dead or e.state != "DOWN"]
-            if not alive_enemies: alive_enemies = self.enemies
-            
-            closest = min(alive_enemies, key=lambda e: (e.world_pos - self.player.world_pos).length())
-            dist_to_p = (closest.world_pos - self.player.world_pos).length()
+    def draw_ui(self):
+        # HUD retenido: cada panel es un blit; solo se repinta la barra si cambia la vida
+        self.hud.draw(self.screen, self.player, self.closest_enemy())
+
+    def get_menu_backdrop(self):
+        """Fondo desenfocado del menú con logo y aviso; solo se rehace si cambia la cámara o la resolución."""
+        # El progreso del grupo "menu" rehace el fondo al llegar fondo, suelo y logo
+        key = (int(self.view_x), self.screen.get_size(), self.quality.blur, self.assets.progress("menu"))
+        if self.menu_backdrop is None or self.menu_backdrop_key != key:
+            menu_bg = pygame.Surface(self.screen.get_size())
+            self.draw_3d_background_to(menu_bg)
+            self.draw_3d_floor_to(menu_bg)
             
-            if dist_to_p < 450:
-                e_portrait = closest.sprites.get("portrait")
-                e_hud_w = int(450 * hud_scale)
-                e_hud_pos = (WIDTH - e_hud_w - 20, 20)
-
-                if self.ui_frame:
-                    e_frame = pygame.transform.smoothscale(self.ui_frame, (e_hud_w, int(120 * hud_scale)))
-                    e_frame = pygame.transform.flip(e_frame, True, False)
-                    self.screen.blit(e_frame, e_hud_pos)
-                    
-                    if self.ui_fill_e:
-                        hp_w_e = int(2.8 * max(0, closest.hp) * hud_scale)
-                        if hp_w_e > 0:
-                            hp_fill_e = pygame.transform.scale(self.ui_fill_e, (hp_w_e, int(25 * hud_scale)))
-                            hp_fill_e = pygame.transform.flip(hp_fill_e, True, False)
-                            self.screen.blit(hp_fill_e, (e_hud_pos[0] + e_hud_w - int(110 * hud_scale) - hp_w_e, e_hud_pos[1] + int(37 * hud_scale)))
-                else:
-                    # Fallback
-                    pygame.draw.rect(self.screen, BLACK, (WIDTH - 289, 30, 204, 25))
-                    hp_w_e = int(2 * max(0, closest.hp))
-                    pygame.draw.rect(self.screen, RED, (WIDTH - 287, 32, hp_w_e, 21))
-
-                # Retrato Enemigo ENCIMA del frame
-                if e_portrait:
-                    port_size = int(82 * hud_scale) # Aumentado 20% adicional
-                    port_img = pygame.transform.smoothscale(e_portrait, (port_size, port_size))
-                    port_img = pygame.transform.flip(port_img, True, False)
-                    port_rect = port_img.get_rect(center=(e_hud_pos[0] + e_hud_w - int(60 * hud_scale), e_hud_pos[1] + int(60 * hud_scale)))
-                    self.screen.blit(port_img, port_rect)
-                        
-                # Nombre Enemigo MAS ARRIBA
-                self.screen.blit(self.ui_name_enemy, (e_hud_pos[0] + e_hud_w - int(230 * hud_scale), e_hud_pos[1] + int(2 * hud_scale)))
+            blurred_bg = blur_surface(menu_bg, amount=self.quality.blur)
+            # Añadir un overlay oscuro para contraste
+            overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 100))
+            blurred_bg.blit(overlay, (0, 0))
+
+            # Logo y aviso son estáticos: van compuestos en el fondo
+            if self.menu_logo:
+                logo_rect = self.menu_logo.get_rect(center=(WIDTH//2, HEIGHT//2 - 60))
+                blurred_bg.blit(self.menu_logo, logo_rect)
+            disc_surf = cached_text(self.disclaimer_font, self.disclaimer_text, WHITE)
+            disc_rect = disc_surf.get_rect(center=(WIDTH//2, HEIGHT - 30))
+            blurred_bg.blit(disc_surf, disc_rect)
+            self.menu_backdrop = blurred_bg.convert()
+            self.menu_backdrop_key = key
+        return self.menu_backdrop
+
+    def menu_button_area(self):
+        """Zona que puede tocar el botón del menú: brillo máximo (15px), sombra y desplazamiento al pulsar."""
+        area = self.menu_button_rect.inflate(30, 30)
+        return area.union(area.move(0, 4))
 
     def draw_main_menu(self):
-        # 1. Dibujar fondo (desenfocado)
-        menu_bg = pygame.Surface((WIDTH, HEIGHT))
-        self.draw_3d_background_to(menu_bg)
-        self.draw_3d_floor_to(menu_bg)
-        
-        blurred_bg = blur_surface(menu_bg, amount=6)
-        # Añadir un overlay oscuro para contraste
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 100))
-        blurred_bg.blit(overlay, (0, 0))
-        
-        self.screen.blit(blurred_bg, (0, 0))
-        
-        # 2. Logo
-        if self.menu_logo:
-            logo_rect = self.menu_logo.get_rect(center=(WIDTH//2, HEIGHT//2 - 60))
-            self.screen.blit(self.menu_logo, logo_rect)
-            
-        # 3. Botón "A Jugar!"
+        # 1. Fondo desenfocado con logo y aviso (cacheado)
+        backdrop = self.get_menu_backdrop()
+        key = ("menu", self.menu_backdrop_key, self.profiler.revision())
+        if self.dirty and self.dirty.key == key:
+            # Solo se anima el botón: reponer su zona y volcar únicamente esa región
+            area = self.menu_button_area()
+            self.screen.blit(backdrop, area, area)
+            self.draw_menu_button()
+            with self.profiler.section("flip"):
+                self.dirty.present(key, [area])
+            return
+        self.screen.blit(backdrop, (0, 0))
+        self.draw_menu_button()
+        self.present(key)
+
+    def draw_menu_button(self):
+        # 2. Botón "A Jugar!"
         self.menu_button_hover = self.menu_button_rect.collidepoint(pygame.mouse.get_pos())
         
         # Glow intermitente
@@ -1165,64 +1170,76 @@ class GameEngine:
         pygame.draw.rect(self.screen, btn_color, draw_rect, border_radius=15)
         
         # Texto con degradado rojo
-        btn_text = render_gradient_text(self.combo_label_font, "A JUGAR!", (255, 0, 0), (150, 0, 0), outline_width=3)
+        btn_text = cached_gradient_text(self.combo_label_font, "A JUGAR!", (255, 0, 0), (150, 0, 0), outline_width=3)
         btn_rect = btn_text.get_rect(center=draw_rect.center)
         self.screen.blit(btn_text, btn_rect)
-        
-        # 4. Disclaimer
-        disc_surf = self.disclaimer_font.render(self.disclaimer_text, True, WHITE)
-        disc_rect = disc_surf.get_rect(center=(WIDTH//2, HEIGHT - 30))
-        self.screen.blit(disc_surf, disc_rect)
-        pygame.display.flip()
+
+        # Barra de carga bajo el botón (dentro de menu_button_area) mientras quede algo pendiente
+        if not self.assets.is_ready():
+            bar = pygame.Rect(self.menu_button_rect.x, self.menu_button_rect.bottom + 8, self.menu_button_rect.width, 4)
+            pygame.draw.rect(self.screen, (40, 40, 40), bar)
+            bar.width = int(bar.width * self.assets.progress())
+            pygame.draw.rect(self.screen, YELLOW, bar)
 
     def draw_3d_background_to(self, surface):
-        if not self.bg_tex:
-            draw_gradient_rect(surface, (0, 0, WIDTH, FLOOR_START_Y), SKY_TOP, SKY_BOTTOM)
-            return
-        tex_w = self.bg_tex.get_width()
-        rel_x = int(self.camera_x * 0.3) % tex_w
-        surface.blit(self.bg_tex, (-rel_x, 0))
-        if rel_x > 0: surface.blit(self.bg_tex, (tex_w - rel_x, 0))
+        self.parallax.draw(surface, self.view_x)
 
     def draw_3d_floor_to(self, surface):
-        if not self.floor_tex:
+        if not self.floor:
             draw_gradient_rect(surface, (0, FLOOR_START_Y, WIDTH, HEIGHT - FLOOR_START_Y), FLOOR_TOP, FLOOR_BOTTOM)
             return
-        floor_h = HEIGHT - FLOOR_START_Y
-        tex_w, tex_h = self.floor_tex.get_size()
-        center_offset = WIDTH // 2
-        for sy in range(0, floor_h, 4): # Más rápido para el menú
-            v = sy / floor_h
-            h_scale = 0.4 + v * 2.2 
-            line_w = int(WIDTH * h_scale)
-            if line_w <= 0: continue
-            ty = int((v**1.8 % 1.0) * tex_h)
-            ty = max(0, min(ty, tex_h - 1))
-            try:
-                line_slice = self.floor_tex.subsurface((0, ty, tex_w, 1))
-                scaled_line = pygame.transform.scale(line_slice, (line_w, 4))
-                rel_x = int(self.camera_x * h_scale) % line_w
-                start_x = (center_offset - rel_x)
-                if line_w > 0:
-                    while start_x > 0: start_x -= line_w
-                x = start_x
-                while x < WIDTH:
-                    surface.blit(scaled_line, (x, FLOOR_START_Y + sy))
-                    if line_w > 0: x += line_w
-                    else: break
-            except: continue
+        self.floor.draw(surface, self.view_x, step=4) # Más rápido para el menú
 
     def run(self):
+        # Bucle de paso fijo: la simulación avanza a FPS constantes y el dibujado
+        # va al ritmo que aguante el dispositivo, interpolando entre pasos.
+        previous = time.perf_counter()
+        accumulator = 0.0
         while True:
             try:
-                self.handle_events()
-                if self.game_state == "PLAYING":
-                    self.update()
-                self.draw()
-                self.clock.tick(FPS)
+                now = time.perf_counter()
+                frame_time = SIM_DT if self.headless else now - previous
+                previous = now
+                accumulator += min(frame_time, SIM_DT * MAX_SIM_STEPS)
+
+                self.profiler.begin_frame()
+                with self.profiler.section("assets"):
+                    if self.game_state in ("MENU", "CINEMATIC"):
+                        self.assets.pump() # En la cinemática llega la slide siguiente mientras se ve la actual
+                    else:
+                        self.assets.wait("menu", "gameplay") # Fuera del menú el juego necesita lo suyo cargado
+                        self.assets.pump() # Restos de la cinemática (slides ya soltadas)
+                with self.profiler.section("events"):
+                    self.handle_events()
+                    self.music.update(frame_time * 1000, paused=self.paused)
+                steps = 0
+                while accumulator >= SIM_DT and steps < MAX_SIM_STEPS:
+                    if self.game_state == "PLAYING":
+                        with self.profiler.section("update"):
+                            self.step()
+                    elif self.game_state == "CINEMATIC":
+                        self.update() # La cinemática avanza al mismo paso fijo (no se graba: no es simulación)
+                    accumulator -= SIM_DT
+                    steps += 1
+                if steps >= MAX_SIM_STEPS:
+                    # Demasiado atrasados: descartamos el resto en vez de intentar recuperarlo
+                    accumulator = min(accumulator, SIM_DT)
+
+                self.draw(alpha=accumulator / SIM_DT)
+                self.sfx.end_frame()
+                self.profiler.end_frame()
+                if self.game_state == "PLAYING" and not self.paused:
+                    self.quality.observe(self.profiler.frame_ms[-1])
+                # En menú y pausa casi nada se mueve: dibujar menos veces ahorra batería
+                idle = self.game_state == "MENU" or self.paused
+                fps_cap = IDLE_FPS_CAP if idle else self.quality.fps_cap
+                if not self.headless and fps_cap:
+                    self.clock.tick(fps_cap)
             except Exception as e:
                 print(f"ERROR EN EL LOOP PRINCIPAL: {e}")
                 import traceback
                 traceback.print_exc()
+                self.profiler.dump()
+                if self.recorder: self.recorder.close()
                 pygame.quit()
                 sys.exit()
@@ -1,27 +1,89 @@
 import pygame
-import random
 import os
 from constants import *
-from utils import get_bottom_pixel, load_gif
+from utils import get_frame_metrics
+from assets import load_image, load_frames, prefetch_image, prefetch_frames
+from sprite_cache import ScaledSpriteCache
+from atlas import get_atlas
+from rng import RNG
 
 # --- CACHE GLOBAL DE RECURSOS ---
 # Esto evita que el juego lea el disco cada vez que aparece un enemigo, eliminando el "lag" de spawn.
 GLOBAL_ASSET_CACHE = {
     "sprites": {},
     "animations": {},
-    "bottoms": {}
+    "metrics": {},
+    "trims": {},
+    "mirrored": {} # Frames espejados (mirando a la izquierda), uno por frame de cada animación
 }
 
+# Sprites ya escalados por profundidad, compartidos entre todos los personajes
+SPRITE_SCALE_CACHE = ScaledSpriteCache(SPRITE_CACHE_BUDGET, SPRITE_SCALE_STEP)
+
+SPRITE_NAMES = ["idle", "hit", "damage", "ground", "portrait"]
+
+def sprite_size(name):
+    return (CHAR_WIDTH, CHAR_HEIGHT) if name != "portrait" else (PORTRAIT_SIZE, PORTRAIT_SIZE)
+
+def character_gifs(is_player):
+    """(animación, ruta) de los GIFs de cada tipo de personaje."""
+    folder = "textures/sprites"
+    if not is_player:
+        return [("WALK", os.path.join(folder, "enemy-walk.gif"))]
+    gifs = [("WALK", os.path.join(folder, "player_run.gif"))]
+    for i in range(3):
+        h_path = os.path.join(folder, f"player_hit{i + 1}.gif")
+        if i == 0 and not os.path.exists(h_path): h_path = os.path.join(folder, "player_hit.gif")
+        gifs.append((f"ATTACK_{i}", h_path))
+    gifs.append(("IDLE", os.path.join(folder, "player_idle.gif")))
+    gifs.append(("JUMP", os.path.join(folder, "player_Jump.gif")))
+    return gifs
+
+def prefetch_character(is_player):
+    """Decodifica (en el hilo de carga) los archivos que leerá load_placeholders."""
+    folder = "textures/sprites"
+    prefix = "player" if is_player else "enemy"
+    atlas = get_atlas()
+    if atlas and atlas.keys(prefix):
+        return # Las hojas del atlas ya las pide el motor una sola vez (petición "atlas")
+    if is_player and os.path.exists(os.path.join(folder, "player_sprite_sheet.png")):
+        images, gifs = [(os.path.join(folder, "player_sprite_sheet.png"), None), (os.path.join(folder, "player_portrait.png"), None)], []
+    else:
+        images = [(os.path.join(folder, f"{prefix}_{name}.png"), sprite_size(name)) for name in SPRITE_NAMES]
+        gifs = character_gifs(is_player)
+    for path, size in images:
+        if os.path.exists(path): prefetch_image(path, size)
+    for _, path in gifs:
+        if os.path.exists(path): prefetch_frames(path, (CHAR_WIDTH, CHAR_HEIGHT))
+
 class Character:
     def __init__(self, x, y, color, is_player=False):
+        self.color = color
+        self.is_player = is_player
+        
+        # Recursos (compartidos vía GLOBAL_ASSET_CACHE)
+        self.animations = {}
+        self.sprites = {}
+        self.sprite_bottoms = {}
+        self.frame_metrics = {} # FrameMetrics por frame de cada sprite/animación (bbox opaco, pies...)
+        self.frame_trims = {} # Solo con atlas: (ox, oy, ancho, alto) originales de cada frame recortado
+        self.mirrored = {} # nombre -> frames espejados (sprites estáticos como lista de uno)
+        
+        self.reset(x, y)
+        self.load_placeholders()
+        self.build_mirrored()
+
+    def reset(self, x, y):
+        """Reinicia todo el estado de juego sin recargar recursos (para reutilizar instancias)."""
         self.world_pos = pygame.Vector2(x, y)
         self.vel = pygame.Vector2(0, 0)
         self.z = 0  
         self.velocity_z = 0
+        # Estado del paso de simulación anterior (para interpolar al dibujar)
+        self.prev_world_pos = pygame.Vector2(x, y)
+        self.prev_z = 0
         
         self.is_running = False
-        self.color = color
-        self.is_player = is_player
         self.facing_right = True
         
         self.hp = 100
@@ -30,12 +92,11 @@ class Character:
         self.state_timer = 0
         
         # Animación
-        self.animations = {}
         self.anim_frame = 0
         self.anim_timer = 0
         
         self.combo_index = 0
-        self.last_attack_time = 0
+        self.last_attack_time = -10000 # ms de simulación; el primer golpe siempre abre el combo
         self.attack_duration = ATTACK_DURATION
         self.hit_connected = False # Nueva bandera para detección por frame
         self.recovery_timer = 0    # Evita transiciones instantáneas que se sienten mal
@@ -58,39 +119,38 @@ class Character:
         
         # Saltos
         self.jumps_done = 0
-        
-        self.sprites = {}
-        self.sprite_bottoms = {}
-        self.load_placeholders()
 
     def load_placeholders(self):
         folder = "textures/sprites"
         if not os.path.exists(folder):
             os.makedirs(folder)
 
-        # 0. Intentar cargar desde hoja de sprites si es el jugador
+        # 0. Atlas empaquetado (build_atlas.py) si existe
+        atlas = get_atlas()
+        if atlas and self.load_from_atlas(atlas):
+            return
+
+        # 0.1 Intentar cargar desde hoja de sprites si es el jugador
         sheet_path = os.path.join(folder, "player_sprite_sheet.png")
         if self.is_player and os.path.exists(sheet_path):
             self.load_from_sprite_sheet(sheet_path)
             return
 
         prefix = "player" if self.is_player else "enemy"
-        names = ["idle", "hit", "damage", "ground", "portrait"]
-        for name in names:
+        for name in SPRITE_NAMES:
             cache_key = f"{prefix}_{name}"
-            display_size = (CHAR_WIDTH, CHAR_HEIGHT) if name != "portrait" else (PORTRAIT_SIZE, PORTRAIT_SIZE)
+            display_size = sprite_size(name)
 
             if cache_key in GLOBAL_ASSET_CACHE["sprites"]:
                 self.sprites[name] = GLOBAL_ASSET_CACHE["sprites"][cache_key]
-                self.sprite_bottoms[name] = GLOBAL_ASSET_CACHE["bottoms"][cache_key]
+                self._store_metrics(name, cache_key)
                 continue
 
             filename = f"{prefix}_{name}.png"
             path = os.path.join(folder, filename)
             
             if os.path.exists(path):
-                raw_img = pygame.image.load(path).convert_alpha()
-                surf = pygame.transform.smoothscale(raw_img, display_size)
+                surf = load_image(path, size=display_size)
             else:
                 surf = pygame.Surface(display_size, pygame.SRCALPHA)
                 c = self.color
@@ -108,26 +168,38 @@ class Character:
                 pygame.image.save(surf, path)
 
             self.sprites[name] = surf
-            self.sprite_bottoms[name] = get_bottom_pixel(surf)
             GLOBAL_ASSET_CACHE["sprites"][cache_key] = surf
-            GLOBAL_ASSET_CACHE["bottoms"][cache_key] = self.sprite_bottoms[name]
+            self._store_metrics(name, cache_key, [surf])
 
         # --- CARGAR ANIMACIONES (GIFs) ---
-        if self.is_player:
-            self._cache_and_load_gif("WALK", os.path.join(folder, "player_run.gif"))
-            for i in range(3):
-                suffix = str(i+1)
-                h_path = os.path.join(folder, f"player_hit{suffix}.gif")
-                if i == 0 and not os.path.exists(h_path): h_path = os.path.join(folder, "player_hit.gif")
-                self._cache_and_load_gif(f"ATTACK_{i}", h_path)
-            self._cache_and_load_gif("IDLE", os.path.join(folder, "player_idle.gif"))
-            self._cache_and_load_gif("JUMP", os.path.join(folder, "player_Jump.gif"))
-        else:
-            self._cache_and_load_gif("WALK", os.path.join(folder, "enemy-walk.gif"))
+        for anim_key, path in character_gifs(self.is_player):
+            self._cache_and_load_gif(anim_key, path)
+
+    def load_from_atlas(self, atlas):
+        """Frames recortados como subsurfaces del atlas (sin copiar píxeles)."""
+        prefix = "player" if self.is_player else "enemy"
+        keys = atlas.keys(prefix)
+        if not keys:
+            return False
+        for key in keys:
+            name = key.split("/", 1)[1]
+            cache_key = f"{prefix}_{name}"
+            is_anim = atlas.entries[key]["kind"] == "animation"
+            bucket = "animations" if is_anim else "sprites"
+            if cache_key not in GLOBAL_ASSET_CACHE["trims"]:
+                frames = atlas.frames(key)
+                surfs = [surf for surf, _ in frames]
+                GLOBAL_ASSET_CACHE[bucket][cache_key] = surfs if is_anim else surfs[0]
+                GLOBAL_ASSET_CACHE["metrics"][cache_key] = atlas.metrics(key)
+                GLOBAL_ASSET_CACHE["trims"][cache_key] = [trim for _, trim in frames]
+            getattr(self, bucket)[name] = GLOBAL_ASSET_CACHE[bucket][cache_key]
+            self._store_metrics(name, cache_key)
+            self.frame_trims[name] = GLOBAL_ASSET_CACHE["trims"][cache_key]
+        return True
 
     def load_from_sprite_sheet(self, path):
         """Slices the player sprite sheet generated by generate_player_sheet.py"""
-        sheet = pygame.image.load(path).convert_alpha()
+        sheet = load_image(path)
         fw, fh = CHAR_WIDTH, CHAR_HEIGHT # 230, 230
         label_w = 250
         
@@ -158,24 +230,42 @@ class Character:
             # Asignar a Animaciones
             if anim_key:
                 self.animations[anim_key] = frames
-                self.sprite_bottoms[anim_key] = get_bottom_pixel(frames[0])
                 GLOBAL_ASSET_CACHE["animations"][f"player_{anim_key}"] = frames
-                GLOBAL_ASSET_CACHE["bottoms"][f"player_{anim_key}"] = self.sprite_bottoms[anim_key]
+                self._store_metrics(anim_key, f"player_{anim_key}", frames)
             
             # Asignar a Sprites Estáticos (usando el primer frame de la fila)
             if sprite_key:
                 self.sprites[sprite_key] = frames[0]
-                self.sprite_bottoms[sprite_key] = get_bottom_pixel(frames[0])
                 GLOBAL_ASSET_CACHE["sprites"][f"player_{sprite_key}"] = frames[0]
-                GLOBAL_ASSET_CACHE["bottoms"][f"player_{sprite_key}"] = self.sprite_bottoms[sprite_key]
+                self._store_metrics(sprite_key, f"player_{sprite_key}", frames[:1])
 
         # El portrait siempre lo cargamos aparte para no meterlo en el loop de la hoja si no está ahí
         port_path = os.path.join(folder, "player_portrait.png")
         if os.path.exists(port_path):
-            img = pygame.image.load(port_path).convert_alpha()
+            img = load_image(port_path)
             self.sprites["portrait"] = pygame.transform.smoothscale(img, (PORTRAIT_SIZE, PORTRAIT_SIZE))
-            self.sprite_bottoms["portrait"] = get_bottom_pixel(self.sprites["portrait"])
             GLOBAL_ASSET_CACHE["sprites"]["player_portrait"] = self.sprites["portrait"]
+            self._store_metrics("portrait", "player_portrait", [self.sprites["portrait"]])
+
+    def build_mirrored(self):
+        """Precalcula una vez por animación los frames mirando a la izquierda."""
+        prefix = "player" if self.is_player else "enemy"
+        sources = [(name, frames) for name, frames in self.animations.items()]
+        sources += [(name, [surf]) for name, surf in self.sprites.items() if name != "portrait"]
+        for name, frames in sources:
+            cache_key = f"{prefix}_{name}"
+            mirrored = GLOBAL_ASSET_CACHE["mirrored"].get(cache_key)
+            if mirrored is None:
+                mirrored = [pygame.transform.flip(f, True, False) for f in frames]
+                GLOBAL_ASSET_CACHE["mirrored"][cache_key] = mirrored
+            self.mirrored[name] = mirrored
+
+    def _store_metrics(self, name, cache_key, frames=None):
+        """Métricas por frame compartidas vía cache global; los pies salen del primer frame."""
+        if frames is not None:
+            GLOBAL_ASSET_CACHE["metrics"][cache_key] = [get_frame_metrics(f) for f in frames]
+        self.frame_metrics[name] = GLOBAL_ASSET_CACHE["metrics"][cache_key]
+        self.sprite_bottoms[name] = self.frame_metrics[name][0].bottom
 
     def _cache_and_load_gif(self, anim_key, path):
         """Helper para cargar GIFs usando el cache global."""
@@ -184,21 +274,33 @@ class Character:
 
         if full_cache_key in GLOBAL_ASSET_CACHE["animations"]:
             self.animations[anim_key] = GLOBAL_ASSET_CACHE["animations"][full_cache_key]
-            self.sprite_bottoms[anim_key] = GLOBAL_ASSET_CACHE["bottoms"][full_cache_key]
+            self._store_metrics(anim_key, full_cache_key)
             return
 
         if os.path.exists(path):
-            frames = load_gif(path, (CHAR_WIDTH, CHAR_HEIGHT))
+            frames, metrics = load_frames(path, (CHAR_WIDTH, CHAR_HEIGHT))
             if frames:
                 self.animations[anim_key] = frames
-                self.sprite_bottoms[anim_key] = get_bottom_pixel(frames[0])
                 # Guardar en Cache
                 GLOBAL_ASSET_CACHE["animations"][full_cache_key] = frames
-                GLOBAL_ASSET_CACHE["bottoms"][full_cache_key] = self.sprite_bottoms[anim_key]
+                GLOBAL_ASSET_CACHE["metrics"][full_cache_key] = metrics
+                self._store_metrics(anim_key, full_cache_key)
         else:
             print(f"ADVERTENCIA: No se encontró animación para {anim_key} en {path}")
 
-    def update(self, player_ref=None, enemies=None, camera_x=0):
+    def snapshot(self):
+        """Guarda la posición actual antes de avanzar un paso de simulación."""
+        self.prev_world_pos.update(self.world_pos)
+        self.prev_z = self.z
+
+    def get_render_pos(self, alpha=1.0):
+        """Posición y altura interpoladas entre los dos últimos pasos de simulación."""
+        if alpha >= 1.0:
+            return self.world_pos, self.z
+        pos = self.prev_world_pos.lerp(self.world_pos, max(0.0, alpha))
+        return pos, self.prev_z + (self.z - self.prev_z) * alpha
+
+    def update(self, player_ref=None, enemies=None, camera_x=0, keys=None, grid=None):
         # 1. Temporizador de Estados
         # Reset de prioridad cada frame
         self.z_priority = 0
@@ -252,7 +354,10 @@ class Character:
                 self.velocity_z = 0
                 self.jumps_done = 0
                 if self.state == "DIVE":
-                    self.land_dive(enemies if self.is_player else [player_ref])
+                    if self.is_player and grid is not None:
+                        self.land_dive(grid.query_radius(self.world_pos, 100))
+                    else:
+                        self.land_dive(enemies if self.is_player else [player_ref])
                 
                 # Si estábamos en JUMP, volver a IDLE inmediatamente
                 if self.state == "JUMP":
@@ -284,7 +389,10 @@ class Character:
             self.world_pos += self.vel
         
         # 3.1 Resolver Colisiones entre personajes (no se montan)
-        if enemies:
+        # Con índice espacial solo revisamos a los vecinos cercanos en lugar de a todos
+        if grid is not None:
+            self.resolve_collisions(grid.query_radius(self.world_pos, COLLISION_DIST))
+        elif enemies:
             self.resolve_collisions(enemies)
         if player_ref: 
              self.resolve_collisions([player_ref])
@@ -299,17 +407,18 @@ class Character:
                 self.jump_anim_timer += 1
             
             if self.is_player:
-                self.handle_input()
+                self.handle_input(keys)
             else:
                 self.handle_ai(player_ref)
                 if self.attack_cooldown > 0:
                     self.attack_cooldown -= 1
 
 
-    def handle_input(self):
+    def handle_input(self, keys=None):
         if self.state == "ATTACK" and self.state_timer > 0 and self.z == 0: return
 
-        keys = pygame.key.get_pressed()
+        if keys is None:
+            keys = pygame.key.get_pressed()
         move_input = pygame.Vector2(0, 0)
         if keys[pygame.K_LEFT] or keys[pygame.K_a]: move_input.x = -1
         if keys[pygame.K_RIGHT] or keys[pygame.K_d]: move_input.x = 1
@@ -337,10 +446,10 @@ class Character:
         if not player_ref: return
         
         # Cambiar el offset de forma aleatoria periódicamente para un movimiento errático
-        if random.random() < 0.01: # 1% cada frame
+        if RNG.ai.random() < 0.01: # 1% cada frame
             self.target_offset = pygame.Vector2(
-                random.randint(-150, 150),
-                random.randint(-40, 40)
+                RNG.ai.randint(-150, 150),
+                RNG.ai.randint(-40, 40)
             )
 
         target_pos = player_ref.world_pos + self.target_offset
@@ -352,7 +461,7 @@ class Character:
             elif move_input.x < 0: self.facing_right = False
             
             # Movimiento con un poco de "ruido" lateral
-            noise = pygame.Vector2(random.uniform(-0.2, 0.2), random.uniform(-0.2, 0.2))
+            noise = pygame.Vector2(RNG.ai.uniform(-0.2, 0.2), RNG.ai.uniform(-0.2, 0.2))
             move_input = (move_input + noise).normalize()
             
             self.vel += move_input * (ACCEL * 0.4)
@@ -407,7 +516,7 @@ class Character:
             if knk_dir:
                 self.knk_vector = knk_dir * 12
             else:
-                self.knk_vector = pygame.Vector2(random.choice([-1, 1]) * 6, 0)
+                self.knk_vector = pygame.Vector2(RNG.combat.choice([-1, 1]) * 6, 0)
             return
 
         if knockback:
@@ -427,7 +536,7 @@ class Character:
 
     def resolve_collisions(self, teammates):
         """Evita que los personajes se solapen demasiado de forma eficiente."""
-        collision_dist = 40 # Radio un poco más pequeño para fluidez
+        collision_dist = COLLISION_DIST # Radio un poco más pequeño para fluidez
         for other in teammates:
             if other is self or other.state == "DOWN": continue
             
@@ -452,11 +561,8 @@ class Character:
                 else: knk_dir = pygame.Vector2(1, 0)
                 t.apply_damage(15, knockback=True, knk_dir=knk_dir)
 
-    def draw(self, screen, camera_x, scale=1.0):
-        # 1. Ajustar posición local
-        local_x = (self.world_pos.x - camera_x)
-        
-        # 2. Determinar el sprite a usar
+    def current_frame(self):
+        """Frame a dibujar según el estado: (imagen, (prefijo, clave, índice), clave de pies)."""
         sprite_key = "idle"
         if self.state == "ATTACK": sprite_key = "ATTACK"
         if self.state == "JUMP" and "JUMP" in self.animations: sprite_key = "JUMP"
@@ -464,49 +570,103 @@ class Character:
         if self.state == "DOWN": sprite_key = "ground"
         if self.state == "WALK" and "WALK" in self.animations: sprite_key = "WALK"
         
+        prefix = "player" if self.is_player else "enemy"
         img = None
         if sprite_key == "WALK" and "WALK" in self.animations:
             frames = self.animations["WALK"]
-            img = frames[self.anim_frame % len(frames)]
+            idx = self.anim_frame % len(frames)
+            img, frame_key = frames[idx], (prefix, "WALK", idx)
         elif sprite_key == "ATTACK":
             anim_key = f"ATTACK_{self.combo_index}"
             if anim_key in self.animations:
                 frames = self.animations[anim_key]
                 idx = min(self.anim_frame, len(frames) - 1)
-                img = frames[idx]
+                img, frame_key = frames[idx], (prefix, anim_key, idx)
             else:
-                img = self.sprites.get("hit", self.sprites["idle"])
+                hit_key = "hit" if "hit" in self.sprites else "idle"
+                img, frame_key = self.sprites[hit_key], (prefix, hit_key, 0)
         elif sprite_key == "idle" and "IDLE" in self.animations:
             frames = self.animations["IDLE"]
-            img = frames[self.anim_frame % len(frames)]
+            idx = self.anim_frame % len(frames)
+            img, frame_key = frames[idx], (prefix, "IDLE", idx)
         elif sprite_key == "JUMP" and "JUMP" in self.animations:
             frames = self.animations["JUMP"]
             # Sincronización ajustada: 9 frames * 5.5 tics = 49.5 tics (salto total ~52)
             # Esto asegura que llegamos al último frame justo antes de tocar suelo
             idx = min(int(self.jump_anim_timer / 5.5), len(frames) - 1)
-            img = frames[idx]
+            img, frame_key = frames[idx], (prefix, "JUMP", idx)
         else:
-            img = self.sprites.get(sprite_key, self.sprites["idle"])
-            
-        if not self.facing_right:
-            img = pygame.transform.flip(img, True, False)
+            static_key = sprite_key if sprite_key in self.sprites else "idle"
+            img, frame_key = self.sprites[static_key], (prefix, static_key, 0)
+        return img, frame_key, sprite_key
+
+    def feet_row(self, name, idx, sprite_key, full_h):
+        """Fila (en el frame original) que se apoya en world_pos.y - z.
+
+        Cada frame se ancla en sus propios pies. Si en el dibujo quedan claramente
+        por encima de la línea de suelo de la animación (zancada en el aire, salto)
+        se usa esa línea, para no deshacer el despegue que ya trae el arte.
+        """
+        metrics = self.frame_metrics.get(name)
+        if not metrics:
+            return self.sprite_bottoms.get(sprite_key, full_h)
+        # Los frames vacíos (bbox nulo) no cuentan para la línea de suelo
+        ground = max((m.bottom for m in metrics if m.bbox.height), default=full_h)
+        bottom = metrics[idx].bottom
+        return bottom if ground - bottom <= FEET_SNAP else ground
+
+    def get_body_rect(self):
+        """Rect en mundo del área opaca del frame actual (escala 1), alineado como en draw()."""
+        img, (_, name, idx), sprite_key = self.current_frame()
+        metrics = self.frame_metrics.get(name)
+        m = metrics[idx] if metrics else get_frame_metrics(img)
+        full_w, full_h = img.get_size()
+        trims = self.frame_trims.get(name)
+        if trims:
+            full_w, full_h = trims[idx][2], trims[idx][3]
+        left = m.left if self.facing_right else full_w - m.right
+        # En el suelo (DOWN) el frame se apoya por su borde inferior, como en draw()
+        feet = full_h if self.state == "DOWN" else self.feet_row(name, idx, sprite_key, full_h)
+        x = self.world_pos.x - full_w // 2 + left
+        y = self.world_pos.y - self.z - feet + m.top
+        return pygame.Rect(int(x), int(y), m.bbox.width, m.bbox.height)
+
+    def draw(self, screen, camera_x, scale=1.0, alpha=1.0):
+        # 1. Ajustar posición local (interpolada entre pasos de simulación)
+        render_pos, render_z = self.get_render_pos(alpha)
+        local_x = (render_pos.x - camera_x)
+        
+        # 2. Determinar el sprite a usar
+        img, frame_key, sprite_key = self.current_frame()
             
-        # 3. Aplicar Escalado de Perspectiva
-        original_w, original_h = img.get_size()
+        # 3. Aplicar Escalado de Perspectiva (volteo + escala salen del cache compartido)
+        # Con atlas el frame viene recortado: posicionamos con el tamaño original y su offset
+        trims = self.frame_trims.get(frame_key[1])
+        if trims:
+            off_x, off_y, original_w, original_h = trims[frame_key[2]]
+        else:
+            off_x, off_y = 0, 0
+            original_w, original_h = img.get_size()
+        trim_w = img.get_width()
         
         # ENEMIGOS UN 5% MÁS PEQUEÑOS (Ajustado: +10% desde el 0.85 anterior)
         final_scale = scale
         if not self.is_player:
             final_scale *= 0.95
-            
-        new_w = int(original_w * final_scale)
-        new_h = int(original_h * final_scale)
-        if new_w <= 0 or new_h <= 0: return
+        final_scale = SPRITE_SCALE_CACHE.quantize(final_scale)
         
-        img = pygame.transform.smoothscale(img, (new_w, new_h))
+        if not self.facing_right:
+            img = self.mirrored[frame_key[1]][frame_key[2]]
+        img = SPRITE_SCALE_CACHE.get(frame_key, img, self.facing_right, final_scale)
+        if img is None: return
+        new_w, new_h = int(original_w * final_scale), int(original_h * final_scale)
+        if not self.facing_right:
+            off_x = original_w - off_x - trim_w
+        off_x, off_y = round(off_x * final_scale), round(off_y * final_scale)
             
-        # 3.1 Efecto de Flash Blanco (Silhouette)
+        # 3.1 Efecto de Flash Blanco (Silhouette) - sobre una copia para no ensuciar el cache
         if self.flash_timer > 0:
+            img = img.copy()
             fill_surf = img.copy()
             fill_surf.fill((255, 255, 255, 255), special_flags=pygame.BLEND_RGBA_MULT)
             img.blit(fill_surf, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
@@ -516,18 +676,18 @@ class Character:
         
         # Buscamos el punto más bajo del sprite para que coincida con world_pos.y
         # Como el sprite está escalado, el bottom_y también debe escalarse
-        bottom_y_original = self.sprite_bottoms.get(sprite_key, original_h)
+        bottom_y_original = self.feet_row(frame_key[1], frame_key[2], sprite_key, original_h)
         bottom_y = int(bottom_y_original * final_scale)
 
         if self.state == "DOWN":
             if not self.blink_state: return
             # En el suelo usamos el sprite "ground" sin rotar
-            char_y = self.world_pos.y - new_h
-            screen.blit(img, (char_x, char_y))
+            char_y = render_pos.y - new_h
+            screen.blit(img, (char_x + off_x, char_y + off_y))
         else:
             # Los pies (bottom_y) deben estar en world_pos.y - (z * scale)
-            char_y = self.world_pos.y - (self.z * scale) - bottom_y
-            screen.blit(img, (char_x, char_y))
+            char_y = render_pos.y - (render_z * scale) - bottom_y
+            screen.blit(img, (char_x + off_x, char_y + off_y))
             
             # La sombra se queda en el suelo (world_pos.y) alineada con los pies
             # Si queremos que la sombra se mueva con el sprite en el aire, ya está en world_pos.y
@@ -0,0 +1,96 @@
+import pygame
+from constants import *
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class PerspectiveFloor:
+    """Suelo en perspectiva con las tiras de cada línea pre-escaladas.
+
+    `h_scale` y la fila de textura (`ty`) sólo dependen de la línea de pantalla,
+    así que cada tira se escala una sola vez. Por frame únicamente se calcula el
+    desplazamiento X según `camera_x` y se hace un blit por línea.
+    """
+    def __init__(self, texture):
+        self.texture = texture
+        self.floor_h = HEIGHT - FLOOR_START_Y
+        self.rows = {}      # step -> [(sy, h_scale, line_w, tira)]
+        self.remaps = {}    # step -> tablas precalculadas para el modo NumPy
+        self.tex_pixels = None
+        self.buffer = None
+
+    @staticmethod
+    def row_params(sy, floor_h, tex_h):
+        """Parámetros de una línea del suelo (mismo mapeo que usan los props)."""
+        v = sy / floor_h
+        h_scale = 0.4 + v * 2.2
+        line_w = int(WIDTH * h_scale)
+        # Textura v-mapping (v^1.8 genera sensación de mayor velocidad al frente)
+        ty = int((v**1.8 % 1.0) * tex_h)
+        ty = max(0, min(ty, tex_h - 1))
+        return h_scale, line_w, ty
+
+    def bake(self, step):
+        """Pre-escala las tiras para un paso de líneas dado (se hace una vez por paso)."""
+        if step in self.rows:
+            return self.rows[step]
+        tex_w, tex_h = self.texture.get_size()
+        rows = []
+        for sy in range(0, self.floor_h, step):
+            h_scale, line_w, ty = self.row_params(sy, self.floor_h, tex_h)
+            if line_w <= 0: continue
+            line_slice = self.texture.subsurface((0, ty, tex_w, 1))
+            scaled_line = pygame.transform.scale(line_slice, (line_w, step))
+            # La tira se repite hasta cubrir line_w + WIDTH: así cualquier desplazamiento
+            # se resuelve con un único blit por línea en vez del bucle de tiles.
+            strip = pygame.Surface((line_w + WIDTH, step), 0, self.texture)
+            x = 0
+            while x < strip.get_width():
+                strip.blit(scaled_line, (x, 0))
+                x += line_w
+            rows.append((sy, h_scale, line_w, strip))
+        self.rows[step] = rows
+        return rows
+
+    def draw(self, surface, camera_x, step=2):
+        center_offset = WIDTH // 2
+        for sy, h_scale, line_w, strip in self.bake(step):
+            # Posicionamiento: El mundo se mueve respecto a camera_x
+            # Pero la perspectiva "comprime" ese movimiento al fondo
+            rel_x = int(camera_x * h_scale) % line_w
+            src_x = (rel_x - center_offset) % line_w
+            surface.blit(strip, (0, FLOOR_START_Y + sy), (src_x, 0, WIDTH, step))
+
+    # --- MODO NUMPY (remapeo vectorizado de toda la región del suelo) ---
+    def _bake_remap(self, step):
+        if step in self.remaps:
+            return self.remaps[step]
+        tex_w, tex_h = self.texture.get_size()
+        # Cada fila de pantalla usa los parámetros de la línea "sy" a la que pertenece
+        row_sy = numpy.arange(self.floor_h) // step * step
+        params = [self.row_params(int(sy), self.floor_h, tex_h) for sy in row_sy]
+        h_scale = numpy.array([p[0] for p in params])
+        line_w = numpy.array([p[1] for p in params], dtype=numpy.int64)
+        ty = numpy.array([p[2] for p in params], dtype=numpy.int64)
+        xs = numpy.arange(WIDTH, dtype=numpy.int64) - WIDTH // 2
+        remap = (h_scale, line_w, ty, xs, tex_w)
+        self.remaps[step] = remap
+        return remap
+
+    def draw_numpy(self, surface, camera_x, step=2):
+        """Igual que draw() pero escribiendo todo el suelo en una sola pasada NumPy."""
+        if numpy is None:
+            return self.draw(surface, camera_x, step)
+        h_scale, line_w, ty, xs, tex_w = self._bake_remap(step)
+        if self.tex_pixels is None:
+            self.tex_pixels = pygame.surfarray.array2d(self.texture)
+            self.buffer = pygame.Surface((WIDTH, self.floor_h), 0, self.texture)
+
+        rel_x = (camera_x * h_scale).astype(numpy.int64) % line_w
+        i = (xs[None, :] + rel_x[:, None]) % line_w[:, None]
+        u = i * tex_w // line_w[:, None]
+        pixels = self.tex_pixels[u, ty[:, None]]
+        pygame.surfarray.blit_array(self.buffer, pixels.T)
+        surface.blit(self.buffer, (0, FLOOR_START_Y))
@@ -0,0 +1,138 @@
+import pygame
+from constants import *
+
+# --- HUD RETENIDO ---
+# Cada panel (jugador / enemigo) se compone una vez en una superficie propia:
+# marco debajo, barra de vida en medio, retrato y nombre encima. Mientras no
+# cambie la vida ni el retrato, dibujar el HUD es un único blit por panel.
+
+class Hud:
+    def __init__(self, ui_frame, ui_fill_p, ui_fill_e, name_player, name_enemy):
+        self.frame_size = (int(450 * HUD_SCALE), int(120 * HUD_SCALE))
+        # Capas escaladas una sola vez; las del enemigo se guardan ya espejadas
+        self.layers = {"player": {"fills": {}}, "enemy": {"fills": {}}}
+        if ui_frame:
+            frame = pygame.transform.smoothscale(ui_frame, self.frame_size)
+            self.layers["player"]["frame"] = frame
+            self.layers["enemy"]["frame"] = pygame.transform.flip(frame, True, False)
+        if ui_fill_p:
+            self.layers["player"]["fill"] = ui_fill_p
+        if ui_fill_e:
+            self.layers["enemy"]["fill"] = pygame.transform.flip(ui_fill_e, True, False)
+
+        self.panels = {
+            "player": HudPanel(self, "player", name_player),
+            "enemy": HudPanel(self, "enemy", name_enemy)
+        }
+        # Contadores del último frame (para bench.py)
+        self.draw_calls = 0
+        self.allocations = 0
+
+    def fill(self, side, hp_w):
+        """Relleno de vida estirado a `hp_w` (memoizado: solo hay ~100 anchos posibles)."""
+        fills = self.layers[side]["fills"]
+        surf = fills.get(hp_w)
+        if surf is None:
+            surf = pygame.transform.scale(self.layers[side]["fill"], (hp_w, int(25 * HUD_SCALE)))
+            fills[hp_w] = surf
+            self.allocations += 1
+        return surf
+
+    def draw(self, screen, player, target):
+        self.draw_calls = 0
+        self.allocations = 0
+        self.panels["player"].draw(screen, player.sprites.get("portrait"), player.hp)
+        if target is not None:
+            self.panels["enemy"].draw(screen, target.sprites.get("portrait"), max(0, target.hp))
+
+    def stats(self):
+        return {"draw_calls": self.draw_calls, "allocations": self.allocations}
+
+class HudPanel:
+    def __init__(self, hud, side, name_surf):
+        self.hud = hud
+        self.side = side
+        self.name_surf = name_surf
+        self.mirrored = side == "enemy"
+        self.has_frame = "frame" in hud.layers[side]
+        fw, fh = hud.frame_size
+        self.pos = (WIDTH - fw - 20, 20) if self.mirrored else (20, 20)
+
+        self.surface = None   # Composición final que se blitea cada frame
+        self.base = None      # Marco (o rect de fondo sin texturas)
+        self.top = None       # Retrato + nombre
+        self.portrait_src = None
+        self.hp = None
+
+    def bar_rect(self, hp):
+        """Rect (relativo al panel) que ocupa la barra con `hp` de vida."""
+        fw = self.hud.frame_size[0]
+        if self.has_frame:
+            hp_w = int(2.8 * hp * HUD_SCALE)
+            x = fw - int(110 * HUD_SCALE) - hp_w if self.mirrored else int(110 * HUD_SCALE)
+            return pygame.Rect(x, int(37 * HUD_SCALE), hp_w, int(25 * HUD_SCALE))
+        x = 93 if self.mirrored else 87
+        y = 12 if self.mirrored else 32
+        return pygame.Rect(x, y, int(2 * hp), 21)
+
+    def compose(self, portrait, hp):
+        fw, fh = self.hud.frame_size
+        self.base = pygame.Surface((fw, fh), pygame.SRCALPHA)
+        if self.has_frame:
+            self.base.blit(self.hud.layers[self.side]["frame"], (0, 0))
+        else:
+            # Fallback
+            bg = (91, 10, 204, 25) if self.mirrored else (85, 30, 204, 25)
+            pygame.draw.rect(self.base, BLACK, bg)
+
+        self.top = pygame.Surface((fw, fh), pygame.SRCALPHA)
+        # Retrato ENCIMA del frame (en el hexágono)
+        if portrait:
+            port_size = int(82 * HUD_SCALE) # Aumentado 20% adicional
+            port_img = pygame.transform.smoothscale(portrait, (port_size, port_size))
+            if self.mirrored:
+                port_img = pygame.transform.flip(port_img, True, False)
+            cx = fw - int(60 * HUD_SCALE) if self.mirrored else int(60 * HUD_SCALE)
+            self.top.blit(port_img, port_img.get_rect(center=(cx, int(60 * HUD_SCALE))))
+        # Nombre MAS ARRIBA
+        name_x = fw - int(230 * HUD_SCALE) if self.mirrored else int(115 * HUD_SCALE)
+        self.top.blit(self.name_surf, (name_x, int(2 * HUD_SCALE)))
+
+        self.surface = self.base.copy()
+        self.draw_bar(hp)
+        self.surface.blit(self.top, (0, 0))
+        self.portrait_src = portrait
+        self.hp = hp
+        self.hud.allocations += 3
+        self.hud.draw_calls += 4
+
+    def draw_bar(self, hp):
+        rect = self.bar_rect(hp)
+        if rect.width <= 0:
+            return
+        if self.has_frame:
+            if "fill" in self.hud.layers[self.side]:
+                self.surface.blit(self.hud.fill(self.side, rect.width), rect)
+        else:
+            pygame.draw.rect(self.surface, RED if self.mirrored else BLUE, rect)
+
+    def redraw_bar(self, hp):
+        """Repinta solo la región de la barra: marco debajo, barra nueva y capa superior."""
+        # Las barras crecen desde un extremo fijo: el rect de la vida máxima cubre ambas
+        area = self.bar_rect(max(hp, self.hp, 100))
+        self.surface.fill((0, 0, 0, 0), area)
+        self.surface.blit(self.base, area, area)
+        self.surface.set_clip(area)
+        self.draw_bar(hp)
+        self.surface.set_clip(None)
+        self.surface.blit(self.top, area, area)
+        self.hp = hp
+        self.hud.draw_calls += 3
+
+    def draw(self, screen, portrait, hp):
+        if self.surface is None or portrait is not self.portrait_src:
+            self.compose(portrait, hp)
+        elif hp != self.hp:
+            self.redraw_bar(hp)
+        screen.blit(self.surface, self.pos)
+        self.hud.draw_calls += 1
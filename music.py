@@ -0,0 +1,155 @@
+import os
+import wave
+import pygame
+from constants import *
+
+# --- MÚSICA EN STREAMING ---
+# pygame.mixer.music lee y decodifica la pista por bloques mientras suena; un
+# mixer.Sound la decodifica entera a PCM en memoria (decenas de MB en una pista
+# larga). Solo hay un stream, así que el cambio de pista es un fundido de salida
+# seguido de uno de entrada, llevado a mano con set_volume para no bloquear.
+
+MP3_BITRATES = {  # kbps por índice según versión MPEG (solo Layer III)
+    "mpeg1": [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    "mpeg2": [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+def track_duration(path):
+    """Duración en segundos sin decodificar el audio (WAV por cabecera, MP3 por frames)."""
+    try:
+        if path.lower().endswith(".wav"):
+            with wave.open(path, "rb") as w:
+                return w.getnframes() / w.getframerate()
+        if path.lower().endswith(".mp3"):
+            return mp3_duration(path)
+    except (OSError, EOFError, wave.Error):
+        pass
+    return None
+
+def mp3_duration(path):
+    """Suma las cabeceras de frame una a una: vale también para VBR sin cabecera Xing."""
+    with open(path, "rb") as f:
+        data = f.read()
+    pos = 0
+    if data[:3] == b"ID3":
+        # Tamaño "syncsafe": 7 bits útiles por byte
+        pos = 10 + ((data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9])
+    seconds = 0.0
+    while pos + 4 <= len(data):
+        b1, b2 = data[pos + 1], data[pos + 2]
+        version = (b1 >> 3) & 0x03      # 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+        layer = (b1 >> 1) & 0x03        # 1 = Layer III
+        index, rate_index = b2 >> 4, (b2 >> 2) & 0x03
+        if (data[pos] != 0xFF or b1 & 0xE0 != 0xE0 or layer != 1 or version == 1
+                or not 0 < index < 15 or rate_index == 3):
+            pos += 1 # No es una cabecera: buscar el siguiente sincronismo
+            continue
+        mpeg1 = version == 3
+        kbps = MP3_BITRATES["mpeg1" if mpeg1 else "mpeg2"][index]
+        rate = MP3_SAMPLE_RATES[version][rate_index]
+        seconds += (1152 if mpeg1 else 576) / rate
+        pos += (144 if mpeg1 else 72) * kbps * 1000 // rate + ((b2 >> 1) & 1)
+    return seconds or None
+
+def decoded_size(path):
+    """Bytes de PCM que ocuparía la pista decodificada entera con el formato actual del mixer."""
+    mixer = pygame.mixer.get_init()
+    duration = track_duration(path)
+    if not mixer or duration is None:
+        return None
+    freq, fmt, channels = mixer
+    return int(duration * freq * channels * (abs(fmt) // 8))
+
+class MusicPlayer:
+    def __init__(self, volume=1.0, sound_dir="sounds"):
+        self.sound_dir = sound_dir
+        self.volume = volume        # Volumen elegido por el usuario (menú de pausa)
+        self.duck = 1.0             # Factor de ducking actual (baja con el juego en pausa)
+        self.fade = 1.0             # Factor del fundido entre pistas
+        self.track = None           # Escena sonando ("stage", "wave"...)
+        self.path = None
+        self.next_path = None       # Pista que entra cuando termine el fundido de salida
+        self.applied_volume = None
+        self.saved_bytes = {}       # Ruta -> PCM que nos ahorramos al no decodificarla entera
+
+    def resolve(self, track):
+        """Archivo de una escena; las que no tienen pista propia siguen con la del escenario."""
+        for name in (MUSIC_TRACKS.get(track), MUSIC_TRACKS["stage"]):
+            if not name:
+                continue
+            for ext in (".mp3", ".wav", ".ogg"):
+                path = os.path.join(self.sound_dir, name + ext)
+                if os.path.exists(path):
+                    return path
+        return None
+
+    def play(self, track, fade=True, restart=False):
+        """Cambia a la pista de `track` con fundido; sin `restart` no corta la que ya suena."""
+        path = self.resolve(track)
+        self.track = track
+        if path is None:
+            return
+        if path == self.path and self.next_path and not restart:
+            self.next_path = None   # Vuelve la que ya sonaba: deshacer el fundido
+            return
+        if path == (self.next_path or self.path) and not restart:
+            return
+        if not fade or self.path is None:
+            self.next_path = None
+            self.fade = 1.0
+            self._start(path)
+        else:
+            self.next_path = path
+
+    def _start(self, path):
+        if not pygame.mixer.get_init():
+            return
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.play(-1) # Loop infinito
+        except pygame.error as e:
+            print(f"Error cargando música {path}: {e}")
+            return
+        self.path = path
+        self.applied_volume = None
+        self._apply()
+
+    def set_volume(self, volume):
+        self.volume = volume
+        self._apply()
+
+    def update(self, dt_ms, paused=False):
+        """Avanza fundido y ducking; llamar una vez por frame con los ms transcurridos."""
+        duck_target = MUSIC_DUCK_FACTOR if paused else 1.0
+        duck_step = dt_ms / MUSIC_DUCK_MS * (1.0 - MUSIC_DUCK_FACTOR)
+        if self.duck < duck_target:
+            self.duck = min(duck_target, self.duck + duck_step)
+        elif self.duck > duck_target:
+            self.duck = max(duck_target, self.duck - duck_step)
+
+        fade_step = dt_ms / (MUSIC_CROSSFADE_MS / 2)
+        if self.next_path:
+            self.fade = max(0.0, self.fade - fade_step)
+            if self.fade == 0.0:
+                path, self.next_path = self.next_path, None
+                self._start(path)
+        elif self.fade < 1.0:
+            self.fade = min(1.0, self.fade + fade_step)
+        self._apply()
+
+    def _apply(self):
+        volume = self.volume * self.duck * self.fade
+        if volume != self.applied_volume and self.path and pygame.mixer.get_init():
+            pygame.mixer.music.set_volume(volume)
+            self.applied_volume = volume
+
+    def stats(self):
+        if self.path and self.path not in self.saved_bytes:
+            self.saved_bytes[self.path] = decoded_size(self.path)
+        saved = self.saved_bytes.get(self.path)
+        return {
+            "track": self.track, "file": os.path.basename(self.path) if self.path else None,
+            "file_mb": os.path.getsize(self.path) / (1024 * 1024) if self.path else 0.0,
+            "decoded_mb_saved": saved / (1024 * 1024) if saved else 0.0
+        }
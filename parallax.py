@@ -0,0 +1,135 @@
+import random
+import pygame
+from constants import *
+from rng import RNG
+
+# --- FONDO PARALLAX POR CAPAS ---
+# Cada capa se hornea una vez en un tile que se repite en horizontal y se desplaza
+# con la cámara a su propio ritmo (factor), siempre en píxeles enteros. Las capas
+# de atrás se guardan compuestas: solo se recomponen desde la primera capa que se
+# movió al menos un píxel, y la capa del frente va directa a pantalla. La capa
+# opaca más cercana tapa todo lo de detrás, que ni se compone.
+
+COLORKEY = (255, 0, 255)
+
+def alpha_to_colorkey(tile):
+    """Capa con alfa -> opaca con colorkey RLE (umbral de pygame.mask: alfa > 127).
+
+    Pierde el borde semitransparente, pero se blittea varias veces más rápido que
+    el alfa por píxel: con ella el fondo por capas cuesta lo que una textura opaca.
+    """
+    if not tile.get_flags() & pygame.SRCALPHA:
+        return tile
+    keyed = tile.convert()
+    hidden = pygame.mask.from_surface(tile)
+    hidden.invert()
+    hidden.to_surface(keyed, setcolor=COLORKEY, unsetcolor=None)
+    keyed.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    return keyed
+
+def sky_to_colorkey(tile, threshold=PARALLAX_SKY_THRESHOLD):
+    """Textura opaca -> colorkey sobre su banda de cielo (el color liso de la fila de arriba).
+
+    Solo se quita la región de ese color conectada con el borde superior: el cielo y
+    los huecos entre edificios, no las ventanas o fachadas que casualmente lo compartan.
+    Si la fila de arriba no es un cielo liso la textura se deja opaca.
+    """
+    if tile.get_flags() & pygame.SRCALPHA or tile.get_colorkey() is not None:
+        return tile
+    sky = pygame.mask.from_threshold(tile, tile.get_at((0, 0)), (threshold,) * 3 + (255,))
+    if any(not sky.get_at((x, 0)) for x in range(tile.get_width())):
+        return tile
+    keyed = tile.convert()
+    sky.connected_component((0, 0)).to_surface(keyed, setcolor=COLORKEY, unsetcolor=None)
+    keyed.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    return keyed
+
+class ParallaxLayer:
+    def __init__(self, name, tile, factor, y=0):
+        self.name = name
+        self.tile = alpha_to_colorkey(tile)
+        self.factor = factor    # 0: quieta, 1: se mueve con el mundo
+        self.y = y
+        self.opaque = not (self.tile.get_flags() & pygame.SRCALPHA) and self.tile.get_colorkey() is None
+
+    def offset(self, camera_x):
+        return int(camera_x * self.factor) % self.tile.get_width()
+
+    def draw(self, surface, offset):
+        for x in range(-offset, surface.get_width(), self.tile.get_width()):
+            surface.blit(self.tile, (x, self.y))
+
+class ParallaxBackground:
+    def __init__(self, layers=(), size=(WIDTH, FLOOR_START_Y)):
+        self.size = size
+        self.all_layers = list(layers)
+        self.layers = []        # Capas que se ven (desde la última opaca)
+        self.composed = []      # Superficie con las capas 0..i ya compuestas (salvo la del frente)
+        self.offsets = []       # Desplazamiento con el que se compuso cada capa
+        self.recomposed = 0     # Capas re-blitteadas en la composición (para bench.py)
+        self._select()
+
+    def add(self, layer):
+        """Añade una capa delante de las existentes."""
+        self.all_layers.append(layer)
+        self._select()
+
+    def _select(self):
+        opaque = [i for i, layer in enumerate(self.all_layers) if layer.opaque]
+        self.layers = self.all_layers[opaque[-1] if opaque else 0:]
+        self.composed = [None] * max(0, len(self.layers) - 1)
+        self.offsets = [None] * len(self.composed)
+
+    def draw(self, surface, camera_x):
+        if not self.layers:
+            surface.fill(SKY_TOP, (0, 0) + self.size)
+            return
+        front = self.layers[-1]
+        if self.composed:
+            offsets = [layer.offset(camera_x) for layer in self.layers[:-1]]
+            # Las capas que no se movieron un píxel entero siguen valiendo
+            start = next((i for i, (new, old) in enumerate(zip(offsets, self.offsets)) if new != old), len(offsets))
+            for i in range(start, len(offsets)):
+                if self.composed[i] is None:
+                    self.composed[i] = pygame.Surface(self.size).convert()
+                target = self.composed[i]
+                if i > 0:
+                    target.blit(self.composed[i - 1], (0, 0))
+                elif not self.layers[0].opaque:
+                    target.fill(SKY_TOP)
+                self.layers[i].draw(target, offsets[i])
+                self.offsets[i] = offsets[i]
+                self.recomposed += 1
+            surface.blit(self.composed[-1], (0, 0))
+        front.draw(surface, front.offset(camera_x))
+
+    def stats(self):
+        return {"layers": [layer.name for layer in self.layers], "recomposed": self.recomposed}
+
+# --- CAPAS PROCEDURALES ---
+
+def sky_layer():
+    """Degradado del cielo, horneado en una columna estirada al ancho de pantalla."""
+    column = pygame.Surface((1, FLOOR_START_Y))
+    for y in range(FLOOR_START_Y):
+        column.set_at((0, y), [int(a + (b - a) * y / FLOOR_START_Y) for a, b in zip(SKY_TOP, SKY_BOTTOM)])
+    return ParallaxLayer("sky", pygame.transform.scale(column, (WIDTH, FLOOR_START_Y)).convert(), 0)
+
+def skyline_layer(tile_w=PARALLAX_SKYLINE_TILE):
+    """Siluetas lejanas de edificios en un tile que empalma consigo mismo."""
+    rng = random.Random(RNG.derive("skyline"))
+    tile = pygame.Surface((tile_w, FLOOR_START_Y)).convert()
+    tile.fill(COLORKEY)
+    for i in range(tile_w // 100):
+        w = rng.randint(50, 150)
+        h = rng.randint(75, 200)
+        x = i * 100 + rng.randint(-25, 25)
+        windows = [(wx, wy) for wy in range(10, h - 10, 18) for wx in range(8, w - 8, 16) if rng.random() < 0.15]
+        # Lo que se sale por la derecha reaparece por la izquierda
+        for left in (x - tile_w, x, x + tile_w):
+            top = FLOOR_START_Y - h
+            pygame.draw.rect(tile, SKYLINE_COLOR, (left, top, w, h))
+            for wx, wy in windows:
+                pygame.draw.rect(tile, SKYLINE_WINDOW_COLOR, (left + wx, top + wy, 5, 7))
+    tile.set_colorkey(COLORKEY, pygame.RLEACCEL)
+    return ParallaxLayer("skyline", tile, PARALLAX_SKYLINE_FACTOR)
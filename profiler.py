@@ -0,0 +1,174 @@
+import csv
+import json
+import time
+from collections import deque
+import pygame
+from constants import *
+from utils import percentile
+
+# --- PERFILADOR DE FRAMES ---
+# Secciones en orden de dibujado (nivel 1 = dentro de la sección anterior de nivel 0)
+SECTIONS = [
+    ("assets", 0), ("events", 0),
+    ("update", 0), ("player", 1), ("hit_logic", 1), ("enemies", 1), ("cleanup", 1),
+    ("background", 0), ("floor", 0), ("sort", 0), ("sprites", 0),
+    ("combo", 0), ("hud", 0), ("flip", 0)
+]
+
+class _Section:
+    """Context manager reutilizable que acumula nanosegundos en una sección."""
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+class FrameProfiler:
+    """Mide cada subsistema por frame con perf_counter_ns y lo muestra en pantalla (F3).
+
+    Guarda una ventana de `history` frames para medias y percentiles y, si se
+    indica `trace_path`, toda la sesión para volcarla a CSV o JSON al salir.
+    """
+    def __init__(self, history=PROFILER_HISTORY, trace_path=None):
+        self.visible = False
+        self.history = history
+        self.trace_path = trace_path
+        self.frame_ms = deque(maxlen=history)
+        self.samples = {name: deque(maxlen=history) for name, _ in SECTIONS}
+        self.sections = {}
+        self.current = {}
+        self.frame_start = None
+        self.frame_index = 0
+        self.trace = []
+        self.overlay = None
+        self.font = None
+        self.status = ""   # Línea libre al pie del overlay (p. ej. nivel de calidad)
+
+    def section(self, name):
+        sec = self.sections.get(name)
+        if sec is None:
+            sec = self.sections[name] = _Section(self, name)
+        return sec
+
+    def add(self, name, ns):
+        self.current[name] = self.current.get(name, 0) + ns
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter_ns()
+        self.current = {}
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        total = (time.perf_counter_ns() - self.frame_start) / 1e6
+        self.frame_ms.append(total)
+        # Las secciones que no corrieron este frame (p. ej. 0 pasos de update) cuentan como 0
+        row = {"frame": self.frame_index, "total": total}
+        for name in set(self.samples) | set(self.current):
+            ms = self.current.get(name, 0) / 1e6
+            self.samples.setdefault(name, deque(maxlen=self.history)).append(ms)
+            row[name] = ms
+        if self.trace_path:
+            self.trace.append(row)
+        self.frame_index += 1
+        self.frame_start = None
+
+    def stats(self):
+        """Media, p95 y p99 (ms) de la ventana actual para el frame completo y cada sección."""
+        result = {"frame": self._summary(self.frame_ms)}
+        for name, samples in self.samples.items():
+            result[name] = self._summary(samples)
+        return result
+
+    def _summary(self, samples):
+        samples = list(samples)
+        return {
+            "mean": sum(samples) / len(samples) if samples else 0.0,
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99)
+        }
+
+    def revision(self):
+        """Cambia cada vez que el overlay visible se recompone (-1 si está oculto)."""
+        return self.frame_index // PROFILER_REFRESH if self.visible else -1
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.overlay = None
+
+    def draw(self, screen):
+        if not self.visible:
+            return
+        # El texto se recompone cada pocos frames; el coste del overlay no debe falsear la medida
+        if self.overlay is None or self.frame_index % PROFILER_REFRESH == 0:
+            self.overlay = self.render_overlay()
+        screen.blit(self.overlay, (20, 130))
+
+    def render_overlay(self):
+        if self.font is None:
+            self.font = pygame.font.SysFont("Arial", 13)
+        stats = self.stats()
+        line_h = 15
+        graph_h = 60
+        width = 300
+        height = (len(SECTIONS) + 3) * line_h + graph_h + 16
+        surf = pygame.Surface((width, height), pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 170))
+
+        # Fuente proporcional: cada columna se alinea por su propia x
+        columns = (130, 190, 250)
+        y = 4
+        surf.blit(self.font.render("ms", True, YELLOW), (6, y))
+        for x, label in zip(columns, ("mean", "p95", "p99")):
+            surf.blit(self.font.render(label, True, YELLOW), (x, y))
+        y += line_h + 2
+        for name, level in [("frame", 0)] + SECTIONS:
+            s = stats.get(name, self._summary([]))
+            color = YELLOW if name == "frame" else WHITE
+            surf.blit(self.font.render(name, True, color), (6 + 12 * level, y))
+            for x, key in zip(columns, ("mean", "p95", "p99")):
+                surf.blit(self.font.render(f"{s[key]:.2f}", True, color), (x, y))
+            y += line_h
+
+        surf.blit(self.font.render(self.status, True, YELLOW), (6, y))
+        y += line_h
+
+        # Gráfica de tiempos por frame con guías de 60 y 30 fps
+        graph = pygame.Rect(6, y + 6, width - 12, graph_h)
+        pygame.draw.rect(surf, (40, 40, 40, 200), graph)
+        max_ms = 50.0
+        for guide, color in ((1000 / 60, (0, 200, 0)), (1000 / 30, (200, 0, 0))):
+            gy = graph.bottom - int(graph_h * guide / max_ms)
+            pygame.draw.line(surf, color, (graph.left, gy), (graph.right, gy))
+        samples = list(self.frame_ms)[-graph.width:]
+        for i, ms in enumerate(samples):
+            bar_h = min(graph_h, int(graph_h * ms / max_ms))
+            color = (0, 220, 0) if ms <= 1000 / 60 else (YELLOW if ms <= 1000 / 30 else RED)
+            pygame.draw.line(surf, color, (graph.left + i, graph.bottom), (graph.left + i, graph.bottom - bar_h))
+        return surf
+
+    def dump(self, path=None):
+        """Vuelca la traza de la sesión a CSV o JSON (según la extensión)."""
+        path = path or self.trace_path
+        if not path or not self.trace:
+            return
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"frames": self.trace, "summary": self.stats()}, f, indent=1)
+        else:
+            columns = ["frame", "total"] + [name for name, _ in SECTIONS]
+            columns += sorted(set().union(*self.trace) - set(columns))
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=columns, restval=0)
+                writer.writeheader()
+                writer.writerows(self.trace)
+        print(f"Traza del perfilador guardada en {path} ({len(self.trace)} frames)")
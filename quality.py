@@ -0,0 +1,120 @@
+import os
+from collections import deque
+from constants import *
+from utils import percentile
+
+# --- CALIDAD ADAPTATIVA ---
+# Observa el tiempo de trabajo de cada frame y sube o baja de nivel (QUALITY_LEVELS)
+# para sostener FPS. La histéresis evita oscilar: bajar es inmediato al pasar el
+# presupuesto, subir exige varias ventanas seguidas con mucha holgura, y si un
+# nivel recién recuperado vuelve a fallar se exigen el doble de ventanas. Cuando
+# un nivel recuperado aguanta QUALITY_HOLD_WINDOWS ventanas se vuelve a la cuenta
+# normal: unos picos al principio no frenan la subida el resto de la partida.
+
+def parse_level(value):
+    """Nivel forzado a partir de un nombre ("media") o índice ("1"); None si no es válido."""
+    if value is None:
+        return None
+    value = str(value).strip().lower()
+    for i, level in enumerate(QUALITY_LEVELS):
+        if value in (level["name"], str(i)):
+            return i
+    return None
+
+class QualityController:
+    def __init__(self, override=None):
+        self.budget_ms = 1000.0 / FPS
+        self.level = 0
+        self.override = parse_level(override if override is not None else os.environ.get(QUALITY_ENV))
+        self.samples = deque(maxlen=QUALITY_WINDOW)
+        self.good_windows = 0
+        self.up_windows = QUALITY_UP_WINDOWS
+        self.held_windows = 0       # Ventanas que lleva aguantando el último nivel recuperado
+        self.last_change = None     # "up" / "down"
+        self.changes = 0
+        self.listeners = []         # Funciones a llamar con el preset nuevo tras cada cambio
+
+    @property
+    def current(self):
+        return QUALITY_LEVELS[self.override if self.override is not None else self.level]
+
+    @property
+    def floor_step(self):
+        return self.current["floor_step"]
+
+    @property
+    def smooth_sprites(self):
+        return self.current["smooth_sprites"]
+
+    @property
+    def blur(self):
+        return self.current["blur"]
+
+    @property
+    def effects(self):
+        return self.current["effects"]
+
+    @property
+    def fps_cap(self):
+        return self.current["fps_cap"]
+
+    def observe(self, frame_ms):
+        """Registra el tiempo de trabajo de un frame; evalúa al completar cada ventana."""
+        if self.override is not None:
+            return
+        self.samples.append(frame_ms)
+        if len(self.samples) < QUALITY_WINDOW:
+            return
+        p95 = percentile(self.samples, 95)
+        self.samples.clear()
+
+        if p95 > self.budget_ms * QUALITY_DOWN_RATIO:
+            if self.level < len(QUALITY_LEVELS) - 1:
+                # Si acabábamos de subir, ese nivel no se sostiene: tardar más en volver a intentarlo
+                if self.last_change == "up" and self.held_windows < QUALITY_HOLD_WINDOWS:
+                    self.up_windows = min(self.up_windows * 2, QUALITY_UP_WINDOWS * 8)
+                self.set_level(self.level + 1, "down")
+            self.good_windows = 0
+            return
+        if self.last_change == "up":
+            self.held_windows += 1
+            if self.held_windows >= QUALITY_HOLD_WINDOWS:
+                self.up_windows = QUALITY_UP_WINDOWS
+        if p95 < self.budget_ms * QUALITY_UP_RATIO:
+            self.good_windows += 1
+            if self.level > 0 and self.good_windows >= self.up_windows:
+                self.set_level(self.level - 1, "up")
+                self.good_windows = 0
+        else:
+            # Dentro de la banda de histéresis: nos quedamos donde estamos
+            self.good_windows = 0
+
+    def set_level(self, level, direction):
+        self.level = level
+        self.last_change = direction
+        self.held_windows = 0
+        self.changes += 1
+        self.notify()
+
+    def cycle_override(self):
+        """Tecla de desarrollo: automático -> alta -> media -> baja -> automático."""
+        if self.override is None:
+            self.override = 0
+        elif self.override < len(QUALITY_LEVELS) - 1:
+            self.override += 1
+        else:
+            self.override = None
+        self.samples.clear()
+        self.good_windows = 0
+        self.notify()
+
+    def notify(self):
+        for listener in self.listeners:
+            listener(self.current)
+
+    def label(self):
+        mode = "forzada" if self.override is not None else "auto"
+        return f"{self.current['name']} ({mode})"
+
+    def stats(self):
+        return {"level": self.current["name"], "override": self.override is not None, "changes": self.changes}
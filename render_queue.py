@@ -0,0 +1,93 @@
+import bisect
+import heapq
+from constants import *
+
+# --- COLA DE DIBUJADO ---
+# Orden de pintado por profundidad: (Y entera, z_priority). Los props no se mueven,
+# así que se ordenan una sola vez por X para recortar con bisect lo que cae fuera
+# de cámara. Los personajes se guardan en el orden del frame anterior, que casi
+# no cambia: una ordenación por inserción lo corrige en ~O(n). Al final se mezclan
+# las dos capas ya ordenadas. A igual profundidad se respeta el orden de siempre:
+# jugador, enemigos (en su orden) y después los props.
+
+def depth_key(sprite):
+    return (int(sprite.world_pos.y), sprite.z_priority)
+
+class RenderQueue:
+    def __init__(self):
+        self.static = []        # (x, escala horizontal, (profundidad, 1, orden), sprite) ordenado por X
+        self.static_x = []
+        self.static_reach = 0   # Máxima distancia en X al centro de cámara a la que un estático se ve
+        self.dynamic = []       # Personajes en el orden de profundidad del último frame
+        # Contadores (para bench.py)
+        self.frames = 0
+        self.static_drawn = 0
+        self.dynamic_culled = 0
+        self.shifts = 0         # Desplazamientos de la ordenación por inserción
+
+    def set_static(self, sprites):
+        """Capa estática (props): ordenada una vez; cada sprite aporta h_scale() y cull_reach()."""
+        entries = [(s.world_pos.x, s.h_scale(), depth_key(s) + (1, order), s) for order, s in enumerate(sprites)]
+        entries.sort(key=lambda entry: entry[0])
+        self.static = entries
+        self.static_x = [entry[0] for entry in entries]
+        self.static_reach = max((s.cull_reach() for s in sprites), default=0)
+
+    def visible_static(self, camera_x):
+        center = camera_x + WIDTH // 2
+        lo = bisect.bisect_left(self.static_x, center - self.static_reach)
+        hi = bisect.bisect_right(self.static_x, center + self.static_reach)
+        # Misma cuenta que Prop.screen_x/visible, sin una llamada por prop
+        half = WIDTH // 2
+        visible = [(key, s) for x, h, key, s in self.static[lo:hi] if -300 <= half + (x - center) * h <= WIDTH + 300]
+        visible.sort(key=lambda item: item[0])
+        return visible
+
+    def sort_dynamic(self, sprites, camera_x):
+        """Personajes dentro de cámara ordenados partiendo del orden del frame anterior."""
+        center = camera_x + WIDTH // 2
+        reach = WIDTH // 2 + CHAR_CULL_MARGIN
+        index = {id(s): i for i, s in enumerate(sprites)}
+        kept = [s for s in self.dynamic if id(s) in index]
+        if len(kept) != len(sprites):
+            known = {id(s) for s in kept}
+            kept += [s for s in sprites if id(s) not in known]
+        self.dynamic = kept
+
+        items = []
+        for s in kept:
+            if abs(s.world_pos.x - center) > reach:
+                self.dynamic_culled += 1
+                continue
+            items.append(((int(s.world_pos.y), s.z_priority, 0, index[id(s)]), s))
+        # Inserción: barata porque entre frames casi nada cambia de sitio
+        for i in range(1, len(items)):
+            item = items[i]
+            j = i - 1
+            while j >= 0 and items[j][0] > item[0]:
+                items[j + 1] = items[j]
+                j -= 1
+            self.shifts += i - 1 - j
+            items[j + 1] = item
+        # Guardar el orden nuevo para el siguiente frame (los recortados van al final)
+        if len(items) == len(kept):
+            self.dynamic = [s for _, s in items]
+        return items
+
+    def build(self, dynamic, camera_x):
+        """Sprites a dibujar este frame, de atrás hacia adelante."""
+        self.frames += 1
+        statics = self.visible_static(camera_x)
+        self.static_drawn += len(statics)
+        moving = self.sort_dynamic(dynamic, camera_x)
+        if not statics:
+            return [s for _, s in moving]
+        # Las claves no se repiten (llevan capa y orden), así que la mezcla nunca compara sprites
+        return [s for _, s in heapq.merge(moving, statics)]
+
+    def stats(self):
+        frames = max(1, self.frames)
+        return {
+            "static": len(self.static), "static_drawn_per_frame": self.static_drawn / frames,
+            "dynamic_culled_per_frame": self.dynamic_culled / frames, "shifts_per_frame": self.shifts / frames
+        }
@@ -0,0 +1,164 @@
+import argparse
+import struct
+import sys
+import time
+import zlib
+import pygame
+from constants import *
+from utils import percentile
+
+# --- GRABACIÓN Y REPRODUCCIÓN DE PARTIDAS ---
+# Se graba, por tic de simulación, el input que la simulación consume (teclas de
+# movimiento y acciones discretas) más un hash del estado tras el tic. Con la misma
+# semilla (rng.py) la reproducción vuelve a generar exactamente la misma partida:
+# carga idéntica para comparar rendimiento y forma de volver a la oleada de un tirón.
+
+MAGIC = b"BEUR"
+VERSION = 1
+HEADER = struct.Struct("<4sHQH?")   # magic, versión, semilla, FPS, backend numpy
+TICK = struct.Struct("<BBI")        # teclas, nº de acciones, hash del estado
+ACTION = struct.Struct("<Bb")       # acción, valor
+ACTIONS = ["attack", "special", "jump", "run", "pause", "restart", "move_x", "move_y"]
+# Un bit por dirección: flechas y WASD son equivalentes para handle_input
+KEY_BITS = [
+    (pygame.K_LEFT, pygame.K_a), (pygame.K_RIGHT, pygame.K_d),
+    (pygame.K_UP, pygame.K_w), (pygame.K_DOWN, pygame.K_s)
+]
+
+class MaskKeys:
+    """Imita pygame.key.get_pressed() a partir de la máscara de bits grabada."""
+    def __init__(self, mask=0):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        for bit, keys in enumerate(KEY_BITS):
+            if key in keys:
+                return bool(self.mask & (1 << bit))
+        return False
+
+def encode_keys(pressed):
+    mask = 0
+    for bit, keys in enumerate(KEY_BITS):
+        if any(pressed[key] for key in keys):
+            mask |= 1 << bit
+    return mask
+
+def state_hash(game):
+    """CRC32 del estado de simulación que importa para reproducir la partida."""
+    p = game.player
+    parts = [
+        struct.pack("<7d3i", p.world_pos.x, p.world_pos.y, p.z, p.hp, game.camera_x, game.target_wave_x,
+                    game.last_combo_hit_time, p.combo_index, game.wave_enemies_to_spawn, len(game.enemies)),
+        p.state.encode()
+    ]
+    if game.enemy_arrays:
+        n = game.enemy_arrays.count
+        parts += [game.enemy_arrays.pos[:n].tobytes(), game.enemy_arrays.hp[:n].tobytes(),
+                  game.enemy_arrays.state[:n].tobytes()]
+    else:
+        for e in game.enemies:
+            parts.append(struct.pack("<3d", e.world_pos.x, e.world_pos.y, e.hp))
+            parts.append(e.state.encode())
+    return zlib.crc32(b"".join(parts))
+
+class InputRecorder:
+    """Graba el input por tic en un archivo binario compacto (~6 bytes por tic)."""
+    def __init__(self, path, seed, numpy_backend=False):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, FPS, numpy_backend))
+        self.mask = 0
+        self.actions = []
+        self.ticks = 0
+
+    def wrap(self, key_source):
+        """Fuente de teclas que anota lo leído; el juego ve lo mismo que verá la reproducción."""
+        def keys():
+            self.mask = encode_keys(key_source())
+            return MaskKeys(self.mask)
+        return keys
+
+    def action(self, name, value=0):
+        self.actions.append((ACTIONS.index(name), value))
+
+    def end_tick(self, game):
+        self.file.write(TICK.pack(self.mask, len(self.actions), state_hash(game)))
+        for code, value in self.actions:
+            self.file.write(ACTION.pack(code, value))
+        self.mask = 0
+        self.actions = []
+        self.ticks += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+            print(f"Partida grabada en {self.path} ({self.ticks} tics)")
+
+def load_replay(path):
+    """Devuelve (semilla, backend numpy, [(teclas, acciones, hash)])."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, seed, fps, numpy_backend = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} no es una grabación válida (versión {VERSION})")
+    if fps != FPS:
+        raise ValueError(f"{path} se grabó a {fps} tics/s y el juego usa {FPS}")
+    ticks = []
+    pos = HEADER.size
+    while pos + TICK.size <= len(data):
+        mask, count, expected = TICK.unpack_from(data, pos)
+        pos += TICK.size
+        actions = [ACTION.unpack_from(data, pos + i * ACTION.size) for i in range(count)]
+        pos += count * ACTION.size
+        ticks.append((mask, actions, expected))
+    return seed, numpy_backend, ticks
+
+def play_replay(path, draw=False, until=None):
+    """Re-ejecuta la partida sin tope de FPS verificando el hash de cada tic."""
+    from engine import GameEngine
+    seed, numpy_backend, ticks = load_replay(path)
+    game = GameEngine(headless=True, enemy_backend="numpy" if numpy_backend else "objects", seed=seed)
+    game.game_state = "PLAYING"
+    keys = MaskKeys()
+    game.key_source = lambda: keys
+
+    tick_ms = []
+    mismatch = None
+    for tick, (mask, actions, expected) in enumerate(ticks[:until], start=1):
+        start = time.perf_counter()
+        # Las acciones llegaron (por eventos) antes de este tic
+        for code, value in actions:
+            game.player_action(ACTIONS[code], value)
+        keys.mask = mask
+        game.step()
+        if draw:
+            game.draw()
+        tick_ms.append((time.perf_counter() - start) * 1000)
+        if state_hash(game) != expected:
+            mismatch = tick
+            break
+    return {"seed": seed, "ticks": len(tick_ms), "mismatch": mismatch, "tick_ms": tick_ms}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reproduce una partida grabada con BEATEMUP_RECORD")
+    parser.add_argument("path")
+    parser.add_argument("--draw", action="store_true", help="Dibujar cada tic (mide también el render)")
+    parser.add_argument("--until", type=int, help="Parar en este tic")
+    parser.add_argument("--slowest", type=int, default=5, help="Cuántos tics más lentos listar")
+    args = parser.parse_args(argv)
+
+    result = play_replay(args.path, draw=args.draw, until=args.until)
+    samples = result["tick_ms"]
+    if samples:
+        print(f"semilla {result['seed']}, {result['ticks']} tics: mean {sum(samples) / len(samples):.3f}  "
+              f"p95 {percentile(samples, 95):.3f}  p99 {percentile(samples, 99):.3f}  max {max(samples):.3f} ms")
+        slowest = sorted(range(len(samples)), key=samples.__getitem__, reverse=True)[:args.slowest]
+        print("tics más lentos: " + ", ".join(f"{i + 1} ({samples[i]:.2f} ms)" for i in sorted(slowest)))
+    if result["mismatch"] is not None:
+        print(f"DESINCRONIZADA: el estado difiere en el tic {result['mismatch']}")
+        return 1
+    print("Reproducción idéntica a la grabación")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
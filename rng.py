@@ -0,0 +1,31 @@
+import os
+import random
+from constants import *
+
+# --- AZAR DETERMINISTA ---
+# Un generador por subsistema, todos derivados de una semilla: con la misma semilla
+# y el mismo input la partida se repite exacta (ver replay.py). Al estar separados,
+# lo que solo afecta al dibujado ("fx") no desplaza las tiradas de la simulación.
+
+STREAMS = ("waves", "spawn", "ai", "combat", "fx")
+
+class RngStreams:
+    def __init__(self, seed=None):
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        """Reinicia todos los generadores; sin semilla usa SEED_ENV o una aleatoria."""
+        if seed is None and os.environ.get(SEED_ENV):
+            seed = int(os.environ[SEED_ENV])
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        for name in STREAMS:
+            setattr(self, name, random.Random(self.derive(name)))
+
+    def derive(self, name):
+        """Semilla entera estable para un subsistema (también sirve para numpy.random)."""
+        return random.Random(f"{self.seed}:{name}").getrandbits(64)
+
+# Generadores compartidos por el motor y las entidades
+RNG = RngStreams()
@@ -0,0 +1,75 @@
+import pygame
+from constants import *
+
+# --- BUS DE EFECTOS ---
+# Cada grupo (jugador, enemigos, UI) tiene sus propios canales del mixer, así una
+# horda de golpes enemigos no deja sin voz al jugador. Dentro del grupo se limita
+# cuántas copias del mismo sonido suenan a la vez, se ignora el mismo sonido
+# repetido en un frame y, sin canal libre, se roba la voz de menor prioridad.
+# El total de canales es fijo (suma de SOUND_GROUPS): el mixer nunca mezcla más.
+
+class SoundBus:
+    def __init__(self, sounds=None, groups=SOUND_GROUPS, defs=SOUND_DEFS):
+        self.sounds = sounds if sounds is not None else {}  # nombre -> mixer.Sound (compartido con el motor)
+        self.defs = defs
+        self.groups = {}
+        if pygame.mixer.get_init():
+            total = sum(groups.values())
+            pygame.mixer.set_num_channels(total)
+            # Todos reservados: un Sound.play() suelto no puede quitarle canal al bus
+            pygame.mixer.set_reserved(total)
+            first = 0
+            for name, count in groups.items():
+                self.groups[name] = [pygame.mixer.Channel(i) for i in range(first, first + count)]
+                first += count
+        self.voices = {}        # Canal -> (nombre, prioridad, orden de inicio)
+        self.frame_played = set()
+        self.order = 0
+        # Contadores (para bench.py)
+        self.played = 0
+        self.deduped = 0        # Repetidos en el mismo frame
+        self.stolen = 0         # Voces cortadas para hacer sitio a otra
+        self.dropped = 0        # Peticiones descartadas (todo ocupado por voces más importantes)
+
+    def play(self, name):
+        """Reproduce `name` en su grupo; devuelve el canal usado o None si no suena."""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        if name in self.frame_played:
+            self.deduped += 1
+            return None
+        group, priority, max_voices = self.defs.get(name, ("ui", 1, 1))
+        channels = self.groups.get(group)
+        if not channels:
+            return None
+
+        # Una voz que no lanzó el bus (canal ocupado desde fuera) es la primera en ceder
+        active = [(ch, self.voices.get(ch, (None, -1, -1))) for ch in channels if ch.get_busy()]
+        same = [voice for voice in active if voice[1][0] == name]
+        if len(same) >= max_voices:
+            # Tope de copias: reiniciar la más antigua del mismo sonido
+            channel = min(same, key=lambda voice: voice[1][2])[0]
+            self.stolen += 1
+        else:
+            channel = next((ch for ch in channels if not ch.get_busy()), None)
+            if channel is None:
+                # Grupo lleno: robar la de menor prioridad (la más antigua si empatan)
+                channel, (_, victim_priority, _) = min(active, key=lambda voice: (voice[1][1], voice[1][2]))
+                if victim_priority > priority:
+                    self.dropped += 1
+                    return None
+                self.stolen += 1
+
+        channel.play(sound)
+        self.voices[channel] = (name, priority, self.order)
+        self.order += 1
+        self.frame_played.add(name)
+        self.played += 1
+        return channel
+
+    def end_frame(self):
+        self.frame_played.clear()
+
+    def stats(self):
+        return {"played": self.played, "deduped": self.deduped, "stolen": self.stolen, "dropped": self.dropped}
@@ -0,0 +1,89 @@
+import math
+
+class SpatialHash:
+    """Índice de cuadrícula uniforme sobre `world_pos` para consultas de vecinos.
+
+    Se reconstruye una vez por tic. En un tic un enemigo puede desplazarse más
+    que una celda (knockback, empujón del golpe, colisiones), así que quien lo
+    mueve llama a move()/refresh() para reubicarlo. `margin` solo cubre lo que
+    se mueve entre dos reubicaciones; las consultas filtran siempre con la
+    posición actual de cada personaje.
+    """
+    def __init__(self, cell_size, margin=16):
+        self.cell_size = cell_size
+        self.margin = margin
+        self.cells = {}   # (cx, cy) -> [(orden, item)]
+        self.where = {}   # id(item) -> (celda, orden, item)
+        self.count = 0
+
+    def _cell(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def rebuild(self, items):
+        self.cells.clear()
+        self.where.clear()
+        self.count = 0
+        for item in items:
+            self.insert(item)
+
+    def insert(self, item):
+        key = self._cell(item.world_pos.x, item.world_pos.y)
+        self.cells.setdefault(key, []).append((self.count, item))
+        self.where[id(item)] = (key, self.count, item)
+        self.count += 1
+
+    def move(self, item):
+        """Cambia `item` de celda si su posición actual ya cae en otra."""
+        old, order, _ = self.where[id(item)]
+        key = self._cell(item.world_pos.x, item.world_pos.y)
+        if key == old:
+            return
+        bucket = self.cells[old]
+        bucket.remove((order, item))
+        if not bucket: del self.cells[old]
+        self.cells.setdefault(key, []).append((order, item))
+        self.where[id(item)] = (key, order, item)
+
+    def refresh(self):
+        """Reubica todos los items (tras empujones a varios a la vez: golpes, especial...)."""
+        for _, _, item in list(self.where.values()):
+            self.move(item)
+
+    def query_rect(self, left, top, right, bottom):
+        """Candidatos cuyas celdas tocan el rectángulo (en el orden de inserción)."""
+        m = self.margin
+        x0, y0 = self._cell(left - m, top - m)
+        x1, y1 = self._cell(right + m, bottom + m)
+        found = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket: found.extend(bucket)
+        found.sort(key=lambda entry: entry[0])
+        return [item for _, item in found]
+
+    def query_radius(self, pos, radius):
+        """Items a menos de `radius` de `pos` según su posición actual."""
+        r2 = radius * radius
+        return [item for item in self.query_rect(pos.x - radius, pos.y - radius, pos.x + radius, pos.y + radius)
+                if (item.world_pos - pos).length_squared() < r2]
+
+    def nearest(self, pos, max_dist, predicate=None):
+        """El item más cercano a `pos` dentro de `max_dist`, buscando por anillos de celdas."""
+        cx, cy = self._cell(pos.x, pos.y)
+        max_ring = int(math.ceil((max_dist + self.margin) / self.cell_size))
+        best, best_d2 = None, max_dist * max_dist
+        for ring in range(max_ring + 1):
+            # Cualquier celda de este anillo está al menos a (ring - 1) celdas de distancia
+            ring_min = max(0, (ring - 1) * self.cell_size - self.margin)
+            if best is not None and ring_min * ring_min > best_d2:
+                break
+            for dx in range(-ring, ring + 1):
+                for dy in range(-ring, ring + 1):
+                    if max(abs(dx), abs(dy)) != ring: continue
+                    for order, item in self.cells.get((cx + dx, cy + dy), ()):
+                        if predicate and not predicate(item): continue
+                        d2 = (item.world_pos - pos).length_squared()
+                        if d2 < best_d2 or (d2 == best_d2 and best is not None and order < best_order):
+                            best, best_d2, best_order = item, d2, order
+        return best
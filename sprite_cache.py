@@ -0,0 +1,77 @@
+import pygame
+from collections import OrderedDict
+
+class ScaledSpriteCache:
+    """Cache LRU de sprites ya escalados por cubeta de escala.
+
+    La escala de perspectiva es continua, así que la cuantizamos en pasos de
+    `step` para que personajes a profundidades parecidas compartan la misma
+    superficie en lugar de llamar a smoothscale cada frame.
+    """
+    def __init__(self, budget_bytes, step):
+        self.budget_bytes = budget_bytes
+        self.step = step
+        self.smooth = True           # smoothscale (calidad) o scale (rápido); lo decide QualityController
+        self.entries = OrderedDict() # (key, facing_right, bucket, smooth) -> Surface
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def bucket(self, scale):
+        return max(1, int(round(scale / self.step)))
+
+    def quantize(self, scale):
+        """Devuelve la escala real que se usará para una escala pedida."""
+        return self.bucket(scale) * self.step
+
+    def get(self, key, source, facing_right, scale):
+        """Retorna `source` escalado, reutilizando el resultado si ya existe.
+
+        `key` identifica el frame de origen: (prefijo, animación, índice).
+        `source` llega ya orientado (los sets espejados se precalculan al cargar),
+        `facing_right` solo distingue ambas versiones dentro del cache.
+        """
+        cache_key = (key, facing_right, self.bucket(scale), self.smooth)
+        surf = self.entries.get(cache_key)
+        if surf is not None:
+            self.entries.move_to_end(cache_key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        final_scale = self.quantize(scale)
+        new_w = int(source.get_width() * final_scale)
+        new_h = int(source.get_height() * final_scale)
+        if new_w <= 0 or new_h <= 0:
+            return None
+
+        scale_fn = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+        surf = scale_fn(source, (new_w, new_h))
+        self._store(cache_key, surf)
+        return surf
+
+    def _store(self, cache_key, surf):
+        size = surf.get_width() * surf.get_height() * surf.get_bytesize()
+        self.entries[cache_key] = surf
+        self.used_bytes += size
+        # Expulsar los menos usados hasta volver al presupuesto (siempre dejamos el recién creado)
+        while self.used_bytes > self.budget_bytes and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.used_bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.used_bytes = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.used_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0
+        }
@@ -0,0 +1,48 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import shutil
+import tempfile
+import pygame
+import asset_cache
+from constants import *
+from utils import get_frame_metrics, load_gif
+
+SOURCE_GIF = "textures/sprites/enemy-walk.gif"
+
+def test_cached_frames_match_decoded_gif():
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    tmp = tempfile.mkdtemp()
+    original_dir = asset_cache.CACHE_DIR
+    asset_cache.CACHE_DIR = os.path.join(tmp, "cache")
+    try:
+        gif = os.path.join(tmp, "walk.gif")
+        shutil.copy(SOURCE_GIF, gif)
+        size = (CHAR_WIDTH, CHAR_HEIGHT)
+        expected = load_gif(gif, size)
+
+        cold, cold_metrics = asset_cache.load_gif_cached(gif, size)
+        warm, warm_metrics = asset_cache.load_gif_cached(gif, size)
+        assert os.path.exists(asset_cache.cache_path(gif, size))
+        assert warm_metrics == cold_metrics == [get_frame_metrics(f) for f in expected]
+        for a, b in zip(expected, warm):
+            assert pygame.image.tostring(a, "RGBA") == pygame.image.tostring(b, "RGBA")
+
+        # Solo cambia el mtime: el hash coincide y el cache sigue siendo válido
+        os.utime(gif, (0, 0))
+        assert asset_cache._read(asset_cache.cache_path(gif, size), gif, os.stat(gif))
+
+        # Cambia el contenido: el cache se invalida
+        with open(gif, "ab") as f:
+            f.write(b"\0")
+        assert asset_cache._read(asset_cache.cache_path(gif, size), gif, os.stat(gif)) is None
+    finally:
+        asset_cache.CACHE_DIR = original_dir
+        shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    test_cached_frames_match_decoded_gif()
+    print("Test passed: GIF frame cache matches Pillow decoding.")
+    pygame.quit()
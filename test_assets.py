@@ -0,0 +1,46 @@
+import threading
+from assets import AssetManager, PRIORITY_MENU, PRIORITY_GAMEPLAY, PRIORITY_CINEMATIC
+
+def check_manager(threaded):
+    manager = AssetManager(threaded=threaded)
+    loaded, finalized = [], []
+    main_thread = threading.current_thread()
+
+    def loader(name):
+        def load():
+            loaded.append(name)
+            return name.upper()
+        return load
+
+    def finalize(value):
+        # Lo que toca el display siempre corre en el hilo principal
+        assert threading.current_thread() is main_thread
+        finalized.append(value)
+        return value
+
+    ready = []
+    manager.on_ready("menu", lambda: ready.append("menu"))
+    # Pedidas al revés de su prioridad
+    manager.request("slide", loader("slide"), finalize, group="cinematic", priority=PRIORITY_CINEMATIC)
+    manager.request("player", loader("player"), finalize, group="gameplay", priority=PRIORITY_GAMEPLAY)
+    manager.request("logo", loader("logo"), finalize, group="menu", priority=PRIORITY_MENU)
+    manager.request("broken", lambda: 1 / 0, group="gameplay")
+    assert manager.progress() < 1.0
+
+    manager.wait("menu")
+    assert manager.is_ready("menu") and ready == ["menu"]
+    manager.wait()
+    assert manager.progress() == 1.0 and manager.get("player") == "PLAYER"
+    if not threaded:
+        # Con hilo, el primero pedido puede empezar antes de que lleguen los demás
+        assert loaded == ["logo", "player", "slide"] and finalized[0] == "LOGO"
+    assert sorted(finalized) == ["LOGO", "PLAYER", "SLIDE"]
+    assert [name for name, _ in manager.errors] == ["broken"]
+
+def test_asset_manager():
+    check_manager(threaded=False)
+    check_manager(threaded=True)
+
+if __name__ == "__main__":
+    test_asset_manager()
+    print("Test passed: asset manager loads by priority and finalizes on the main thread.")
@@ -0,0 +1,84 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import tempfile
+import pygame
+import atlas
+import build_atlas
+from constants import *
+from entities import Character, GLOBAL_ASSET_CACHE, SPRITE_SCALE_CACHE
+
+def fresh_character(is_player, use_atlas):
+    """Personaje cargado desde cero (sin lo que dejaron otros en los caches globales)."""
+    for bucket in GLOBAL_ASSET_CACHE.values():
+        bucket.clear()
+    SPRITE_SCALE_CACHE.clear()
+    atlas.ENABLED = use_atlas
+    atlas._atlas = None
+    return Character(400, 450, BLUE if is_player else RED, is_player=is_player)
+
+def on_black(surf, size=None, pos=(0, 0)):
+    """RGB de un frame sobre fondo negro (el color de los píxeles invisibles no cuenta)."""
+    flat = pygame.Surface(size or surf.get_size())
+    flat.blit(surf, pos)
+    return pygame.image.tobytes(flat, "RGB")
+
+STATES = [("IDLE", 0), ("WALK", 3), ("ATTACK", 2), ("STUN", 0), ("DOWN", 0)]
+
+def drawn(char, scale):
+    """Lo que dibuja el personaje en cada estado, mirando a ambos lados."""
+    SPRITE_SCALE_CACHE.clear()
+    shots = []
+    for state, frame in STATES:
+        for facing_right in (True, False):
+            char.state, char.anim_frame, char.facing_right = state, frame, facing_right
+            screen = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+            char.draw(screen, 0, scale)
+            shots.append(screen)
+    return shots
+
+def test_atlas_matches_loose_files():
+    saved = (build_atlas.OUTPUT_DIR, atlas.ATLAS_DIR, atlas.ATLAS_MANIFEST, atlas.ENABLED)
+    with tempfile.TemporaryDirectory() as folder:
+        build_atlas.OUTPUT_DIR = atlas.ATLAS_DIR = folder
+        atlas.ATLAS_MANIFEST = os.path.join(folder, "atlas.json")
+        try:
+            build_atlas.build_atlas() # Cierra pygame al terminar
+            pygame.init()
+            pygame.display.set_mode((WIDTH, HEIGHT))
+            for is_player in (True, False):
+                loose = fresh_character(is_player, use_atlas=False)
+                packed = fresh_character(is_player, use_atlas=True)
+                assert packed.frame_trims, "el personaje no se cargó del atlas"
+
+                # Mismos frames: el recorte más su offset reconstruye el original
+                assert sorted(packed.animations) == sorted(loose.animations)
+                assert sorted(packed.sprites) == sorted(loose.sprites)
+                for name, frames in loose.animations.items():
+                    for i, frame in enumerate(frames):
+                        off_x, off_y, w, h = packed.frame_trims[name][i]
+                        restored = on_black(packed.animations[name][i], (w, h), (off_x, off_y))
+                        assert restored == on_black(frame), (name, i)
+                # Métricas del manifiesto = medidas sobre los archivos sueltos
+                assert packed.sprite_bottoms == loose.sprite_bottoms
+
+                # Mismas posiciones en pantalla (con recorte, offset y espejo). A escala 1 el
+                # dibujo es idéntico (los enemigos se dibujan al 95%: se compensa)
+                unit = 1.0 if is_player else 1 / 0.95
+                for old, new in zip(drawn(loose, unit), drawn(packed, unit)):
+                    assert on_black(new) == on_black(old)
+                # Con perspectiva cada recorte se escala por separado: su offset se redondea
+                for old, new in zip(drawn(loose, 0.7), drawn(packed, 0.7)):
+                    a, b = old.get_bounding_rect(), new.get_bounding_rect()
+                    assert all(abs(p - q) <= 1 for p, q in zip((a.left, a.top, a.right, a.bottom), (b.left, b.top, b.right, b.bottom)))
+        finally:
+            build_atlas.OUTPUT_DIR, atlas.ATLAS_DIR, atlas.ATLAS_MANIFEST, atlas.ENABLED = saved
+            atlas._atlas = None
+            for bucket in GLOBAL_ASSET_CACHE.values():
+                bucket.clear()
+            SPRITE_SCALE_CACHE.clear()
+
+if __name__ == "__main__":
+    test_atlas_matches_loose_files()
+    print("Test passed: characters load the same frames and positions from the atlas.")
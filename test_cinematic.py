@@ -1,8 +1,120 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import math
+import tempfile
 from engine import GameEngine
+from assets import AssetManager
+from cinematic import CinematicManager, render_view, slide_view, slide_effects
+from constants import *
 import pygame
 
+def test_slides_stream_one_ahead():
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        os.makedirs(os.path.join(folder, "slides"))
+        for i in range(3):
+            surf = pygame.Surface((WIDTH * 2, HEIGHT * 2)) # Más grande de lo que llega a verse
+            surf.fill((60 * i, 80, 120))
+            pygame.image.save(surf, os.path.join(folder, "slides", f"slide{i + 1}.png"))
+        os.chdir(folder)
+        try:
+            assets = AssetManager(threaded=False)
+            cinematic = CinematicManager(pygame.display.set_mode((WIDTH, HEIGHT)), assets, bake_mb=0)
+            assets.wait()
+            # Solo la primera slide está decodificada, ya reducida a su zoom máximo y sin alfa
+            loaded = [s["image"] is not None for s in cinematic.slides]
+            assert loaded == [True, False, False]
+            image = cinematic.slides[0]["image"]
+            assert image.get_size() == (math.ceil(WIDTH * 1.1), math.ceil(HEIGHT * 1.1))
+            assert not image.get_flags() & pygame.SRCALPHA
+
+            cinematic.start()
+            assets.wait()
+            for _ in range(cinematic.slides[0]["duration"]):
+                cinematic.update()
+            cinematic.draw()
+            # Al pasar a la segunda se suelta la primera y se pide la tercera
+            assets.wait()
+            loaded = [s["image"] is not None for s in cinematic.slides]
+            assert loaded == [False, True, True]
+        finally:
+            os.chdir(previous)
+
+def test_view_covers_screen():
+    image = pygame.Surface((WIDTH, HEIGHT))
+    for scale in (1.0, 1.1, 1.2):
+        surf, (x, y) = render_view(image, (0.5, 0.5), scale)
+        # Lo escalado es ~la pantalla (no la slide entera) y la cubre completa
+        assert x <= 0 and y <= 0
+        assert x + surf.get_width() >= WIDTH and y + surf.get_height() >= HEIGHT
+        assert surf.get_width() <= WIDTH + 2 * scale + 1
+
+def test_bake_matches_live():
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        os.makedirs(os.path.join(folder, "slides"))
+        for i in range(2):
+            surf = pygame.Surface((WIDTH, HEIGHT))
+            pygame.draw.circle(surf, (200, 40 * i, 90), (WIDTH // 3, HEIGHT // 2), HEIGHT // 3)
+            pygame.image.save(surf, os.path.join(folder, "slides", f"slide{i + 1}.png"))
+        os.chdir(folder)
+        try:
+            assets = AssetManager(threaded=False)
+            cinematic = CinematicManager(pygame.display.set_mode((WIDTH, HEIGHT)), assets, bake_mb=64)
+            for slide in cinematic.slides:
+                slide["duration"] = 8 # Slides cortas: cada frame horneado ocupa ~2 MB
+            assets.wait()
+            first = cinematic.slides[0]
+            assert len(first["frames"]) == first["duration"]
+            # Mismo resultado que el render en vivo (el horneado parte de una copia de la slide)
+            for frame in (0, 5):
+                baked, baked_pos = first["frames"][frame]
+                live, live_pos = render_view(first["image"], *slide_view(first, frame))
+                assert baked is not first["image"] and baked_pos == live_pos
+                assert pygame.image.tobytes(baked, "RGB") == pygame.image.tobytes(live, "RGB")
+
+            # La slide que está en pantalla no se hornea: solo la siguiente
+            cinematic.start()
+            cinematic.release(0)
+            cinematic.ensure_loaded(0)
+            assets.wait()
+            assert cinematic.slides[0]["frames"] is None
+            assert len(cinematic.slides[1]["frames"]) == cinematic.slides[1]["duration"]
+        finally:
+            os.chdir(previous)
+
+def test_crop_matches_full_scale():
+    import numpy
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    for name in ("slide1", "slide2", "slide3"):
+        slide = slide_effects(name)
+        zoom = max(slide["start_scale"], slide["end_scale"])
+        # Degradado suave del tamaño al que load_slide deja la slide
+        size = (math.ceil(WIDTH * zoom), math.ceil(HEIGHT * zoom))
+        xs, ys = numpy.meshgrid(numpy.arange(size[0]), numpy.arange(size[1]), indexing="ij")
+        pixels = numpy.stack([xs * 200 // size[0], ys * 200 // size[1], (xs + ys) * 100 // sum(size)], axis=-1)
+        image = pygame.surfarray.make_surface(pixels.astype(numpy.uint8)).convert()
+        for frame in range(0, slide["duration"], 30):
+            pos, scale = slide_view(slide, frame)
+            # Render anterior: la slide entera escalada y centrada
+            full = pygame.transform.smoothscale(image, (int(WIDTH * scale), int(HEIGHT * scale)))
+            old = pygame.Surface((WIDTH, HEIGHT)).convert()
+            old.blit(full, full.get_rect(center=(int(WIDTH * pos[0]), int(HEIGHT * pos[1]))))
+            new = pygame.Surface((WIDTH, HEIGHT)).convert()
+            surf, at = render_view(image, pos, scale)
+            new.blit(surf, at)
+            diff = numpy.abs(pygame.surfarray.array3d(old).astype(int) - pygame.surfarray.array3d(new))
+            # Misma geometría: de media menos de un nivel de color. Los picos vienen del
+            # redondeo de smoothscale al filtrar con otra fase (recorte vs imagen entera)
+            assert diff.mean() < 1.0 and diff.max() <= 4, (name, frame, diff.mean(), diff.max())
+
 if __name__ == "__main__":
-    game = GameEngine()
+    game = GameEngine(headless=True)
+    test_slides_stream_one_ahead()
+    test_view_covers_screen()
+    test_bake_matches_live()
+    test_crop_matches_full_scale()
     # Force state to cinematic to test immediately
     game.game_state = "CINEMATIC"
     game.cinematic.start()
@@ -11,8 +123,8 @@ if __name__ == "__main__":
     for _ in range(100):
         game.handle_events()
         game.update()
-        # We won't call game.draw() here to avoid opening a window in a headless test environment
-        # But we can check if the cinematic frame is advancing
+        # Headless mode uses SDL's dummy video driver, so drawing is safe here
+        game.draw()
         if game.cinematic.frame > 0:
             print(f"Cinematic advancing... Frame: {game.cinematic.frame}")
             break
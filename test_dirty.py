@@ -0,0 +1,39 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from constants import *
+from engine import GameEngine
+
+def test_dirty_frames_match_full_redraw():
+    game = GameEngine(headless=True, dirty_rects=True, seed=3)
+    game.game_state = "PLAYING"
+    game.trigger_wave() # Oleada activa: cámara quieta y sin el GO! parpadeante
+
+    for i in range(90):
+        if i % 12 == 0:
+            game.execute_player_attack()
+        game.step()
+        game.draw(alpha=0.5)
+        patched = pygame.image.tostring(game.screen, "RGB")
+        # El mismo frame dibujado entero debe dar exactamente los mismos píxeles
+        dirty, game.dirty = game.dirty, None
+        game.draw(alpha=0.5)
+        game.dirty = dirty
+        assert patched == pygame.image.tostring(game.screen, "RGB"), i
+
+    stats = game.dirty.stats()
+    assert stats["partial"] > 80 and stats["screen_fraction"] < DIRTY_FULL_RATIO
+
+    # En pausa, sin cambios de opción, no se vuelve a dibujar nada
+    game.paused = True
+    for _ in range(5):
+        game.step()
+        game.draw()
+    assert game.dirty.stats()["skipped"] == 4
+
+if __name__ == "__main__":
+    test_dirty_frames_match_full_redraw()
+    print("Test passed: dirty-rect frames match full redraws.")
+    pygame.quit()
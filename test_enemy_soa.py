@@ -0,0 +1,88 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from rng import RNG
+from constants import *
+from entities import Character
+from enemy_soa import EnemyArrays
+
+class FixedRandom:
+    """Sustituye a los generadores de rng.py: sin cambios de objetivo ni ruido en la IA."""
+    def random(self, size=None): return 1.0 if size is None else [1.0] * size
+    def uniform(self, low, high, size=None): return 0.0 if size is None else [[0.0, 0.0]] * size[0]
+    def randint(self, low, high): return 0
+    def choice(self, seq): return seq[0]
+
+class FixedRng(FixedRandom):
+    """Mismo comportamiento con la interfaz de numpy.random.Generator."""
+    def random(self, size=None):
+        import numpy
+        return numpy.ones(size)
+    def uniform(self, low, high, size=None):
+        import numpy
+        return numpy.zeros(size)
+
+# Offsets separados para que los enemigos no se toquen entre sí
+# (la separación objeto-a-objeto es secuencial y la vectorizada simultánea)
+SETUP = [
+    ((100, 380), (-300, -40)),
+    ((150, 500), (-150, 40)),
+    ((900, 380), (150, -40)),
+    ((1000, 500), (320, 40)),
+    ((700, 470), (60, -10)),
+]
+
+def test_soa_matches_object_path():
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    original_streams = RNG.ai, RNG.combat
+    RNG.ai = RNG.combat = FixedRandom()
+    try:
+        player_a = Character(500, 450, BLUE, is_player=True)
+        player_b = Character(500, 450, BLUE, is_player=True)
+        objects = []
+        arrays = EnemyArrays(rng=FixedRng())
+        views = []
+        for (x, y), offset in SETUP:
+            e = Character(x, y, RED)
+            e.target_offset = pygame.Vector2(offset)
+            objects.append(e)
+            v = arrays.spawn(x, y)
+            v.target_offset = pygame.Vector2(offset)
+            views.append(v)
+
+        for tick in range(500):
+            # Golpes scriptados para recorrer STUN, KNOCKBACK, DOWN y la muerte
+            # (siempre hacia afuera para que el enemigo no choque con otro)
+            if tick in (30, 90, 150, 210, 270):
+                index = tick // 60 % len(SETUP)
+                outward = pygame.Vector2(1 if SETUP[index][1][0] > 0 else -1, 0)
+                dmg = 100 if tick == 270 else 35
+                for group in (objects, views):
+                    group[index].apply_damage(dmg, knockback=(tick != 30), knk_dir=outward)
+
+            for e in objects:
+                e.update(player_ref=player_a, enemies=objects)
+            arrays.step(player_b)
+
+            for e, v in zip(objects, views):
+                assert e.state == v.state, (tick, e.state, v.state)
+                assert (e.world_pos - v.world_pos).length() < 1e-6, (tick, e.world_pos, v.world_pos)
+                assert abs(e.z - v.z) < 1e-6 and (e.vel - v.vel).length() < 1e-6, tick
+                assert e.hp == v.hp and e.state_timer == v.state_timer, tick
+                assert e.facing_right == v.facing_right and e.anim_frame == v.anim_frame, tick
+                assert e.death_sequence_finished == v.death_sequence_finished, tick
+            assert player_a.hp == player_b.hp, (tick, player_a.hp, player_b.hp)
+
+        # El escenario debe haber cubierto la muerte completa y ataques al jugador
+        assert views[4].death_sequence_finished
+        assert player_b.hp < 100
+    finally:
+        RNG.ai, RNG.combat = original_streams
+
+if __name__ == "__main__":
+    test_soa_matches_object_path()
+    print("Test passed: NumPy enemy backend matches Character.update.")
+    pygame.quit()
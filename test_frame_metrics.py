@@ -0,0 +1,72 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+from constants import *
+from entities import Character, GLOBAL_ASSET_CACHE, SPRITE_SCALE_CACHE
+
+def drawn_rect(char, scale):
+    """Bbox opaco de lo que dibuja el personaje (cámara en 0: mundo = pantalla)."""
+    SPRITE_SCALE_CACHE.clear()
+    screen = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    char.draw(screen, 0, scale)
+    return screen.get_bounding_rect(128)
+
+def frames_of(char):
+    """(estado, frame, animación) de cada frame animado del personaje."""
+    for state, name in (("IDLE", "IDLE"), ("WALK", "WALK"), ("JUMP", "JUMP")):
+        for i in range(len(char.animations.get(name, []))):
+            yield state, i, name
+    for combo in range(3):
+        for i in range(len(char.animations.get(f"ATTACK_{combo}", []))):
+            yield "ATTACK", (combo, i), f"ATTACK_{combo}"
+
+def set_frame(char, state, frame):
+    char.state = state
+    if state == "ATTACK":
+        char.combo_index, char.anim_frame = frame
+    elif state == "JUMP":
+        char.jump_anim_timer = frame * 5.5
+    else:
+        char.anim_frame = frame
+
+def test_metrics_are_shared_per_animation():
+    a = Character(300, 450, RED, is_player=False)
+    b = Character(500, 450, RED, is_player=False)
+    for name, frames in a.animations.items():
+        assert len(a.frame_metrics[name]) == len(frames), name
+        # Una sola lista por animación, compartida por todas las instancias
+        assert b.frame_metrics[name] is a.frame_metrics[name]
+        assert any(m is a.frame_metrics[name] for m in GLOBAL_ASSET_CACHE["metrics"].values())
+
+def test_body_rect_matches_drawing():
+    for is_player in (True, False):
+        char = Character(400, 450, BLUE if is_player else RED, is_player=is_player)
+        unit = 1.0 if is_player else 1 / 0.95 # Los enemigos se dibujan al 95%
+        for state, frame, name in frames_of(char):
+            set_frame(char, state, frame)
+            idx = char.current_frame()[1][2]
+            metrics = char.frame_metrics[name]
+            for facing_right in (True, False):
+                char.facing_right = facing_right
+                drawn = drawn_rect(char, unit)
+                if not metrics[idx].bbox.height:
+                    assert not drawn.height and not char.get_body_rect().height # Frame vacío
+                    continue
+                assert char.get_body_rect() == drawn, (is_player, name, idx, facing_right)
+                # Frames apoyados: sus pies caen justo en world_pos.y
+                ground = max(m.bottom for m in metrics if m.bbox.height)
+                if ground - metrics[idx].bottom <= FEET_SNAP:
+                    assert drawn.bottom == char.world_pos.y, (name, idx)
+                # Frames en el aire: conservan el despegue que trae el arte
+                else:
+                    assert char.world_pos.y - drawn.bottom == ground - metrics[idx].bottom, (name, idx)
+
+if __name__ == "__main__":
+    test_metrics_are_shared_per_animation()
+    test_body_rect_matches_drawing()
+    print("Test passed: frame metrics anchor each frame and match the body rect.")
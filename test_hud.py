@@ -0,0 +1,50 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from constants import *
+from engine import GameEngine
+from hud import Hud
+
+def test_bar_redraw_matches_full_compose():
+    game = GameEngine(headless=True)
+    game.spawn_enemy()
+    enemy = game.enemies[0]
+    screen = pygame.Surface((WIDTH, HEIGHT))
+
+    # Un HUD que solo repinta la barra al bajar/subir la vida...
+    game.hud.draw(screen, game.player, enemy)
+    for hp in (80, 35, 0, 60):
+        game.player.hp = hp
+        enemy.hp = 100 - hp
+        game.hud.draw(screen, game.player, enemy)
+    assert game.hud.allocations <= 2 # Solo rellenos de anchos nuevos, ningún panel recompuesto
+
+    # ...debe quedar igual que uno compuesto desde cero con esa vida
+    fresh = Hud(game.ui_frame, game.ui_fill_p, game.ui_fill_e, game.ui_name_player, game.ui_name_enemy)
+    fresh.draw(screen, game.player, enemy)
+    for side in ("player", "enemy"):
+        a = pygame.image.tostring(game.hud.panels[side].surface, "RGBA")
+        b = pygame.image.tostring(fresh.panels[side].surface, "RGBA")
+        assert a == b, side
+
+    # Sin cambios de vida dibujar el HUD son dos blits y ninguna superficie nueva
+    game.hud.draw(screen, game.player, enemy)
+    assert game.hud.stats() == {"draw_calls": 2, "allocations": 0}
+
+def test_closest_enemy_follows_enemy_list():
+    game = GameEngine(headless=True)
+    assert game.closest_enemy() is None
+    game.spawn_enemy() # En el mismo tic: no debe quedarse con el None memoizado
+    game.enemies[0].world_pos.update(game.player.world_pos + pygame.Vector2(100, 0))
+    game.enemy_grid.move(game.enemies[0])
+    assert game.closest_enemy() is game.enemies[0]
+    game.restart_game() # Enemigo liberado al pool: el HUD no puede seguir mostrándolo
+    assert game.closest_enemy() is None
+
+if __name__ == "__main__":
+    test_bar_redraw_matches_full_compose()
+    test_closest_enemy_follows_enemy_list()
+    print("Test passed: retained HUD repaints only the health bar correctly.")
+    pygame.quit()
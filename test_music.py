@@ -0,0 +1,50 @@
+import os
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import tempfile
+import wave
+import pygame
+from constants import *
+from music import MusicPlayer, track_duration, decoded_size
+
+def write_wav(path, seconds, rate=22050):
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\0\0" * int(rate * seconds))
+
+def test_music_fades_and_ducking():
+    pygame.mixer.init()
+    with tempfile.TemporaryDirectory() as sound_dir:
+        write_wav(os.path.join(sound_dir, MUSIC_TRACKS["stage"] + ".wav"), 2.0)
+        write_wav(os.path.join(sound_dir, MUSIC_TRACKS["wave"] + ".wav"), 1.0)
+        assert track_duration(os.path.join(sound_dir, MUSIC_TRACKS["wave"] + ".wav")) == 1.0
+        freq, fmt, channels = pygame.mixer.get_init()
+        assert decoded_size(os.path.join(sound_dir, MUSIC_TRACKS["wave"] + ".wav")) == freq * channels * abs(fmt) // 8
+
+        music = MusicPlayer(volume=0.5, sound_dir=sound_dir)
+        music.play("stage")
+        assert music.path.endswith(MUSIC_TRACKS["stage"] + ".wav") and music.fade == 1.0
+
+        # Cambio de pista: baja, cambia a mitad del fundido y vuelve a subir
+        music.play("wave")
+        music.update(MUSIC_CROSSFADE_MS / 4)
+        assert 0.0 < music.fade < 1.0 and music.path.endswith(MUSIC_TRACKS["stage"] + ".wav")
+        music.update(MUSIC_CROSSFADE_MS / 4)
+        assert music.path.endswith(MUSIC_TRACKS["wave"] + ".wav")
+        music.update(MUSIC_CROSSFADE_MS / 2)
+        assert music.fade == 1.0
+
+        # En pausa la música baja al factor de ducking y el volumen de usuario se respeta
+        music.update(MUSIC_DUCK_MS, paused=True)
+        assert abs(music.applied_volume - 0.5 * MUSIC_DUCK_FACTOR) < 1e-6
+        music.set_volume(0.2)
+        music.update(MUSIC_DUCK_MS, paused=False)
+        assert abs(music.applied_volume - 0.2) < 1e-6
+        pygame.mixer.music.unload()
+    pygame.mixer.quit()
+
+if __name__ == "__main__":
+    test_music_fades_and_ducking()
+    print("Test passed: streamed music crossfades and ducks while paused.")
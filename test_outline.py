@@ -0,0 +1,36 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from constants import *
+from utils import render_gradient_text
+
+FONT_PATH = "textures/fonts/BADABB_.TTF"
+
+def alpha_diff(a, b):
+    """Diferencia media por canal (0-255) entre dos superficies del mismo tamaño."""
+    da = pygame.image.tostring(a, "RGBA")
+    db = pygame.image.tostring(b, "RGBA")
+    return sum(abs(x - y) for x, y in zip(da, db)) / len(da)
+
+def test_mask_outline_matches_legacy_blits():
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    if os.path.exists(FONT_PATH):
+        big, small = pygame.font.Font(FONT_PATH, 110), pygame.font.Font(FONT_PATH, 25)
+    else:
+        big, small = pygame.font.SysFont("Impact", 110), pygame.font.SysFont("Arial", 25, bold=True)
+
+    cases = [(big, "7", 5), (big, "42", 5), (big, "HITS", 4), (small, "Chapulin", 3), (small, "PAUSA", 0)]
+    for font, text, width in cases:
+        new = render_gradient_text(font, text, COMBO_TOP, COMBO_BOTTOM, outline_width=width)
+        old = render_gradient_text(font, text, COMBO_TOP, COMBO_BOTTOM, outline_width=width, legacy_outline=True)
+        assert new.get_size() == old.get_size(), text
+        # El antialias del borde varía ligeramente; el resto debe coincidir
+        assert alpha_diff(new, old) < 2.0, (text, alpha_diff(new, old))
+
+if __name__ == "__main__":
+    test_mask_outline_matches_legacy_blits()
+    print("Test passed: mask-dilated outline matches the legacy outline.")
+    pygame.quit()
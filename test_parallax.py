@@ -0,0 +1,61 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from constants import *
+from parallax import ParallaxBackground, ParallaxLayer, sky_layer, skyline_layer, sky_to_colorkey
+
+def naive(layers, camera_x):
+    surface = pygame.Surface((WIDTH, FLOOR_START_Y)).convert()
+    for layer in layers:
+        layer.draw(surface, layer.offset(camera_x))
+    return pygame.image.tobytes(surface, "RGB")
+
+def test_cached_layers_match_full_composition():
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    facades = pygame.Surface((300, FLOOR_START_Y), pygame.SRCALPHA)
+    pygame.draw.rect(facades, (40, 40, 55, 255), (20, 80, 200, FLOOR_START_Y - 80))
+    layers = [sky_layer(), skyline_layer(), ParallaxLayer("facades", facades, 0.3)]
+    background = ParallaxBackground(layers)
+    screen = pygame.Surface((WIDTH, FLOOR_START_Y)).convert()
+
+    background.draw(screen, 0)
+    skyline = layers[1]
+    camera_x = 0.0
+    for frame in range(120):
+        previous = camera_x
+        camera_x += 2.7 if frame < 80 else -4.1
+        before = background.recomposed
+        background.draw(screen, camera_x)
+        assert pygame.image.tobytes(screen, "RGB") == naive(layers, camera_x)
+        # El cielo no se mueve; las siluetas solo se recomponen al moverse un píxel entero
+        moved = skyline.offset(camera_x) != skyline.offset(previous)
+        assert background.recomposed - before == int(moved)
+
+    # Una capa opaca delante tapa todo: las de detrás ya no se dibujan
+    background.add(ParallaxLayer("wall", pygame.Surface((64, FLOOR_START_Y)).convert(), 0.5))
+    assert [layer.name for layer in background.layers] == ["wall"]
+
+def test_opaque_texture_sky_is_keyed_out():
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    # Como city_background_texture.png: opaca, cielo liso y ventanas del mismo color que el cielo
+    texture = pygame.Surface((200, FLOOR_START_Y)).convert()
+    texture.fill((15, 15, 25))
+    pygame.draw.rect(texture, (25, 25, 35), (30, 100, 70, FLOOR_START_Y - 100))
+    pygame.draw.rect(texture, (15, 15, 25), (40, 120, 20, 20))
+    keyed = sky_to_colorkey(texture)
+    visible = pygame.mask.from_surface(keyed)
+    assert not visible.get_at((10, 10)) and not visible.get_at((150, FLOOR_START_Y - 1)) # Cielo y huecos
+    assert visible.get_at((35, 150)) and visible.get_at((45, 125)) # Fachada y ventana encerrada
+
+    layers = [sky_layer(), skyline_layer(), ParallaxLayer("facades", keyed, 0.3)]
+    assert [layer.name for layer in ParallaxBackground(layers).layers] == ["sky", "skyline", "facades"]
+
+    # Sin un cielo liso arriba no hay nada que quitar
+    pygame.draw.rect(texture, (90, 40, 40), (0, 0, 120, 4))
+    assert sky_to_colorkey(texture).get_colorkey() is None
+
+if __name__ == "__main__":
+    test_cached_layers_match_full_composition()
+    test_opaque_texture_sky_is_keyed_out()
+    print("Test passed: parallax compositor matches a full redraw and skips unmoved layers.")
@@ -0,0 +1,61 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import csv
+import json
+import tempfile
+import time
+import pygame
+from constants import *
+from profiler import FrameProfiler
+
+def busy(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+def test_sections_accumulate_and_dump():
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    tmp = tempfile.mkdtemp()
+    prof = FrameProfiler(history=8, trace_path=os.path.join(tmp, "trace.csv"))
+
+    for frame in range(10):
+        prof.begin_frame()
+        # Dos pasos de simulación en el mismo frame suman en la misma sección
+        for _ in range(2):
+            with prof.section("update"):
+                busy(1)
+        if frame % 2 == 0:
+            with prof.section("combo"):
+                busy(0.5)
+        prof.end_frame()
+
+    stats = prof.stats()
+    assert len(prof.frame_ms) == 8
+    assert stats["update"]["mean"] >= 2.0
+    assert stats["frame"]["p99"] >= stats["update"]["p99"]
+    # Los frames sin combo cuentan como 0, no desaparecen de la media
+    assert 0.2 <= stats["combo"]["mean"] < stats["combo"]["p95"]
+
+    prof.toggle()
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    prof.draw(screen)
+    assert prof.overlay is not None
+
+    prof.dump()
+    with open(prof.trace_path) as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 10 and float(rows[1]["combo"]) == 0.0
+
+    json_path = os.path.join(tmp, "trace.json")
+    prof.dump(json_path)
+    with open(json_path) as f:
+        data = json.load(f)
+    assert len(data["frames"]) == 10 and "update" in data["summary"]
+
+if __name__ == "__main__":
+    test_sections_accumulate_and_dump()
+    print("Test passed: profiler sections, percentiles and trace dump.")
+    pygame.quit()
@@ -0,0 +1,52 @@
+from constants import *
+from quality import QualityController
+
+def feed(quality, ms, windows=1):
+    for _ in range(QUALITY_WINDOW * windows):
+        quality.observe(ms)
+
+def test_hysteresis_and_override():
+    quality = QualityController(override="auto")  # Nombre inválido: modo automático
+    budget = 1000.0 / FPS
+    applied = []
+    quality.listeners.append(lambda preset: applied.append(preset["name"]))
+
+    # Frames lentos: baja un nivel por ventana hasta el mínimo
+    feed(quality, budget * 1.5, windows=5)
+    assert quality.level == len(QUALITY_LEVELS) - 1
+    assert applied == [level["name"] for level in QUALITY_LEVELS[1:]]
+
+    # Dentro de la banda de histéresis no se mueve
+    feed(quality, budget * 0.8, windows=10)
+    assert quality.level == len(QUALITY_LEVELS) - 1
+
+    # Con holgura sube, pero solo tras varias ventanas seguidas
+    feed(quality, budget * 0.3, windows=QUALITY_UP_WINDOWS - 1)
+    assert quality.level == len(QUALITY_LEVELS) - 1
+    feed(quality, budget * 0.3)
+    assert quality.level == len(QUALITY_LEVELS) - 2
+
+    # Si el nivel recuperado vuelve a fallar, la próxima subida exige el doble
+    feed(quality, budget * 1.5)
+    feed(quality, budget * 0.3, windows=QUALITY_UP_WINDOWS)
+    assert quality.level == len(QUALITY_LEVELS) - 1
+    feed(quality, budget * 0.3, windows=QUALITY_UP_WINDOWS)
+    assert quality.level == len(QUALITY_LEVELS) - 2
+
+    # Si el nivel recuperado aguanta, se olvidan los fallos: la espera vuelve a la normal
+    feed(quality, budget * 0.8, windows=QUALITY_HOLD_WINDOWS)
+    assert quality.up_windows == QUALITY_UP_WINDOWS
+    feed(quality, budget * 1.5)
+    feed(quality, budget * 0.3, windows=QUALITY_UP_WINDOWS)
+    assert quality.level == len(QUALITY_LEVELS) - 2
+
+    # Override de desarrollo: fija el nivel e ignora las medidas
+    quality.cycle_override()
+    assert quality.current["name"] == QUALITY_LEVELS[0]["name"]
+    feed(quality, budget * 3, windows=3)
+    assert quality.floor_step == QUALITY_LEVELS[0]["floor_step"]
+    assert QualityController(override="baja").smooth_sprites == QUALITY_LEVELS[2]["smooth_sprites"]
+
+if __name__ == "__main__":
+    test_hysteresis_and_override()
+    print("Test passed: quality controller steps with hysteresis and honors overrides.")
@@ -0,0 +1,42 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import random
+import pygame
+from constants import *
+from render_queue import RenderQueue
+from world import Prop
+
+class Dummy:
+    def __init__(self, x, y):
+        self.world_pos = pygame.Vector2(x, y)
+        self.z_priority = 0
+
+def test_matches_full_sort():
+    rng = random.Random(7)
+    props = [Prop("poste", rng.uniform(-2000, 8000), rng.choice([FLOOR_START_Y + 10, HEIGHT - 5]), pygame.Surface((4, 4)))
+             for _ in range(200)]
+    chars = [Dummy(rng.uniform(0, 3000), rng.uniform(FLOOR_START_Y, HEIGHT)) for _ in range(40)]
+    queue = RenderQueue()
+    queue.set_static(props)
+    camera_x = 0
+    for frame in range(300):
+        camera_x += rng.uniform(-5, 20)
+        for c in chars:
+            c.world_pos.x += rng.uniform(-8, 8)
+            c.world_pos.y += rng.uniform(-3, 3)
+            c.z_priority = rng.choice([0, 0, 50, -50])
+        dynamic = chars[:30 + frame % 11]   # Altas y bajas como en las oleadas
+        order = queue.build(dynamic, camera_x)
+
+        # Mismo orden que ordenar todo cada frame, quitando solo lo que no se ve
+        expected = sorted(dynamic + props, key=lambda s: (int(s.world_pos.y), s.z_priority))
+        center = camera_x + WIDTH // 2
+        expected = [s for s in expected if (s.visible(camera_x) if isinstance(s, Prop)
+                                            else abs(s.world_pos.x - center) <= WIDTH // 2 + CHAR_CULL_MARGIN)]
+        assert order == expected
+    assert queue.stats()["static_drawn_per_frame"] < len(props) / 4
+
+if __name__ == "__main__":
+    test_matches_full_sort()
+    print("Test passed: render queue keeps the full-sort order while culling off-screen sprites.")
@@ -0,0 +1,50 @@
+import os
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from sound_bus import SoundBus
+
+def test_voice_limits_and_priority():
+    pygame.mixer.quit() # Mixer limpio: sin voces de otros tests
+    pygame.mixer.init()
+    freq, fmt, channels = pygame.mixer.get_init()
+    # Sonidos silenciosos de 2 s: siguen ocupando su canal durante el test
+    silence = bytes(freq * channels * abs(fmt) // 8 * 2)
+    sounds = {name: pygame.mixer.Sound(buffer=silence) for name in ("swing", "hit", "groan", "bell")}
+    defs = {"swing": ("player", 2, 1), "hit": ("enemy", 2, 2), "groan": ("enemy", 1, 2), "bell": ("ui", 1, 1)}
+    bus = SoundBus(sounds, groups={"player": 1, "enemy": 2, "ui": 1}, defs=defs)
+
+    # El mismo sonido dos veces en un frame suena una sola vez
+    assert bus.play("swing") and bus.play("swing") is None
+    assert bus.deduped == 1
+
+    # Grupo enemigo lleno de gemidos: un golpe (más prioritario) roba un canal...
+    bus.play("groan")
+    bus.end_frame()
+    bus.play("groan")
+    bus.end_frame()
+    assert bus.play("hit") is not None and bus.stolen == 1
+    bus.end_frame()
+    # ...pero un gemido no puede quitarle el canal al golpe: roba el otro gemido
+    bus.play("groan")
+    bus.end_frame()
+    assert [voice[0] for voice in bus.voices.values()].count("hit") == 1
+
+    # Tope de copias del mismo sonido: se reinicia la más antigua, no se ocupa otro canal
+    bus.play("bell")
+    bus.end_frame()
+    bus.play("bell")
+    assert bus.stolen == 3
+
+    # Con todo ocupado por voces más importantes, la petición se descarta
+    bus.defs["groan"] = ("enemy", 1, 3)
+    bus.end_frame()
+    bus.play("hit")
+    bus.end_frame()
+    assert bus.play("groan") is None and bus.dropped == 1
+    assert pygame.mixer.find_channel() is None  # Todo reservado para el bus
+    pygame.mixer.quit()
+
+if __name__ == "__main__":
+    test_voice_limits_and_priority()
+    print("Test passed: sound bus limits voices and steals by priority.")
@@ -0,0 +1,56 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import math
+import pygame
+from constants import *
+from entities import Character
+from spatial import SpatialHash
+
+def brute_force(items, pos, radius):
+    return [item for item in items if (item.world_pos - pos).length_squared() < radius * radius]
+
+def check(grid, enemies, player):
+    # Cada enemigo está en la celda de su posición actual...
+    for e in enemies:
+        assert grid.where[id(e)][0] == grid._cell(e.world_pos.x, e.world_pos.y)
+    # ...y las consultas dan lo mismo que recorrer la lista entera
+    for pos in [e.world_pos for e in enemies] + [player.world_pos]:
+        for radius in (COLLISION_DIST, 100, 130):
+            assert grid.query_radius(pos, radius) == brute_force(enemies, pos, radius)
+
+def test_queries_match_brute_force_after_knockback():
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    player = Character(600, 450, BLUE, is_player=True)
+    enemies = []
+    for i in range(10):
+        angle = 2 * math.pi * i / 10
+        enemies.append(Character(600 + math.cos(angle) * (50 + 8 * i), 450 + math.sin(angle) * 40, RED))
+    # Sin margen en las consultas: la cuadrícula tiene que estar al día por sí sola
+    grid = SpatialHash(SPATIAL_CELL_SIZE, margin=0)
+    grid.rebuild(enemies)
+    start = [pygame.Vector2(e.world_pos) for e in enemies]
+
+    # Golpe normal (empujón de 15 px al instante), remate (10 px por tic) y golpe mortal (12 px por tic)
+    for i, e in enumerate(enemies):
+        away = pygame.Vector2(1 if e.world_pos.x >= player.world_pos.x else -1, 0)
+        e.vel = away * BASE_SPEED * 0.75 # Caminando a la velocidad máxima de la IA
+        e.apply_damage(200 if i % 3 == 2 else 5, knockback=i % 3 == 1, knk_dir=away)
+    grid.refresh()
+    check(grid, enemies, player)
+
+    for tick in range(40):
+        for e in enemies:
+            e.update(player_ref=player, enemies=enemies, grid=grid)
+            grid.move(e)
+            check(grid, enemies, player)
+        if tick == 0:
+            # Entre dos reconstrucciones se movieron más de lo que cubre el margen por defecto
+            assert max((e.world_pos - p).length() for e, p in zip(enemies, start)) > SpatialHash(SPATIAL_CELL_SIZE).margin
+        grid.rebuild(enemies)
+
+if __name__ == "__main__":
+    test_queries_match_brute_force_after_knockback()
+    print("Test passed: spatial grid queries match brute force after knockback.")
@@ -0,0 +1,41 @@
+import pygame
+from sprite_cache import ScaledSpriteCache
+
+def surface_bytes(surf):
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+def test_buckets_hits_and_lru_eviction():
+    source = pygame.Surface((100, 100), pygame.SRCALPHA)
+    one = 100 * 100 * 4 # Una entrada a escala 1.0
+    cache = ScaledSpriteCache(budget_bytes=3 * one, step=0.1)
+
+    # Escalas de la misma cubeta comparten superficie; la orientación es otra entrada
+    a = cache.get(("p", "IDLE", 0), source, True, 1.0)
+    assert cache.get(("p", "IDLE", 0), source, True, 1.04) is a
+    assert a.get_size() == (100, 100)
+    b = cache.get(("p", "IDLE", 0), source, False, 1.0)
+    assert b is not a
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.get(("p", "IDLE", 1), source, True, 0.5).get_size() == (50, 50)
+
+    # used_bytes suma exactamente lo que guarda
+    assert cache.used_bytes == sum(surface_bytes(s) for s in cache.entries.values()) == 2 * one + one // 4
+
+    # Tocar `a` la vuelve la más reciente: se expulsa `b`, la menos usada
+    cache.get(("p", "IDLE", 0), source, True, 1.0)
+    c = cache.get(("p", "IDLE", 2), source, True, 1.0)
+    assert cache.evictions == 1 and cache.used_bytes <= cache.budget_bytes
+    keys = [key for key, _, _, _ in cache.entries]
+    assert keys == [("p", "IDLE", 1), ("p", "IDLE", 0), ("p", "IDLE", 2)]
+    assert cache.get(("p", "IDLE", 2), source, True, 1.0) is c
+    assert cache.used_bytes == sum(surface_bytes(s) for s in cache.entries.values())
+
+    # Una entrada más grande que el presupuesto se guarda sola
+    big = cache.get(("p", "IDLE", 3), source, True, 2.0)
+    assert list(cache.entries.values()) == [big] and cache.used_bytes == surface_bytes(big)
+    cache.clear()
+    assert cache.used_bytes == 0 and not cache.entries
+
+if __name__ == "__main__":
+    test_buckets_hits_and_lru_eviction()
+    print("Test passed: scaled sprite cache buckets scales and evicts least recently used first.")
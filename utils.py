@@ -1,4 +1,5 @@
 import pygame
+from collections import namedtuple, OrderedDict
 
 def draw_gradient_rect(screen, rect, color1, color2, horizontal=False):
     """Dibuja un degradado dentro de un rect especificado."""
@@ -20,17 +21,30 @@ def draw_gradient_rect(screen, rect, color1, color2, horizontal=False):
             pygame.draw.line(row, (int(r), int(g), int(b)), (x, 0), (x, 0))
         screen.blit(pygame.transform.scale(row, (target_rect.width, target_rect.height)), target_rect)
 
+# Métricas del área opaca de un frame. bottom/right son exclusivos:
+# bottom es la Y justo debajo del píxel opaco más bajo (lo que usaban los pies).
+FrameMetrics = namedtuple("FrameMetrics", ["top", "bottom", "left", "right", "bbox"])
+
+def get_frame_metrics(surface, min_alpha=128):
+    """Calcula top, bottom, left, right y el bbox opaco en una sola pasada (en C).
+
+    min_alpha=128 equivale al umbral por defecto de pygame.mask.from_surface.
+    Si el frame está vacío el bbox es nulo y bottom vale el alto (como antes).
+    """
+    return metrics_from_bbox(surface.get_bounding_rect(min_alpha), surface.get_size())
+
+def metrics_from_bbox(bbox, size):
+    """Reconstruye FrameMetrics desde un bbox guardado (cache en disco, atlas)."""
+    rect = pygame.Rect(bbox)
+    if rect.width == 0 or rect.height == 0:
+        return FrameMetrics(0, size[1], 0, size[0], pygame.Rect(0, 0, 0, 0))
+    return FrameMetrics(rect.top, rect.bottom, rect.left, rect.right, rect)
+
 def get_bottom_pixel(surface):
     """Retorna la coordenada Y del píxel no transparente más bajo."""
     if not surface:
         return 0
-    width, height = surface.get_size()
-    mask = pygame.mask.from_surface(surface)
-    for y in range(height - 1, -1, -1):
-        for x in range(width):
-            if mask.get_at((x, y)):
-                return y + 1 
-    return height
+    return get_frame_metrics(surface).bottom
 
 def load_gif(filename, scale=None):
     """Carga un GIF y devuelve una lista de cuadros (surfaces) y duraciones."""
@@ -72,40 +86,131 @@ def load_gif(filename, scale=None):
         
     return frames
 
-def render_gradient_text(font, text, color_top, color_bottom, outline_color=(0, 0, 0), outline_width=3):
-    """Renderiza texto con un degradado vertical y un borde."""
+def render_gradient_text(font, text, color_top, color_bottom, outline_color=(0, 0, 0), outline_width=3, legacy_outline=False):
+    """Renderiza texto con un degradado vertical y un borde.
+
+    legacy_outline usa el borde original por blits desplazados (referencia para tests).
+    """
     # Renderizar el texto base en blanco para usarlo como máscara
     text_surf = font.render(text, True, (255, 255, 255)).convert_alpha()
     w, h = text_surf.get_size()
     
-    # Crear superficie de degradado
-    grad_surf = pygame.Surface((w, h)).convert_alpha()
+    # Crear superficie de degradado (una columna estirada a lo ancho)
+    column = pygame.Surface((1, h)).convert_alpha()
     for y in range(h):
         r = color_top[0] + (color_bottom[0] - color_top[0]) * y / h
         g = color_top[1] + (color_bottom[1] - color_top[1]) * y / h
         b = color_top[2] + (color_bottom[2] - color_top[2]) * y / h
-        pygame.draw.line(grad_surf, (int(r), int(g), int(b), 255), (0, y), (w, y))
+        column.set_at((0, y), (int(r), int(g), int(b), 255))
+    grad_surf = pygame.transform.scale(column, (w, h))
         
     # Multiplicar el degradado por el texto blanco (conserva el alpha del texto)
     text_surf.blit(grad_surf, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
     
     # Crear superficie final para el borde + texto
-    final_surf = pygame.Surface((w + outline_width * 2, h + outline_width*2), pygame.SRCALPHA)
-    
-    # Renderizar borde (múltiples blits del texto en color borde)
     outline_text = font.render(text, True, outline_color).convert_alpha()
-    for dx in range(-outline_width, outline_width + 1):
-        for dy in range(-outline_width, outline_width + 1):
-            if dx*dx + dy*dy <= outline_width*outline_width:
-                final_surf.blit(outline_text, (dx + outline_width, dy + outline_width))
+    make_outline = outline_surface_legacy if legacy_outline else outline_surface
+    final_surf = make_outline(outline_text, outline_color, outline_width)
                 
     # Blitear el texto degradado encima
     final_surf.blit(text_surf, (outline_width, outline_width))
     return final_surf
 
+# --- BORDE DE TEXTO POR DILATACIÓN ---
+# En lugar de blitear el texto una vez por cada offset dentro del círculo
+# (~80 blits con borde 5), dilatamos su máscara con un disco usando
+# Mask.convolve. Se hace a varios umbrales de alpha para conservar el antialias.
+OUTLINE_ALPHA_LEVELS = ((0, 63), (63, 127), (127, 191), (191, 255)) # (umbral, alpha resultante)
+_disk_masks = {}
+
+def disk_mask(radius):
+    mask = _disk_masks.get(radius)
+    if mask is None:
+        size = 2 * radius + 1
+        mask = pygame.mask.Mask((size, size))
+        for dx in range(-radius, radius + 1):
+            for dy in range(-radius, radius + 1):
+                if dx * dx + dy * dy <= radius * radius:
+                    mask.set_at((dx + radius, dy + radius))
+        _disk_masks[radius] = mask
+    return mask
+
+def outline_surface(glyphs, color, width):
+    """Borde de `width` px alrededor de `glyphs` (superficie del texto en el color del borde).
+
+    Devuelve una superficie SRCALPHA de tamaño glyphs + 2*width, igual que el
+    método de blits desplazados (ver outline_surface_legacy).
+    """
+    if width <= 0:
+        return glyphs.copy()
+    disk = disk_mask(width)
+    result = None
+    for threshold, alpha in OUTLINE_ALPHA_LEVELS:
+        dilated = pygame.mask.from_surface(glyphs, threshold).convolve(disk)
+        layer = dilated.to_surface(setcolor=(color[0], color[1], color[2], alpha), unsetcolor=(0, 0, 0, 0))
+        if result is None:
+            result = layer
+        else:
+            result.blit(layer, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+    return result.convert_alpha()
+
+def outline_surface_legacy(glyphs, color, width):
+    """Borde original: un blit del texto por cada offset dentro del círculo."""
+    w, h = glyphs.get_size()
+    final_surf = pygame.Surface((w + width * 2, h + width * 2), pygame.SRCALPHA)
+    for dx in range(-width, width + 1):
+        for dy in range(-width, width + 1):
+            if dx*dx + dy*dy <= width*width:
+                final_surf.blit(glyphs, (dx + width, dy + width))
+    return final_surf
+
+# --- CACHE DE TEXTO ---
+# Los menús piden los mismos textos cada frame; render_gradient_text hace un
+# blit por píxel del borde, así que memoizamos el resultado (LRU acotado).
+TEXT_CACHE_SIZE = 128
+_text_cache = OrderedDict()
+
+def _cached_surface(key, build):
+    surf = _text_cache.get(key)
+    if surf is None:
+        surf = build()
+        _text_cache[key] = surf
+        if len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    else:
+        _text_cache.move_to_end(key)
+    return surf
+
+def cached_gradient_text(font, text, color_top, color_bottom, outline_color=(0, 0, 0), outline_width=3, scale=1.0):
+    """render_gradient_text memoizado por fuente, texto, colores, borde y escala."""
+    key = ("gradient", font, text, tuple(color_top), tuple(color_bottom), tuple(outline_color), outline_width, scale)
+    def build():
+        surf = render_gradient_text(font, text, color_top, color_bottom, outline_color, outline_width)
+        if scale != 1.0:
+            surf = pygame.transform.smoothscale(surf, (int(surf.get_width() * scale), int(surf.get_height() * scale)))
+        return surf
+    return _cached_surface(key, build)
+
+def cached_text(font, text, color):
+    """font.render memoizado (texto plano con antialias)."""
+    return _cached_surface(("plain", font, text, tuple(color)), lambda: font.render(text, True, color))
+
+def clear_text_cache():
+    _text_cache.clear()
+
 def blur_surface(surface, amount=4):
     """Simula un desenfoque escalando la superficie hacia abajo y hacia arriba."""
     if amount <= 1: return surface
     w, h = surface.get_size()
     small_surf = pygame.transform.smoothscale(surface, (w // amount, h // amount))
     return pygame.transform.smoothscale(small_surf, (w, h))
+
+def percentile(samples, pct):
+    """Percentil (0-100) de una lista de muestras, con interpolación lineal."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    pos = (len(ordered) - 1) * pct / 100.0
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
@@ -0,0 +1,166 @@
+import math
+import os
+import random
+import pygame
+from constants import *
+from entities import SPRITE_SCALE_CACHE
+from atlas import get_atlas
+from assets import load_image
+from rng import RNG
+
+# --- MUNDO POR TRAMOS ---
+# El nivel se divide en tramos de WORLD_CHUNK_WIDTH px. Solo existen los props de
+# los tramos que la cámara puede ver; al avanzar, los que quedan atrás vuelven a
+# un pool y se reutilizan para los tramos nuevos. Cada hueco de prop se genera con
+# su propia semilla derivada de la partida, así que un tramo sale igual cada vez
+# que se crea y la memoria no depende del largo del nivel (sirve para niveles sin fin).
+
+PROP_TYPES = ("lamp_post", "trash_can")
+
+class Prop:
+    def __init__(self, name, x, y, image=None):
+        self.name = name
+        self.world_pos = pygame.Vector2(x, y)
+        self.z = 0
+        self.z_priority = 0
+        self.image = image
+        if image is None:
+            self.load_image()
+
+    def load_image(self):
+        atlas = get_atlas()
+        if atlas and atlas.has(f"prop/{self.name}"):
+            self.image = atlas.surface(f"prop/{self.name}")
+            return
+        path = f"textures/sprites/props/{self.name}.png"
+        if os.path.exists(path):
+            self.image = load_image(path)
+        else:
+            self.image = pygame.Surface((40, 40))
+            self.image.fill((200, 0, 200))
+
+    def get_render_pos(self, alpha=1.0):
+        return self.world_pos, self.z
+
+    def h_scale(self):
+        # Profundidad según Y (0.0 en el horizonte, 1.0 al frente)
+        v = (self.world_pos.y - FLOOR_START_Y) / (HEIGHT - FLOOR_START_Y)
+        # Factor de escala horizontal idéntico al del suelo para sincronización total
+        return 0.4 + v * 2.2
+
+    def screen_x(self, camera_x):
+        # Posición X con Perspectiva
+        # El centro de la pantalla es el punto de fuga (Vanishing Point)
+        center_offset = WIDTH // 2
+        rel_world_x = self.world_pos.x - (camera_x + WIDTH // 2)
+        return center_offset + (rel_world_x * self.h_scale())
+
+    def visible(self, camera_x):
+        screen_x = self.screen_x(camera_x)
+        return -300 <= screen_x <= WIDTH + 300
+
+    def cull_reach(self):
+        """Distancia en X (mundo) al centro de cámara a partir de la cual nunca se ve."""
+        return (WIDTH // 2 + 300) / max(0.01, self.h_scale()) + 1
+
+    def draw(self, screen, camera_x, scale, alpha=1.0):
+        if not self.image: return
+
+        # 1-2. Profundidad y posición X con perspectiva
+        screen_x = self.screen_x(camera_x)
+
+        # 3. No dibujar si está fuera de pantalla
+        if screen_x < -300 or screen_x > WIDTH + 300: return
+
+        # 4. Escalar imagen
+        # Usamos 'scale' que viene del loop central (sincronizado con personajes).
+        # Un prop no se mueve: su escala es fija y la versión escalada sale del cache compartido
+        img = SPRITE_SCALE_CACHE.get(("prop", self.name, 0), self.image, True, scale)
+        if img is None: return
+        rect = img.get_rect()
+        rect.midbottom = (int(screen_x), int(self.world_pos.y))
+        screen.blit(img, rect)
+
+class World:
+    """Props del nivel creados y reciclados por tramos alrededor de la cámara."""
+    def __init__(self, end_x=None, chunk_width=WORLD_CHUNK_WIDTH):
+        self.end_x = end_x              # None: nivel sin fin
+        self.chunk_width = chunk_width
+        self.images = {}                # Una superficie por tipo de prop, compartida
+        self.chunks = {}                # índice de tramo -> [Prop]
+        self.props = []                 # Props vivos, en orden de tramo y hueco
+        self.pool = []                  # Props reciclados listos para reutilizar
+        self.span = None                # (primer, último) tramo cargado
+        # Alcance máximo de un prop (en el horizonte, donde la perspectiva lo comprime más)
+        self.reach = (WIDTH // 2 + 300) / 0.4 + 1
+        # Contadores (para bench.py)
+        self.created = 0
+        self.reused = 0
+
+    def slot_spawn(self, slot):
+        """Tipo y posición del prop del hueco `slot` (siempre el mismo para la misma semilla)."""
+        rng = random.Random(RNG.derive(f"prop:{slot}"))
+        px = PROP_START_X + slot * PROP_SPACING + rng.randint(-PROP_JITTER, PROP_JITTER)
+
+        # Distribución: Postes abajo, otros en los bordes
+        prob = rng.random()
+        if prob < 0.35: # Postes: Siempre en el borde inferior (cerca de cámara)
+            ptype = "lamp_post"
+            py = rng.randint(HEIGHT - 25, HEIGHT - 5)
+        else: # Solo canecas: Arriba o Abajo, lejos de la zona de combate
+            ptype = "trash_can"
+            if rng.random() > 0.5:
+                py = rng.randint(FLOOR_START_Y + 5, FLOOR_START_Y + 40) # Aceras fondo
+            else:
+                py = rng.randint(HEIGHT - 60, HEIGHT - 20) # Aceras frente
+        return ptype, px, py
+
+    def chunk_spawns(self, index):
+        """Props de un tramo: los huecos cuya posición base cae dentro de él."""
+        start = index * self.chunk_width
+        end = start + self.chunk_width
+        if self.end_x is not None:
+            end = min(end, self.end_x)
+        slot = max(0, math.ceil((start - PROP_START_X) / PROP_SPACING))
+        spawns = []
+        while PROP_START_X + slot * PROP_SPACING < end:
+            spawns.append(self.slot_spawn(slot))
+            slot += 1
+        return spawns
+
+    def spawn(self, ptype, x, y):
+        image = self.images[ptype]
+        if self.pool:
+            prop = self.pool.pop()
+            prop.name, prop.image = ptype, image
+            prop.world_pos.update(x, y)
+            self.reused += 1
+        else:
+            prop = Prop(ptype, x, y, image)
+            self.created += 1
+        return prop
+
+    def update(self, camera_x):
+        """Carga los tramos al alcance de la cámara y recicla el resto. True si cambió algo."""
+        if not self.images:
+            return False
+        center = camera_x + WIDTH // 2
+        margin = self.reach + WORLD_STREAM_MARGIN
+        span = (int((center - margin) // self.chunk_width), int((center + margin) // self.chunk_width))
+        if span == self.span:
+            return False
+        self.span = span
+
+        for index in [i for i in self.chunks if not span[0] <= i <= span[1]]:
+            self.pool.extend(self.chunks.pop(index))
+        for index in range(span[0], span[1] + 1):
+            if index not in self.chunks:
+                self.chunks[index] = [self.spawn(*spawn) for spawn in self.chunk_spawns(index)]
+        self.props = [prop for index in sorted(self.chunks) for prop in self.chunks[index]]
+        return True
+
+    def stats(self):
+        return {
+            "chunks": len(self.chunks), "props": len(self.props), "pooled": len(self.pool),
+            "created": self.created, "reused": self.reused
+        }